@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Time a checker command over codebases x single/--threads x cold/warm cache.
+
+Every combination is run ``--warmup`` times unrecorded, then ``--repeats``
+times recorded. A cold run first deletes the checker cache directories
+(``--cache-dir``, looked up in the working directory and in the
+codebase); a warm run leaves them, after the warmup has filled them. Each
+combination is summarized by its median, interquartile range, standard
+deviation and a bootstrap confidence interval of the median, and the
+table shows the --threads speedup over single-threaded runs. ``-o``
+writes every sample and summary as JSON.
+
+The checker is any command. ``{path}`` is replaced by the codebase
+directory (appended if absent), and ``{threads}`` by nothing for
+single-threaded runs and by ``--threads-arg`` otherwise, so a local
+stand-in can replace pyright:
+
+Usage:
+    python generate_sample_code.py
+    python benchmark_runner.py small medium large --repeats 5 -o bench.json
+    python benchmark_runner.py large --modes threads --caches cold --threads-arg "--threads 4"
+    python benchmark_runner.py small --checker "python -c 'import time; time.sleep(0.1)' {threads}"
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import shlex
+import shutil
+import statistics
+import subprocess
+import time
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from generate_sample_code import MANIFEST_NAME, SAMPLE_CODE_DIR
+
+DEFAULT_CHECKER = "pyright {threads} {path}"
+DEFAULT_THREADS_ARG = "--threads"
+DEFAULT_CACHE_DIRS = [".pyright_cache"]
+
+MODES = ["single", "threads"]
+CACHES = ["cold", "warm"]
+
+# Resamples drawn for a bootstrap confidence interval
+BOOTSTRAP_RESAMPLES = 2000
+
+
+class Case(NamedTuple):
+    """One cell of the benchmark matrix."""
+
+    codebase: str
+    path: Path
+    mode: str
+    cache: str
+
+
+def checker_argv(command: str, path: Path, threads: str = "") -> List[str]:
+    """Expand a checker command template for one run."""
+    argv = shlex.split(command.replace("{path}", shlex.quote(str(path))).replace("{threads}", threads))
+    if "{path}" not in command:
+        argv.append(str(path))
+    return argv
+
+
+def clear_caches(path: Path, cache_dirs: Sequence[str]) -> None:
+    """Delete the checker cache directories in the working directory and in ``path``."""
+    for name in cache_dirs:
+        for base in (Path.cwd(), path):
+            if (base / name).is_dir():
+                shutil.rmtree(base / name)
+
+
+def run_once(argv: List[str]) -> Tuple[float, int]:
+    """Wall-clock seconds and exit status of one run."""
+    started = time.perf_counter()
+    try:
+        completed = subprocess.run(argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    except FileNotFoundError:
+        raise SystemExit(f"checker not found: {argv[0]!r}") from None
+    return time.perf_counter() - started, completed.returncode
+
+
+def bootstrap_ci(
+    samples: Sequence[float],
+    confidence: float = 0.95,
+    seed: int = 0,
+    resamples: int = BOOTSTRAP_RESAMPLES,
+) -> Tuple[float, float]:
+    """Percentile bootstrap confidence interval of the median (seeded)."""
+    if len(samples) < 2:
+        return samples[0], samples[0]
+    rng = random.Random(seed)
+    medians = sorted(statistics.median(rng.choices(samples, k=len(samples))) for _ in range(resamples))
+    tail = (1 - confidence) / 2
+    low = medians[int(math.floor(tail * (resamples - 1)))]
+    high = medians[int(math.ceil((1 - tail) * (resamples - 1)))]
+    return low, high
+
+
+def summarize(samples: Sequence[float], confidence: float = 0.95, seed: int = 0) -> Dict[str, Any]:
+    """Robust and classic summary statistics of timing samples."""
+    if len(samples) > 1:
+        q1, _, q3 = statistics.quantiles(samples, n=4, method="inclusive")
+    else:
+        q1 = q3 = samples[0]
+    low, high = bootstrap_ci(samples, confidence, seed)
+    return {
+        "n": len(samples),
+        "median": statistics.median(samples),
+        "mean": statistics.fmean(samples),
+        "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "min": min(samples),
+        "max": max(samples),
+        "q1": q1,
+        "q3": q3,
+        "iqr": q3 - q1,
+        "ci": [low, high],
+        "confidence": confidence,
+    }
+
+
+def resolve_codebase(name: str, sample_dir: Path = SAMPLE_CODE_DIR) -> Path:
+    """A codebase given as a directory, or as a size name under ``sample_dir``."""
+    path = Path(name)
+    return path if path.is_dir() else sample_dir / name
+
+
+def codebase_totals(path: Path) -> Dict[str, Any]:
+    """File and line totals of a generated codebase, if it has a manifest."""
+    try:
+        return json.loads((path / MANIFEST_NAME).read_text())["totals"]
+    except (FileNotFoundError, ValueError, KeyError):
+        return {}
+
+
+def run_case(
+    case: Case,
+    checker: str,
+    threads_arg: str,
+    warmup: int,
+    repeats: int,
+    cache_dirs: Sequence[str],
+    confidence: float,
+) -> Dict[str, Any]:
+    """Warm up and time one matrix cell."""
+    argv = checker_argv(checker, case.path, threads_arg if case.mode == "threads" else "")
+    samples: List[float] = []
+    returncodes: List[int] = []
+    for iteration in range(warmup + repeats):
+        if case.cache == "cold":
+            clear_caches(case.path, cache_dirs)
+        elapsed, returncode = run_once(argv)
+        if iteration >= warmup:
+            samples.append(elapsed)
+            returncodes.append(returncode)
+    totals = codebase_totals(case.path)
+    return {
+        "codebase": case.codebase,
+        "path": str(case.path),
+        "mode": case.mode,
+        "cache": case.cache,
+        "command": shlex.join(argv),
+        "files": totals.get("files"),
+        "lines": totals.get("lines"),
+        "samples": samples,
+        "returncodes": returncodes,
+        "stats": summarize(samples, confidence),
+    }
+
+
+def run_matrix(
+    codebases: List[Tuple[str, Path]],
+    checker: str = DEFAULT_CHECKER,
+    threads_arg: str = DEFAULT_THREADS_ARG,
+    modes: Sequence[str] = MODES,
+    caches: Sequence[str] = CACHES,
+    warmup: int = 1,
+    repeats: int = 5,
+    cache_dirs: Sequence[str] = DEFAULT_CACHE_DIRS,
+    confidence: float = 0.95,
+    quiet: bool = False,
+) -> List[Dict[str, Any]]:
+    """Time every combination of codebase, mode and cache state."""
+    results: List[Dict[str, Any]] = []
+    for name, path in codebases:
+        for mode in modes:
+            for cache in caches:
+                result = run_case(Case(name, path, mode, cache), checker, threads_arg, warmup, repeats,
+                                  cache_dirs, confidence)
+                results.append(result)
+                if not quiet:
+                    stats = result["stats"]
+                    print(f"  {name} {mode} {cache}: median {stats['median']:.3f}s over {stats['n']} runs")
+    return results
+
+
+def environment() -> Dict[str, Any]:
+    """Where the benchmark ran."""
+    return {
+        "cpu_count": os.cpu_count(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "python": platform.python_version(),
+    }
+
+
+def print_table(results: List[Dict[str, Any]]) -> None:
+    """Print one row per matrix cell, with the speedup over the matching single-threaded cell."""
+    single = {
+        (result["codebase"], result["cache"]): result["stats"]["median"]
+        for result in results
+        if result["mode"] == "single"
+    }
+    header = (
+        f"{'codebase':<12} {'mode':<8} {'cache':<5} {'median s':>9} {'IQR':>7} {'stdev':>7} "
+        f"{'CI low':>8} {'CI high':>8} {'speedup':>8}"
+    )
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        stats = result["stats"]
+        baseline = single.get((result["codebase"], result["cache"]))
+        speedup = f"{baseline / stats['median']:.2f}x" if baseline and result["mode"] != "single" else "-"
+        print(
+            f"{result['codebase']:<12} {result['mode']:<8} {result['cache']:<5} {stats['median']:>9.3f} "
+            f"{stats['iqr']:>7.3f} {stats['stdev']:>7.3f} {stats['ci'][0]:>8.3f} {stats['ci'][1]:>8.3f} {speedup:>8}"
+        )
+
+
+def _parse_choices(parser: argparse.ArgumentParser, option: str, spec: str, choices: List[str]) -> List[str]:
+    selected = [item for item in spec.split(",") if item]
+    unknown = [item for item in selected if item not in choices]
+    if unknown or not selected:
+        parser.error(f"{option} takes a comma-separated subset of {', '.join(choices)}: {spec!r}")
+    return selected
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "codebases",
+        nargs="*",
+        default=["small", "medium", "large"],
+        metavar="CODEBASE",
+        help="codebase directories, or size names under --sample-dir (default: small medium large)",
+    )
+    parser.add_argument(
+        "--sample-dir",
+        type=Path,
+        default=SAMPLE_CODE_DIR,
+        help="where size names are looked up (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--checker",
+        default=DEFAULT_CHECKER,
+        metavar="COMMAND",
+        help="checker command; {path} is the codebase, {threads} the --threads-arg of threaded runs "
+        "(default: %(default)r)",
+    )
+    parser.add_argument(
+        "--threads-arg",
+        default=DEFAULT_THREADS_ARG,
+        help="what {threads} becomes in threaded runs (default: %(default)r)",
+    )
+    parser.add_argument(
+        "--modes",
+        default=",".join(MODES),
+        help="single-threaded and/or threaded runs (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--caches",
+        default=",".join(CACHES),
+        help="cold (caches deleted before each run) and/or warm runs (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        action="append",
+        default=None,
+        metavar="NAME",
+        help=f"cache directory deleted before cold runs (repeatable; default: {', '.join(DEFAULT_CACHE_DIRS)})",
+    )
+    parser.add_argument(
+        "--warmup",
+        type=int,
+        default=1,
+        help="unrecorded runs before each combination (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=5,
+        help="recorded runs per combination (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--confidence",
+        type=float,
+        default=0.95,
+        help="level of the bootstrap confidence interval of the median (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-q",
+        "--quiet",
+        action="store_true",
+        help="only print the final table",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=Path,
+        help="also write samples and statistics as JSON to this file",
+    )
+    args = parser.parse_args(argv)
+    args.modes = _parse_choices(parser, "--modes", args.modes, MODES)
+    args.caches = _parse_choices(parser, "--caches", args.caches, CACHES)
+    args.cache_dir = args.cache_dir or DEFAULT_CACHE_DIRS
+    if args.warmup < 0 or args.repeats < 1:
+        parser.error("--warmup must not be negative and --repeats must be positive")
+    if not 0 < args.confidence < 1:
+        parser.error("--confidence must be between 0 and 1")
+    args.paths = [(name, resolve_codebase(name, args.sample_dir)) for name in args.codebases]
+    missing = [str(path) for _, path in args.paths if not path.is_dir()]
+    if missing:
+        parser.error(f"no such codebase: {', '.join(missing)} (run generate_sample_code.py first)")
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the benchmark matrix and report it."""
+    args = parse_args(argv)
+    results = run_matrix(
+        args.paths,
+        args.checker,
+        args.threads_arg,
+        args.modes,
+        args.caches,
+        args.warmup,
+        args.repeats,
+        args.cache_dir,
+        args.confidence,
+        args.quiet,
+    )
+    print_table(results)
+    if args.output is not None:
+        data = {
+            "checker": args.checker,
+            "threads_arg": args.threads_arg,
+            "warmup": args.warmup,
+            "repeats": args.repeats,
+            "environment": environment(),
+            "results": results,
+        }
+        args.output.write_text(json.dumps(data, indent=1) + "\n")
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,537 @@
+#!/usr/bin/env python3
+"""
+Seeded, replayable edit traces for benchmarking incremental re-analysis.
+
+``generate`` draws a trace of edits against a generated corpus, using the
+dependency edges in its .manifest.json:
+
+- body: a statement added inside a function body (interface unchanged)
+- signature: a parameter added to a public function or method of one of
+  the most imported files
+- add: a new, unexported module
+- delete: a file removed together with its ``__init__`` re-exports
+- export: an explicit re-export added to a package ``__init__``
+
+Each edit is classified by the blast radius expected in the dependency
+graph: ``file`` (only the edited file), ``direct`` (its importers) or
+``transitive`` (importers of importers too), with the number of files
+affected. ``replay`` applies a trace step by step, optionally timing a
+checker command after each step, and ``--revert`` undoes it.
+
+Usage:
+    python edit_trace.py generate sample-code/large --steps 50 --seed 1 -o trace.json
+    python edit_trace.py replay trace.json --command "pyright sample-code/large"
+    python edit_trace.py replay trace.json --delay 5   # while pyright --watch runs
+    python edit_trace.py replay trace.json --revert
+"""
+
+import argparse
+import ast
+import json
+import posixpath
+import random
+import shlex
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from generate_sample_code import MANIFEST_NAME, FileRecord
+
+EDIT_KINDS = ["body", "signature", "add", "delete", "export"]
+
+# Relative frequency of each edit kind in a generated trace
+DEFAULT_MIX = {"body": 40, "signature": 20, "add": 15, "delete": 10, "export": 15}
+
+# One primitive change to a file; line numbers are 1-based:
+#   {"op": "insert", "path": str, "line": int, "text": str}
+#   {"op": "remove", "path": str, "line": int, "text": str}
+#   {"op": "replace", "path": str, "line": int, "old": str, "new": str}
+#   {"op": "create", "path": str, "content": str}
+#   {"op": "delete", "path": str, "content": str}
+Action = Dict[str, Any]
+
+INVERSE_OPS = {"insert": "remove", "remove": "insert", "create": "delete", "delete": "create"}
+
+
+@dataclass
+class Edit:
+    """One step of a trace: a logical edit made of primitive actions."""
+
+    step: int
+    kind: str
+    path: str
+    radius: str
+    affected: int
+    actions: List[Action] = field(default_factory=list)
+
+
+def package_init(relpath: str) -> str:
+    """The ``__init__`` of the package a file lives in (``.pyi`` for stubs)."""
+    return posixpath.join(posixpath.dirname(relpath), "__init__" + posixpath.splitext(relpath)[1])
+
+
+def module_name(relpath: str) -> str:
+    """The module name of a file, without package or suffix."""
+    return posixpath.splitext(posixpath.basename(relpath))[0]
+
+
+def reverse_graph(records: Dict[str, FileRecord]) -> Dict[str, Set[str]]:
+    """Map every file to the files that import it.
+
+    Besides the manifest's dependency edges, a package ``__init__`` imports
+    each of its files (re-exports), and importing a file from another
+    package also loads that package's ``__init__``.
+    """
+    dependents: Dict[str, Set[str]] = {}
+    for relpath, record in records.items():
+        own_init = package_init(relpath)
+        if relpath != own_init:
+            dependents.setdefault(relpath, set()).add(own_init)
+        for target in record.get("dependencies", ()):
+            dependents.setdefault(target, set()).add(relpath)
+            target_init = package_init(target)
+            if target_init != own_init:
+                dependents.setdefault(target_init, set()).add(relpath)
+    return dependents
+
+
+class Corpus:
+    """In-memory view of a corpus that a trace is drawn against.
+
+    Edits are applied to this view only, so that later steps see the state
+    earlier steps left behind; the files on disk are never touched.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        try:
+            manifest = json.loads((root / MANIFEST_NAME).read_text())
+        except FileNotFoundError:
+            raise SystemExit(f"{root}: no {MANIFEST_NAME}; generate the corpus first") from None
+        self.corpus_key: str = manifest.get("corpus_key", "")
+        self.records: Dict[str, FileRecord] = manifest["files"]
+        self.files: Set[str] = set(self.records)
+        self.added: List[str] = []
+        self.dependents = reverse_graph(self.records)
+        self._lines: Dict[str, List[str]] = {}
+
+    def lines(self, relpath: str) -> List[str]:
+        """Current content of a file, split on newlines."""
+        if relpath not in self._lines:
+            self._lines[relpath] = (self.root / relpath).read_text().split("\n")
+        return self._lines[relpath]
+
+    def parse(self, relpath: str) -> ast.Module:
+        try:
+            return ast.parse("\n".join(self.lines(relpath)))
+        except SyntaxError as error:
+            version = ".".join(map(str, sys.version_info[:2]))
+            raise SystemExit(
+                f"{self.root / relpath}:{error.lineno}: Python {version} cannot parse this file ({error.msg}); "
+                "--dialect pep695 corpora need Python 3.12 or later to draw edit traces"
+            ) from None
+
+    def importers(self, relpath: str) -> Set[str]:
+        """Files that import ``relpath`` directly."""
+        return self.dependents.get(relpath, set()) & self.files
+
+    def reach(self, relpath: str) -> Set[str]:
+        """Every file that depends on ``relpath``, directly or transitively."""
+        seen: Set[str] = set()
+        pending = [relpath]
+        while pending:
+            for dependent in self.importers(pending.pop()):
+                if dependent not in seen:
+                    seen.add(dependent)
+                    pending.append(dependent)
+        seen.discard(relpath)
+        return seen
+
+    def modules(self) -> List[str]:
+        """Python and stub files other than package ``__init__`` files."""
+        return sorted(relpath for relpath in self.files if module_name(relpath) != "__init__")
+
+    def apply(self, action: Action) -> None:
+        """Apply a primitive action to the in-memory view."""
+        path = action["path"]
+        op = action["op"]
+        if op == "create":
+            self.files.add(path)
+            self._lines[path] = action["content"].split("\n")
+        elif op == "delete":
+            self.files.discard(path)
+            self._lines.pop(path, None)
+        elif op == "insert":
+            self.lines(path).insert(action["line"] - 1, action["text"])
+        elif op == "remove":
+            del self.lines(path)[action["line"] - 1]
+        else:
+            self.lines(path)[action["line"] - 1] = action["new"]
+
+
+def classify(corpus: Corpus, changed: Iterable[str]) -> Dict[str, Any]:
+    """Blast radius of an interface change to the ``changed`` files."""
+    changed = set(changed)
+    direct: Set[str] = set()
+    reach: Set[str] = set()
+    for relpath in changed:
+        direct |= corpus.importers(relpath)
+        reach |= corpus.reach(relpath)
+    reach -= changed
+    radius = "file" if not reach else "direct" if reach <= direct else "transitive"
+    return {"radius": radius, "affected": len(changed | reach)}
+
+
+def _public_symbol(tree: ast.Module) -> Optional[str]:
+    for node in tree.body:
+        if isinstance(node, (ast.ClassDef, ast.FunctionDef)) and not node.name.startswith("_"):
+            return node.name
+    return None
+
+
+def _signature_candidates(tree: ast.Module) -> List[ast.FunctionDef]:
+    """Public, undecorated functions and methods that take no ``**kwargs``."""
+    functions: List[ast.FunctionDef] = []
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef):
+            bases = {ast.unparse(base) for base in node.bases}
+            if any("Protocol" in base or "TypedDict" in base for base in bases):
+                continue
+            functions.extend(item for item in node.body if isinstance(item, ast.FunctionDef))
+        elif isinstance(node, ast.FunctionDef):
+            functions.append(node)
+    return [
+        function for function in functions
+        if not function.name.startswith("_") and not function.decorator_list and function.args.kwarg is None
+    ]
+
+
+def _body_candidates(corpus: Corpus, relpath: str) -> List[ast.FunctionDef]:
+    """Functions whose body has statements of its own, on lines of their own.
+
+    One-line definitions (``def f() -> int: ...``) and stub bodies, which
+    overload signatures and ``.pyi`` files are made of, have no line to
+    insert a statement before.
+    """
+    lines = corpus.lines(relpath)
+    candidates: List[ast.FunctionDef] = []
+    for node in ast.walk(corpus.parse(relpath)):
+        if not isinstance(node, ast.FunctionDef):
+            continue
+        first = node.body[0]
+        if lines[first.lineno - 1][:first.col_offset].strip():
+            continue
+        statements = [
+            statement for statement in node.body
+            if not (isinstance(statement, ast.Expr) and isinstance(statement.value, ast.Constant))
+        ]
+        if statements:
+            candidates.append(node)
+    return candidates
+
+
+def edit_body(corpus: Corpus, rng: random.Random, step: int) -> Optional[Edit]:
+    relpath = rng.choice(corpus.modules())
+    functions = _body_candidates(corpus, relpath)
+    if not functions:
+        return None
+    body = rng.choice(functions).body
+    has_docstring = isinstance(body[0], ast.Expr) and isinstance(getattr(body[0], "value", None), ast.Constant)
+    anchor = body[1] if has_docstring and len(body) > 1 else body[0]
+    line = min([anchor.lineno] + [node.lineno for node in getattr(anchor, "decorator_list", [])])
+    text = " " * anchor.col_offset + f"_ = {step}"
+    return Edit(step, "body", relpath, "file", 1, [{"op": "insert", "path": relpath, "line": line, "text": text}])
+
+
+def edit_signature(corpus: Corpus, rng: random.Random, step: int) -> Optional[Edit]:
+    ranked = sorted(corpus.modules(), key=lambda relpath: (-len(corpus.importers(relpath)), relpath))
+    relpath = rng.choice(ranked[:max(1, len(ranked) // 10)])
+    candidates = _signature_candidates(corpus.parse(relpath))
+    if not candidates:
+        return None
+    function = rng.choice(candidates)
+    old = corpus.lines(relpath)[function.lineno - 1]
+    start = old.find(f"def {function.name}(")
+    if start < 0:
+        return None
+    position = start + len(f"def {function.name}(")
+    depth = 1
+    close = position
+    while close < len(old) and depth:
+        depth += {"(": 1, ")": -1}.get(old[close], 0)
+        close += 1
+    if depth:
+        return None  # multi-line signature
+    close -= 1
+    separator = ", " if old[position:close].strip() else ""
+    new = f"{old[:close]}{separator}trace_{step}: int = 0{old[close:]}"
+    action = {"op": "replace", "path": relpath, "line": function.lineno, "old": old, "new": new}
+    return Edit(step, "signature", relpath, actions=[action], **classify(corpus, [relpath]))
+
+
+def edit_add(corpus: Corpus, rng: random.Random, step: int) -> Optional[Edit]:
+    package = posixpath.dirname(rng.choice(corpus.modules()))
+    relpath = posixpath.join(package, f"trace_{step:03d}.py")
+    content = f'''"""Module added by edit trace step {step}."""
+
+
+def traced_{step}(values: list[int]) -> int:
+    """Sum of ``values``."""
+    return sum(values)
+'''
+    corpus.added.append(relpath)
+    return Edit(step, "add", relpath, "file", 1, [{"op": "create", "path": relpath, "content": content}])
+
+
+def export_lines(lines: List[str], module_name: str) -> List[int]:
+    """Indexes of the ``__init__`` lines that re-export ``module_name``.
+
+    Covers every export style of generate_sample_code.py: the import
+    statement (wrapped or not, guarded by TYPE_CHECKING or not) and the
+    ``__all__`` entries of the names it imports.
+    """
+    prefix = f"from .{module_name} import "
+    found: List[int] = []
+    names: List[str] = []
+    for index, line in enumerate(lines):
+        if not line.strip().startswith(prefix):
+            continue
+        end = index
+        if line.rstrip().endswith("("):
+            while not lines[end].strip().startswith(")"):
+                end += 1
+        found.extend(range(index, end + 1))
+        imported = " ".join(lines[index:end + 1]).split(" import ", 1)[1]
+        names.extend(item.split(" as ")[0].strip() for item in imported.strip("() ").split(","))
+    entries = {f'"{name}",' for name in names if name and name != "*"}
+    found.extend(index for index, line in enumerate(lines) if line.strip() in entries)
+    return sorted(found)
+
+
+def edit_delete(corpus: Corpus, rng: random.Random, step: int) -> Optional[Edit]:
+    added = [relpath for relpath in corpus.added if relpath in corpus.files]
+    if added and rng.random() < 0.5:
+        relpath = rng.choice(added)
+        content = "\n".join(corpus.lines(relpath))
+        return Edit(step, "delete", relpath, "file", 1, [{"op": "delete", "path": relpath, "content": content}])
+
+    # Only files nothing but their own __init__ imports, so the corpus
+    # still resolves after the deletion
+    leaves = [relpath for relpath in corpus.modules() if corpus.importers(relpath) <= {package_init(relpath)}]
+    if not leaves:
+        return None
+    relpath = rng.choice(leaves)
+    init = package_init(relpath)
+    actions: List[Action] = [{"op": "delete", "path": relpath, "content": "\n".join(corpus.lines(relpath))}]
+    if init in corpus.files:
+        lines = corpus.lines(init)
+        # Bottom-up, so each line number still holds when its action runs
+        for index in reversed(export_lines(lines, module_name(relpath))):
+            actions.append({"op": "remove", "path": init, "line": index + 1, "text": lines[index]})
+    return Edit(step, "delete", relpath, actions=actions, **classify(corpus, [relpath, init]))
+
+
+def edit_export(corpus: Corpus, rng: random.Random, step: int) -> Optional[Edit]:
+    relpath = rng.choice(corpus.modules())
+    init = package_init(relpath)
+    symbol = _public_symbol(corpus.parse(relpath))
+    if symbol is None or init not in corpus.files:
+        return None
+    lines = corpus.lines(init)
+    text = f"from .{module_name(relpath)} import {symbol} as {symbol}"
+    if text in lines:
+        return None
+    line = next((index + 1 for index, item in enumerate(lines) if item.startswith("__all__")), len(lines))
+    action = {"op": "insert", "path": init, "line": line, "text": text}
+    return Edit(step, "export", init, actions=[action], **classify(corpus, [init]))
+
+
+EDITORS = {
+    "body": edit_body,
+    "signature": edit_signature,
+    "add": edit_add,
+    "delete": edit_delete,
+    "export": edit_export,
+}
+
+
+def generate_trace(root: Path, steps: int, seed: int, mix: Dict[str, int]) -> Dict[str, Any]:
+    """Draw a seeded trace of ``steps`` edits against the corpus at ``root``."""
+    corpus = Corpus(root)
+    rng = random.Random(seed)
+    kinds = [kind for kind in EDIT_KINDS if mix.get(kind, 0) > 0]
+    weights = [mix[kind] for kind in kinds]
+    edits: List[Edit] = []
+    while len(edits) < steps:
+        for _attempt in range(20):
+            edit = EDITORS[rng.choices(kinds, weights)[0]](corpus, rng, len(edits))
+            if edit is not None:
+                break
+        else:
+            raise SystemExit(f"{root}: could not draw edit {len(edits)} (corpus too small?)")
+        for action in edit.actions:
+            corpus.apply(action)
+        edits.append(edit)
+    return {
+        "corpus": str(root),
+        "corpus_key": corpus.corpus_key,
+        "seed": seed,
+        "mix": mix,
+        "steps": [asdict(edit) for edit in edits],
+    }
+
+
+def invert(action: Action) -> Action:
+    """The action that undoes ``action``."""
+    if action["op"] == "replace":
+        return {**action, "old": action["new"], "new": action["old"]}
+    return {**action, "op": INVERSE_OPS[action["op"]]}
+
+
+def apply_action(root: Path, action: Action) -> None:
+    """Apply a primitive action to the files on disk.
+
+    Every action checks that the file still holds what the trace expects,
+    so replaying against the wrong corpus fails instead of corrupting it.
+    Files are replaced rather than written in place, because they may be
+    hardlinks into the corpus store.
+    """
+    path = root / action["path"]
+    op = action["op"]
+    if op == "create":
+        if path.exists():
+            raise SystemExit(f"{path}: already exists")
+        path.write_text(action["content"])
+        return
+    content = path.read_text()
+    if op == "delete":
+        if content != action["content"]:
+            raise SystemExit(f"{path}: content differs from the trace")
+        path.unlink()
+        return
+
+    lines = content.split("\n")
+    index = action["line"] - 1
+    if op == "insert":
+        lines.insert(index, action["text"])
+    else:
+        expected = action["text"] if op == "remove" else action["old"]
+        if index >= len(lines) or lines[index] != expected:
+            raise SystemExit(f"{path}:{action['line']}: does not match the trace")
+        if op == "remove":
+            del lines[index]
+        else:
+            lines[index] = action["new"]
+    path.unlink()
+    path.write_text("\n".join(lines))
+
+
+def replay(
+    trace: Dict[str, Any],
+    root: Path,
+    limit: Optional[int] = None,
+    revert: bool = False,
+    command: Optional[str] = None,
+    delay: float = 0.0,
+) -> List[Dict[str, Any]]:
+    """Apply (or undo) the steps of a trace, timing ``command`` after each one."""
+    steps = trace["steps"][:limit]
+    if revert:
+        steps = [
+            {**step, "actions": [invert(action) for action in reversed(step["actions"])]}
+            for step in reversed(steps)
+        ]
+    results: List[Dict[str, Any]] = []
+    for step in steps:
+        for action in step["actions"]:
+            apply_action(root, action)
+        result = {key: step[key] for key in ("step", "kind", "path", "radius", "affected")}
+        if command:
+            started = time.perf_counter()
+            completed = subprocess.run(shlex.split(command), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            result["seconds"] = round(time.perf_counter() - started, 4)
+            result["returncode"] = completed.returncode
+        results.append(result)
+        seconds = f"  {result['seconds']:.3f}s" if command else ""
+        print(
+            f"step {step['step']:>4}  {step['kind']:<9} {step['radius']:<10} "
+            f"{step['affected']:>6} files  {step['path']}{seconds}"
+        )
+        if delay:
+            time.sleep(delay)
+    return results
+
+
+def parse_mix(parser: argparse.ArgumentParser, spec: str) -> Dict[str, int]:
+    mix: Dict[str, int] = {}
+    for item in spec.split(","):
+        kind, _, weight = item.partition("=")
+        if kind not in EDIT_KINDS or not weight.isdigit():
+            parser.error(f"bad --mix entry {item!r} (expected KIND=WEIGHT, KIND in {', '.join(EDIT_KINDS)})")
+        mix[kind] = int(weight)
+    if not any(mix.values()):
+        parser.error("--mix needs at least one non-zero weight")
+    return mix
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command_name", required=True)
+
+    generate = commands.add_parser("generate", help="draw a trace for a generated corpus")
+    generate.add_argument("corpus", type=Path, help="codebase directory, e.g. sample-code/large")
+    generate.add_argument("-n", "--steps", type=int, default=50, help="number of edits (default: %(default)s)")
+    generate.add_argument("--seed", type=int, default=0, help="trace seed (default: %(default)s)")
+    generate.add_argument(
+        "--mix",
+        default=",".join(f"{kind}={weight}" for kind, weight in DEFAULT_MIX.items()),
+        help="relative weights of the edit kinds (default: %(default)s)",
+    )
+    generate.add_argument("-o", "--output", type=Path, help="trace file (default: stdout)")
+
+    run = commands.add_parser("replay", help="apply a trace to its corpus")
+    run.add_argument("trace", type=Path, help="trace file written by generate")
+    run.add_argument("--corpus", type=Path, help="corpus to edit (default: the one in the trace)")
+    run.add_argument("--steps", type=int, help="only replay the first N steps")
+    run.add_argument("--revert", action="store_true", help="undo the (first N) steps, last first")
+    run.add_argument("--command", help="checker command to time after every step")
+    run.add_argument("--delay", type=float, default=0.0, help="seconds to wait after every step (watch mode)")
+    run.add_argument("--json", type=Path, help="write per-step results to this file")
+
+    args = parser.parse_args(argv)
+    if args.command_name == "generate":
+        args.mix = parse_mix(parser, args.mix)
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Generate or replay an edit trace."""
+    args = parse_args(argv)
+    if args.command_name == "generate":
+        trace = generate_trace(args.corpus, args.steps, args.seed, args.mix)
+        text = json.dumps(trace, indent=1) + "\n"
+        if args.output is None:
+            print(text, end="")
+        else:
+            args.output.write_text(text)
+        return
+
+    trace = json.loads(args.trace.read_text())
+    results = replay(
+        trace,
+        args.corpus or Path(trace["corpus"]),
+        limit=args.steps,
+        revert=args.revert,
+        command=args.command,
+        delay=args.delay,
+    )
+    if args.json is not None:
+        args.json.write_text(json.dumps(results, indent=1) + "\n")
+
+
+if __name__ == "__main__":
+    main()
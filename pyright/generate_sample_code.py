@@ -7,6 +7,10 @@ Creates three test codebases of varying sizes:
 - medium: ~75 files
 - large: ~250 files
 
+Two massive-scale tiers are available on request (they are not built by
+default): xlarge (~10k files) and huge (~100k files). They use generated
+module names and nested package directories.
+
 The generated code uses realistic type annotations including:
 - Basic types (str, int, bool, list, dict)
 - Generics (TypeVar, Generic)
@@ -14,21 +18,100 @@ The generated code uses realistic type annotations including:
 - TypedDict
 - Optional, Union
 - Callable
-- Cross-module imports (to simulate real dependency graphs)
+- Cross-module imports (to simulate real dependency graphs), drawn from a
+  seeded layered DAG when --dependencies is given
+
+--site-packages builds a fake virtualenv of generated third-party
+distributions (typed, stub-only and untyped) next to a codebase and makes
+its files import from it.
+
+--library makes each codebase an installable, py.typed library with a
+pyproject.toml and a public ``api`` module, for pyright --verifytypes and
+--createstub (see library_benchmark.py).
+
+--stubs emits a .pyi stub of every file next to it, or instead of it.
+
+--monorepo lays out several codebases as projects of one repository, each
+with its own checker config, importing each other through extraPaths
+(see monorepo_benchmark.py).
+
+--giants adds a few giant modules (10k lines by default) to an otherwise
+normal corpus, to reproduce the long-tail files that limit --threads
+speedup.
+
+--target-lines and --target-seconds calibrate a "calibrated" codebase to
+a total line count or to a wall-clock check time of --checker.
 """
 
+import argparse
+import ast
+import hashlib
+import json
 import os
 import random
+import re
+import shlex
+import shutil
+import subprocess
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field, replace
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List
-
-# Configuration for each size
-SIZES = {
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+from profile_codebase import profile_source
+from site_packages import DISTRIBUTION_KINDS, SiteSpec, site_imports, write_venv
+from stub_mirror import STUB_MODES, STUB_SUFFIX, to_stub
+from syntax_dialects import DIALECTS, to_dialect
+from template_packs import PACK_OPTIONS, PACKS
+from template_variation import vary
+
+SAMPLE_CODE_DIR = Path(__file__).parent / "sample-code"
+
+# Configuration for each size. ``depth`` is the number of package levels
+# from the codebase root down to a module (1 = flat, the default) and
+# ``layout`` one of LAYOUTS (default "balanced").
+SizeConfig = Dict[str, Any]
+
+SIZES: Dict[str, SizeConfig] = {
     "small": {"modules": 3, "files_per_module": 5},
     "medium": {"modules": 5, "files_per_module": 15},
     "large": {"modules": 10, "files_per_module": 25},
+    "xlarge": {"modules": 100, "files_per_module": 100, "depth": 2},
+    "huge": {"modules": 1000, "files_per_module": 100, "depth": 3},
 }
 
+# Sizes built when none are named on the command line
+DEFAULT_SIZES = ["small", "medium", "large"]
+
+# Directory shapes. Every layout distributes the same total number of files
+# (modules x files_per_module); only the package tree differs.
+#   balanced  equal-sized modules spread evenly over ``depth`` levels
+#   deep      modules nested inside each other in chains ``depth`` long
+#   wide      every file in one flat package
+#   skewed    one package with half of the files, the rest in tiny packages
+#   mixed     seeded heavy-tailed package sizes at random depths
+LAYOUTS = ["balanced", "deep", "wide", "skewed", "mixed"]
+DEEP_LAYOUT_LEVELS = 8
+SKEWED_SHARE = 0.5
+SKEWED_TINY_FILES = 2
+
 MODULE_NAMES = [
     "core",
     "models",
@@ -429,6 +512,132 @@ def safe_get(d: Dict[K, V], *keys: K, default: Optional[V] = None) -> Optional[V
 }
 
 
+def generate_module_names(count: int) -> List[str]:
+    """Return ``count`` unique module names.
+
+    The first names come from MODULE_NAMES. After those run out, they are
+    reused with a numeric suffix (``core_1``, ``models_1``, ...).
+    """
+    names: List[str] = []
+    for i in range(count):
+        base = MODULE_NAMES[i % len(MODULE_NAMES)]
+        round_ = i // len(MODULE_NAMES)
+        names.append(base if round_ == 0 else f"{base}_{round_}")
+    return names
+
+
+def _group_fanout(modules: int, depth: int) -> int:
+    """Packages per level needed to spread ``modules`` over ``depth`` levels."""
+    fanout = 1
+    while fanout ** depth < modules:
+        fanout += 1
+    return fanout
+
+
+def module_paths(config: SizeConfig) -> List[str]:
+    """Return the package path of every module, relative to the codebase root.
+
+    With ``depth`` > 1, modules are spread evenly over ``depth - 1`` levels
+    of ``group_NN`` packages, e.g. ``group_03/group_01/core_12``.
+    """
+    names = generate_module_names(config["modules"])
+    depth = config.get("depth", 1)
+    if depth <= 1:
+        return names
+
+    fanout = _group_fanout(len(names), depth)
+    paths: List[str] = []
+    for i, name in enumerate(names):
+        parts: List[str] = []
+        for level in range(depth - 1, 0, -1):
+            parts.append(f"group_{(i // fanout ** level) % fanout:02d}")
+        paths.append("/".join(parts + [name]))
+    return paths
+
+
+def _apportion(total: int, weights: List[float]) -> List[int]:
+    """Split ``total`` into integer shares proportional to ``weights``.
+
+    Every share is at least 1 (``total`` must cover that); the remainder
+    goes to the largest fractional parts so the shares sum to ``total``.
+    """
+    spare = total - len(weights)
+    scale = spare / sum(weights)
+    shares = [1 + int(weight * scale) for weight in weights]
+    order = sorted(
+        range(len(weights)),
+        key=lambda i: (weights[i] * scale - int(weights[i] * scale), -i),
+        reverse=True,
+    )
+    for i in order[: total - sum(shares)]:
+        shares[i] += 1
+    return shares
+
+
+def plan_modules(config: SizeConfig, seed: int = 0) -> List[Tuple[str, int]]:
+    """Return ``(package path, file count)`` for every module of a codebase.
+
+    The package tree follows the size's ``layout``; see LAYOUTS.
+    """
+    layout = config.get("layout", "balanced")
+    modules = config["modules"]
+    files_per_module = config["files_per_module"]
+    total = modules * files_per_module
+    depth = config.get("depth", 1)
+
+    if layout == "balanced":
+        return [(path, files_per_module) for path in module_paths(config)]
+
+    if layout == "deep":
+        levels = depth if depth > 1 else DEEP_LAYOUT_LEVELS
+        names = generate_module_names(modules)
+        return [
+            ("/".join(names[i - i % levels:i + 1]), files_per_module)
+            for i in range(modules)
+        ]
+
+    if layout == "wide":
+        return [(generate_module_names(1)[0], total)]
+
+    if layout == "skewed":
+        big = max(1, int(total * SKEWED_SHARE))
+        rest = total - big
+        tiny = -(-rest // SKEWED_TINY_FILES)
+        names = generate_module_names(1 + tiny)
+        plan = [(names[0], big)]
+        for k in range(tiny):
+            plan.append((names[k + 1], min(SKEWED_TINY_FILES, rest - k * SKEWED_TINY_FILES)))
+        return plan
+
+    if layout == "mixed":
+        rng = random.Random(seed)
+        names = generate_module_names(modules)
+        counts = _apportion(total, [rng.paretovariate(1.2) for _ in names])
+        max_depth = max(depth, 4)
+        plan = []
+        for name, count in zip(names, counts):
+            groups = [f"group_{rng.randrange(3):02d}" for _ in range(rng.randrange(max_depth))]
+            plan.append(("/".join(groups + [name]), count))
+        return plan
+
+    raise ValueError(f"unknown layout {layout!r} (choose from {', '.join(LAYOUTS)})")
+
+
+def group_packages(paths: List[str]) -> List[str]:
+    """Return the intermediate package directories above the given modules.
+
+    Directories that are modules themselves (as in the deep layout) render
+    their own ``__init__.py`` and are not included.
+    """
+    modules = set(paths)
+    groups: Set[str] = set()
+    for path in paths:
+        parts = path.split("/")[:-1]
+        for i in range(1, len(parts) + 1):
+            groups.add("/".join(parts[:i]))
+    return sorted(groups - modules)
+
+
 def generate_class_name(module: str, index: int) -> str:
     """Generate a class name based on module and index."""
     prefixes = ["Base", "Core", "Main", "Primary", "Default", "Custom", "Extended", "Abstract"]
@@ -436,103 +645,2319 @@ def generate_class_name(module: str, index: int) -> str:
 
     prefix = prefixes[index % len(prefixes)]
     suffix = suffixes[(index + len(module)) % len(suffixes)]
-    module_part = module.capitalize()
+    module_part = "".join(part.capitalize() for part in module.split("_"))
 
     return f"{prefix}{module_part}{suffix}"
 
 
-def write_init_file(module_path: Path, file_names: List[str]) -> None:
-    """Write __init__.py with exports."""
-    exports: List[str] = []
-    imports: List[str] = []
+# ---------------------------------------------------------------------------
+# Cross-module dependency graph
+# ---------------------------------------------------------------------------
 
-    for fname in file_names:
-        module_name = fname.replace(".py", "")
-        imports.append(f"from .{module_name} import *")
 
-    content = f'''"""{module_path.name} module."""
-{chr(10).join(imports)}
+@dataclass(frozen=True)
+class GraphOptions:
+    """Shape of the cross-module import graph.
 
-__all__: list[str] = []
+    Every file is assigned one of ``layers`` layers and only imports from
+    lower layers, so the graph is a DAG whose longest import chain is
+    ``layers - 1`` edges. ``cycles`` reverses that many edges, each guarded
+    by ``TYPE_CHECKING`` so the cycle exists for the checker only.
+    """
+
+    layers: int = 4
+    fan_out: int = 3
+    fan_in: int = 8
+    cross_package: float = 0.5
+    cycles: int = 0
+    seed: int = 0
+
+
+class PackSpec(NamedTuple):
+    """A template pack selected with --pack, and its settings."""
+
+    name: str
+    intensity: int = 1
+    options: Tuple[Tuple[str, int], ...] = ()
+
+
+@dataclass(frozen=True)
+class ProfileSpec:
+    """Generation parameters fitted to a profile_codebase.py profile.
+
+    ``kinds`` is the cycle of base templates whose mix best matches the
+    profile's class, function, import and generics densities. ``lines``
+    holds the profile's file-size quantiles, from which each file's length
+    is sampled.
+    """
+
+    kinds: Tuple[str, ...]
+    lines: Tuple[int, ...]
+    source: str = ""
+
+
+class ProjectLink(NamedTuple):
+    """Another monorepo project whose files a codebase imports, absolutely by package name."""
+
+    package: str
+    plan: Tuple[Tuple[str, int], ...]
+    kinds: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class RenderOptions:
+    """Everything besides the size config that changes rendered content."""
+
+    graph: Optional[GraphOptions] = None
+    seed: int = 0
+    packs: Tuple[PackSpec, ...] = ()
+    packs_only: bool = False
+    giants: int = 0
+    giant_lines: int = 10000
+    profile: Optional[ProfileSpec] = None
+    vary: bool = False
+    dialect: str = "mixed"
+    exports: str = "star"
+    site: Optional[SiteSpec] = None
+    library: bool = False
+    stubs: str = "none"
+    links: Tuple[ProjectLink, ...] = ()
+    link_imports: int = 1
+
+    @property
+    def kinds(self) -> List[str]:
+        """File kinds cycled through in every module.
+
+        Each pack follows a base template, so pack files appear early in
+        every module, even in small ones. With a profile, the base
+        templates follow its fitted mix.
+        """
+        templates = list(self.profile.kinds) if self.profile else list(TEMPLATES)
+        base = [] if self.packs_only and self.packs else templates
+        packs = [pack.name for pack in self.packs]
+        cycle: List[str] = []
+        for position in range(max(len(base), len(packs))):
+            cycle.extend(base[position:position + 1] + packs[position:position + 1])
+        return cycle
+
+
+class Edge(NamedTuple):
+    """An import of file ``target_index`` of package ``target_module``."""
+
+    target_module: str
+    target_index: int
+    target_kind: str
+    cycle: bool = False
+
+
+# Per package, per importing file index: the files it imports
+DependencyGraph = Dict[str, Dict[int, List[Edge]]]
+
+# The symbol each template kind is imported for
+PRIMARY_EXPORTS = {
+    "dataclass": "{class_name}",
+    "protocol": "{class_name}Protocol",
+    "service": "{class_name}Service",
+    "typeddict": "{class_name}Config",
+}
+
+
+def template_kind(index: int, kinds: Optional[List[str]] = None) -> str:
+    """Template used for the file at ``index`` of a module."""
+    template_names = kinds or list(TEMPLATES.keys())
+    return template_names[index % len(template_names)]
+
+
+def build_dependency_graph(
+    plan: List[Tuple[str, int]],
+    options: GraphOptions,
+    kinds: Optional[List[str]] = None,
+) -> DependencyGraph:
+    """Draw a seeded, layered import graph over every file of a codebase.
+
+    Each file picks up to ``fan_out`` targets in strictly lower layers,
+    in another package with probability ``cross_package``. No file is
+    imported by more than ``fan_in`` others. Only base-template files are
+    import targets; files of any kind import them.
+    """
+    rng = random.Random(options.seed)
+    layers = max(1, options.layers)
+    paths = [module_path for module_path, _ in plan]
+    layer: Dict[Tuple[str, int], int] = {}
+    pools: Dict[Tuple[str, int], List[int]] = {}
+    for module_path, file_count in plan:
+        for index in range(file_count):
+            node_layer = rng.randrange(layers)
+            layer[(module_path, index)] = node_layer
+            if template_kind(index, kinds) in TEMPLATES:
+                pools.setdefault((module_path, node_layer), []).append(index)
+
+    graph: DependencyGraph = {}
+    fan_in: Dict[Tuple[str, int], int] = {}
+    edges: List[Tuple[str, int, Edge]] = []
+
+    for position, (module_path, file_count) in enumerate(plan):
+        for index in range(file_count):
+            node_layer = layer[(module_path, index)]
+            if node_layer == 0:
+                continue
+            chosen: Set[Tuple[str, int]] = set()
+            for _ in range(options.fan_out):
+                for _attempt in range(8):
+                    target_module = module_path
+                    if len(paths) > 1 and rng.random() < options.cross_package:
+                        other = rng.randrange(len(paths) - 1)
+                        target_module = paths[other if other < position else other + 1]
+                    pool = pools.get((target_module, rng.randrange(node_layer)))
+                    if not pool:
+                        continue
+                    target = (target_module, rng.choice(pool))
+                    if target in chosen or fan_in.get(target, 0) >= options.fan_in:
+                        continue
+                    chosen.add(target)
+                    fan_in[target] = fan_in.get(target, 0) + 1
+                    edge = Edge(target[0], target[1], template_kind(target[1], kinds))
+                    graph.setdefault(module_path, {}).setdefault(index, []).append(edge)
+                    edges.append((module_path, index, edge))
+                    break
+
+    # Close cycles by adding the reverse of existing edges. Only kinds with a
+    # primary export to annotate with can be a cycle target.
+    candidates = [
+        (module_path, index, edge)
+        for module_path, index, edge in edges
+        if template_kind(index, kinds) in PRIMARY_EXPORTS
+    ]
+    for module_path, index, edge in rng.sample(candidates, min(options.cycles, len(candidates))):
+        graph.setdefault(edge.target_module, {}).setdefault(edge.target_index, []).append(
+            Edge(module_path, index, template_kind(index, kinds), cycle=True)
+        )
+    return graph
+
+
+def relative_import(from_package: str, to_package: str) -> str:
+    """Relative module reference from one package of a codebase to another."""
+    source = from_package.split("/")
+    target = to_package.split("/")
+    common = 0
+    while common < min(len(source), len(target)) and source[common] == target[common]:
+        common += 1
+    return "." * (len(source) - common + 1) + ".".join(target[common:])
+
+
+def protocol_sources(plan: List[Tuple[str, int]], kinds: List[str]) -> Dict[str, Edge]:
+    """Protocol file to import from, for the hierarchy files of each package.
+
+    The hierarchy pack checks its classes against the Repository, Cache
+    and EventHandler protocols of another package: package ``i`` uses the
+    protocol file of package ``i // 2``. That spreads conformance checks
+    across the codebase while keeping import chains logarithmically short.
+    Packages whose source has no protocol file are left out.
+    """
+    if "hierarchy" not in kinds or "protocol" not in kinds:
+        return {}
+    index = kinds.index("protocol")
+    sources: Dict[str, Edge] = {}
+    for position, (module_path, _) in enumerate(plan):
+        source_path, source_count = plan[position // 2]
+        if source_count > index:
+            sources[module_path] = Edge(source_path, index, "protocol")
+    return sources
+
+
+def module_reference(module_path: str, edge: Edge) -> str:
+    """Relative module reference from package ``module_path`` to the file ``edge`` points at."""
+    reference = relative_import(module_path, edge.target_module)
+    stem = f"{edge.target_kind}_{edge.target_index:02d}"
+    return reference + ("" if reference.endswith(".") else ".") + stem
+
+
+def _dependency_usage(edge: Edge, alias: str, importer_kind: str, importer_class: str) -> str:
+    """Render code that uses the symbols imported along ``edge``."""
+    kind = edge.target_kind
+    module_name = edge.target_module.rsplit("/", 1)[-1]
+    target_class = generate_class_name(module_name, edge.target_index)
+    origin = edge.target_module.replace("/", ".")
+
+    if edge.cycle:
+        symbol = PRIMARY_EXPORTS[kind].format(class_name=target_class)
+        return f'''def accept_{alias}(value: {alias}.{symbol}) -> {alias}.{symbol}:
+    """Pass through a {symbol} from {origin} (import cycle edge)."""
+    return value
 '''
 
-    init_path = module_path / "__init__.py"
-    init_path.write_text(content)
+    if kind == "dataclass" and importer_kind == "service":
+        consumer = "".join(part.capitalize() for part in alias.split("_"))
+        return f'''class {consumer}Consumer:
+    """Feeds {target_class} entities from {origin} into {importer_class}Service."""
 
+    def __init__(self, service: {importer_class}Service) -> None:
+        self._service = service
+        self._seen = {alias}.{target_class}Collection()
 
-def generate_module(base_path: Path, module_name: str, file_count: int) -> None:
-    """Generate a module with specified number of files."""
-    module_path = base_path / module_name
-    module_path.mkdir(parents=True, exist_ok=True)
+    def consume(self, entity: {alias}.{target_class}) -> ServiceResult[Dict[str, Any]]:
+        """Record the entity and process its dictionary form."""
+        self._seen.add(entity)
+        return self._service.process(entity.to_dict())
+
+    def active(self) -> list[{alias}.{target_class}]:
+        """Entities consumed so far that are still active."""
+        return self._seen.filter_active()
+'''
 
-    template_names = list(TEMPLATES.keys())
+    if kind == "dataclass":
+        return f'''def collect_{alias}(items: list[{alias}.{target_class}]) -> {alias}.{target_class}Collection:
+    """Collect {target_class} entities from {origin}."""
+    collection = {alias}.{target_class}Collection()
+    for item in items:
+        collection.add(item)
+    return collection
+'''
+
+    if kind == "protocol":
+        return f'''def validate_{alias}(items: list[{alias}.{target_class}Protocol]) -> dict[str, bool]:
+    """Validate {target_class}Protocol implementations from {origin}."""
+    return {{item.id: item.validate() for item in items}}
+'''
+
+    if kind == "service":
+        return f'''def run_{alias}(payloads: list[dict[str, object]]) -> list[bool]:
+    """Run payloads through {target_class}Service from {origin}."""
+    service = {alias}.{target_class}Service({{"required_fields": ["id"]}})
+    return [result.success for result in service.batch_process(payloads)]
+'''
+
+    if kind == "typeddict":
+        return f'''def default_{alias}() -> {alias}.{target_class}Config:
+    """Default {target_class}Config from {origin}."""
+    return {{
+        "enabled": True,
+        "max_retries": 3,
+        "timeout_seconds": 30.0,
+        "log_level": "INFO",
+        "tags": [],
+    }}
+'''
+
+    return f'''def batch_{alias}(values: list[int], size: int) -> dict[int, list[int]]:
+    """Chunk and regroup values with helpers from {origin}."""
+    chunks = {alias}.chunk_list(values, size)
+    return {alias}.group_by({alias}.flatten(chunks), lambda value: value % size)
+'''
+
+
+def inject_dependencies(
+    content: str,
+    module_path: str,
+    importer_kind: str,
+    importer_class: str,
+    edges: List[Edge],
+) -> str:
+    """Add typed imports of ``edges`` to a rendered file, and code using them.
+
+    Imports go at the end of the template's import block. Cycle edges are
+    imported under ``TYPE_CHECKING`` and only referenced in annotations.
+    Annotations are deferred with ``from __future__ import annotations``;
+    package ``__init__`` star imports otherwise turn the file-level DAG
+    into package-level cycles that fail at import time.
+    """
+    imports: List[str] = []
+    guarded: List[str] = []
+    usages: List[str] = []
+    for edge in sorted(edges):
+        stem = f"{edge.target_kind}_{edge.target_index:02d}"
+        alias = f"{edge.target_module.replace('/', '_')}_{stem}"
+        statement = f"from {relative_import(module_path, edge.target_module)} import {stem} as {alias}"
+        (guarded if edge.cycle else imports).append(statement)
+        usages.append(_dependency_usage(edge, alias, importer_kind, importer_class))
+
+    if guarded:
+        imports.append("from typing import TYPE_CHECKING")
+        imports.append("")
+        imports.append("if TYPE_CHECKING:")
+        imports.extend(f"    {statement}" for statement in guarded)
+
+    future = "from __future__ import annotations\n"
+    docstring_end = content.index("\n") + 1
+    header_end = content.index("\n\n")
+    return (
+        content[:docstring_end]
+        + ("" if future in content else future)
+        + content[docstring_end:header_end]
+        + "\n"
+        + "\n".join(imports)
+        + content[header_end:]
+        + "".join(f"\n\n{usage}" for usage in usages)
+    )
+
+
+def inject_imports(content: str, imports: List[str], usages: List[str]) -> str:
+    """Add absolute imports to a rendered file, and code using them.
+
+    Used for fake site-packages modules and other monorepo projects. The
+    imports close the template's import block, ahead of any
+    inject_dependencies adds, as absolute imports precede relative ones.
+    """
+    if not imports:
+        return content
+    header_end = content.index("\n\n")
+    return (
+        content[:header_end]
+        + "".join(f"\n{statement}" for statement in imports)
+        + content[header_end:]
+        + "".join(f"\n\n{usage}" for usage in usages)
+    )
+
+
+# How a package __init__.py re-exports the names of its files
+EXPORT_STYLES = ["star", "explicit", "all", "none", "type-checking"]
+
+# A module-level class, function, type alias or assignment
+DEFINITION_RE = re.compile(
+    r"^(?:(?:async[ \t]+)?def|class|type)[ \t]+([A-Za-z]\w*)|^([A-Za-z]\w*)[ \t]*(?::[^=\n]*)?=(?!=)",
+    re.M,
+)
+TYPE_PARAM_RE = re.compile(r"=[ \t]*(?:TypeVar|ParamSpec|TypeVarTuple)\(")
+
+# Import statements longer than this are wrapped one name per line
+IMPORT_WIDTH = 100
+
+
+def public_names(content: str) -> List[str]:
+    """Public names a generated file defines at module level, in order.
+
+    Found with regular expressions rather than ast so that every syntax
+    dialect works. TypeVars are left out.
+    """
+    names: List[str] = []
+    for match in DEFINITION_RE.finditer(content):
+        name = match.group(1) or match.group(2)
+        line = content[match.start():content.find("\n", match.start())]
+        if name not in names and not TYPE_PARAM_RE.search(line):
+            names.append(name)
+    return names
+
+
+def _import_names(module_name: str, names: List[str], indent: str = "") -> str:
+    line = f"{indent}from .{module_name} import {', '.join(names)}"
+    if len(line) <= IMPORT_WIDTH:
+        return line
+    wrapped = "".join(f"{indent}    {name},\n" for name in names)
+    return f"{indent}from .{module_name} import (\n{wrapped}{indent})"
+
+
+def render_init_file(
+    package_name: str,
+    file_names: List[str],
+    style: str = "star",
+    exports: Optional[Dict[str, List[str]]] = None,
+) -> str:
+    """Render __init__.py, re-exporting its files' names in ``style``.
+
+    ``exports`` maps file names to their public names (see public_names),
+    needed by every style but ``star`` and ``none``. A name several files
+    define is imported from the last one, as star imports resolve it:
+
+    - star: ``from .x import *`` for every file, and an empty ``__all__``
+    - explicit: ``from .x import A as A`` (the PEP 484 re-export form)
+    - all: ``from .x import A`` with every name listed in ``__all__``
+    - none: no re-exports
+    - type-checking: explicit re-exports under ``if TYPE_CHECKING:``
+    """
+    docstring = f'''"""{package_name} module."""
+'''
+    modules = [fname.replace(".py", "") for fname in file_names]
+    if style == "star":
+        imports = [f"from .{module_name} import *" for module_name in modules]
+        return f'''{docstring}{chr(10).join(imports)}
+
+__all__: list[str] = []
+'''
+    if style == "none":
+        return docstring
+
+    owners: Dict[str, str] = {}
+    for module_name in modules:
+        for name in (exports or {}).get(f"{module_name}.py", []):
+            owners[name] = module_name
+    by_module = {
+        module_name: [name for name, owner in owners.items() if owner == module_name]
+        for module_name in modules
+    }
+    if style == "all":
+        imports = [_import_names(module_name, names) for module_name, names in by_module.items() if names]
+        listed = "".join(f'    "{name}",\n' for name in owners)
+        return f"{docstring}{chr(10).join(imports)}\n\n__all__ = [\n{listed}]\n"
+
+    indent = "    " if style == "type-checking" else ""
+    imports = [
+        _import_names(module_name, [f"{name} as {name}" for name in names], indent)
+        for module_name, names in by_module.items()
+        if names
+    ]
+    if style == "type-checking":
+        return f"{docstring}from typing import TYPE_CHECKING\n\nif TYPE_CHECKING:\n{chr(10).join(imports)}\n"
+    return f"{docstring}{chr(10).join(imports)}\n"
+
+
+def write_init_file(module_path: Path, file_names: List[str]) -> None:
+    """Write __init__.py with exports."""
+    init_path = module_path / "__init__.py"
+    init_path.write_text(render_init_file(module_path.name, file_names))
+
+
+def iter_module(
+    module_path: str,
+    file_count: int,
+    render: RenderOptions = RenderOptions(),
+    deps: Optional[Dict[int, List[Edge]]] = None,
+    protocols: Optional[Edge] = None,
+    giants: int = 0,
+) -> Iterator[Tuple[str, str]]:
+    """Render a module one file at a time.
+
+    Yields ``(relative path, content)`` pairs, paths relative to the
+    codebase root, ending with the package ``__init__.py``. Only one file
+    is held in memory at a time, so arbitrarily large modules can be
+    streamed straight to disk. ``deps`` maps file indexes to the imports
+    drawn for them by build_dependency_graph. ``protocols`` is the file
+    whose protocols hierarchy pack files conform to (see protocol_sources).
+    ``giants`` giant modules are appended after the regular files (see
+    render_giant).
+    """
+    module_name = module_path.rsplit("/", 1)[-1]
+    template_names = render.kinds
+    packs = {pack.name: pack for pack in render.packs}
     file_names: List[str] = []
+    exports: Dict[str, List[str]] = {}
 
     for i in range(file_count):
         template_key = template_names[i % len(template_names)]
-        template = TEMPLATES[template_key]
-
         class_name = generate_class_name(module_name, i)
-        class_name_lower = class_name.lower()
 
-        content = template.format(
-            module=module_name,
-            class_name=class_name,
-            class_name_lower=class_name_lower,
-        )
+        expand = False
+        if render.profile is not None and template_key in TEMPLATES:
+            target = sample_file_lines(render.profile, render.seed, module_path, i)
+            expand = target > 1.5 * template_profiles()[template_key]["lines"]
+        if expand:
+            cycle = [kind for kind in template_names if kind in TEMPLATES]
+            position = sum(kind in TEMPLATES for kind in template_names[:i % len(template_names)])
+            content = expand_templates(
+                module_name,
+                class_name,
+                cycle[position:] + cycle[:position],
+                target,
+                f"{template_key.capitalize()} code for {module_name}, "
+                f"{{expansions}} template expansions sized by profile.",
+            )
+        elif template_key in TEMPLATES:
+            content = TEMPLATES[template_key].format(
+                module=module_name,
+                class_name=class_name,
+                class_name_lower=class_name.lower(),
+            )
+            if render.vary:
+                content = vary(template_key, content, random.Random(f"{render.seed}:{module_path}:{i}"))
+        else:
+            pack = packs[template_key]
+            settings: Dict[str, Any] = dict(pack.options)
+            if template_key == "hierarchy":
+                settings["protocols"] = None if protocols is None else module_reference(module_path, protocols)
+            content = PACKS[template_key](module_name, class_name, pack.intensity, **settings)
+        if render.site is not None and template_key in TEMPLATES:
+            content = inject_imports(content, *site_imports(render.site, render.seed, module_path, i))
+        if render.links and template_key in TEMPLATES:
+            content = inject_project_imports(content, template_key, class_name, project_edges(render, module_path, i))
+        if deps and i in deps:
+            content = inject_dependencies(content, module_path, template_key, class_name, deps[i])
 
         file_name = f"{template_key}_{i:02d}.py"
-        file_path = module_path / file_name
-        file_path.write_text(content)
+        if render.exports not in ("star", "none"):
+            exports[file_name] = public_names(content)
+        yield from with_stubs(f"{module_path}/{file_name}", content, render.stubs, render.dialect)
         file_names.append(file_name)
-        print(f"  Created: {file_path.relative_to(base_path.parent)}")
 
-    write_init_file(module_path, file_names)
-    print(f"  Created: {module_path / '__init__.py'}")
+    for i in range(file_count, file_count + giants):
+        file_name = f"giant_{i:02d}.py"
+        content = render_giant(module_name, i, render.giant_lines)
+        if render.exports not in ("star", "none"):
+            exports[file_name] = public_names(content)
+        yield from with_stubs(f"{module_path}/{file_name}", content, render.stubs, render.dialect)
+        file_names.append(file_name)
 
+    init = render_init_file(module_name, file_names, render.exports, exports)
+    yield from with_stubs(f"{module_path}/__init__.py", init, render.stubs)
+
+
+def with_stubs(relpath: str, content: str, stubs: str = "none", dialect: str = "mixed") -> Iterator[Tuple[str, str]]:
+    """Yield a rendered file in ``dialect``, and/or its stub as ``stubs`` selects (see STUB_MODES)."""
+    if stubs != "instead":
+        yield relpath, to_dialect(content, dialect)
+    if stubs != "none":
+        yield relpath[:-len(".py")] + STUB_SUFFIX, to_dialect(to_stub(content), dialect)
+
+
+def render_module(module_path: str, file_count: int) -> List[Tuple[str, str]]:
+    """Render a module in memory; see iter_module."""
+    return list(iter_module(module_path, file_count))
+
+
+def render_group_init(group_path: str) -> str:
+    """Render the __init__.py of an intermediate package directory."""
+    return f'''"""{group_path.rsplit("/", 1)[-1]} package."""
+'''
+
+
+def render_root_init(size_name: str, library: bool = False) -> str:
+    """Render the package __init__.py at the root of a codebase.
+
+    A library re-exports its public API (see render_library_api).
+    """
+    api = f"from .{LIBRARY_API.rsplit('.', 1)[0]} import *\n" if library else ""
+    return f'''"""{size_name.capitalize()} test codebase for PyRight benchmarks."""
+{api}__version__ = "0.1.0"
+'''
+
+
+# ---------------------------------------------------------------------------
+# Library mode: an installable, py.typed package
+# ---------------------------------------------------------------------------
+
+LIBRARY_API = "api.py"
+PYPROJECT = "pyproject.toml"
+PY_TYPED = "py.typed"
+
+# Template kinds whose first file in each package contributes to the public API
+API_KINDS = ("dataclass", "service")
+
+
+def api_sources(relpaths: Iterable[str]) -> List[str]:
+    """Files whose classes make up a library's public API, in path order.
+
+    That is the first file of each of API_KINDS in every package.
+    """
+    seen: Set[Tuple[str, str]] = set()
+    sources: List[str] = []
+    for relpath in sorted(relpaths):
+        package, _, file_name = relpath.rpartition("/")
+        kind = file_kind(file_name)
+        if package and kind in API_KINDS and (package, kind) not in seen:
+            seen.add((package, kind))
+            sources.append(relpath)
+    return sources
+
+
+def render_library_api(size_name: str, sources: Dict[str, str]) -> str:
+    """Render the public API module of a library.
+
+    ``sources`` maps codebase-relative paths (see api_sources) to their
+    content. Every public class is imported and listed in ``__all__``; a
+    name that several files define (``ServiceResult``) is taken from the
+    first one.
+    """
+    owners: Dict[str, str] = {}
+    for relpath, content in sources.items():
+        module_name = relpath.rsplit(".", 1)[0].replace("/", ".")
+        for name in public_names(content):
+            if name[0].isupper():
+                owners.setdefault(name, module_name)
+    imports = [
+        _import_names(module_name, [name for name, owner in owners.items() if owner == module_name])
+        for module_name in dict.fromkeys(owners.values())
+    ]
+    listed = "".join(f'    "{name}",\n' for name in owners)
+    return (
+        f'"""Public API of the {size_name} benchmark library."""\n'
+        f"{chr(10).join(imports)}\n\n__all__ = [\n{listed}]\n"
+    )
+
+
+def render_pyproject(size_name: str, packages: List[str], stubs: bool = False) -> str:
+    """Render the pyproject.toml that makes a codebase an installable library.
+
+    The codebase directory is itself the top-level package, mapped with
+    ``package-dir``. ``packages`` are its dotted subpackage names. With
+    ``stubs``, the ``.pyi`` files are shipped as package data.
+    """
+    data = f'\n"*" = ["*{STUB_SUFFIX}"]' if stubs else ""
+    listed = "".join(f'    "{name}",\n' for name in [size_name] + [f"{size_name}.{package}" for package in packages])
+    return f'''[build-system]
+requires = ["setuptools>=61"]
+build-backend = "setuptools.build_meta"
+
+[project]
+name = "pyright-bench-{size_name}"
+version = "0.1.0"
+description = "{size_name.capitalize()} test codebase for PyRight benchmarks."
+requires-python = ">=3.11"
+classifiers = ["Typing :: Typed"]
+
+[tool.setuptools]
+package-dir = {{"{size_name}" = "."}}
+packages = [
+{listed}]
+
+[tool.setuptools.package-data]
+{size_name} = ["{PY_TYPED}"]{data}
+'''
 
-def generate_codebase(size_name: str, config: Dict[str, int]) -> None:
-    """Generate a codebase of specified size."""
-    base_path = Path(__file__).parent / "sample-code" / size_name
+
+# ---------------------------------------------------------------------------
+# Giant modules
+# ---------------------------------------------------------------------------
+
+# Module-level names every template defines the same way; a giant module
+# keeps the first definition instead of renaming each copy
+SHARED_NAMES = {"T", "K", "V", "R", "logger"}
+
+
+def giant_hosts(plan: List[Tuple[str, int]], count: int, seed: int) -> Dict[str, int]:
+    """Spread ``count`` giant modules over the packages of a codebase (seeded)."""
+    if not plan or count <= 0:
+        return {}
+    rng = random.Random(f"giants-{seed}")
+    return dict(Counter(plan[rng.randrange(len(plan))][0] for _ in range(count)))
+
+
+def _top_level_names(tree: ast.Module) -> List[str]:
+    """Names bound by the top-level statements of a parsed file."""
+    names: List[str] = []
+    for node in tree.body:
+        if isinstance(node, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)):
+            names.append(node.name)
+        elif isinstance(node, ast.Assign):
+            names.extend(target.id for target in node.targets if isinstance(target, ast.Name))
+        elif isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name):
+            names.append(node.target.id)
+    return names
+
+
+def expand_templates(
+    module: str,
+    class_name: str,
+    kinds: List[str],
+    target_lines: int,
+    docstring: str,
+) -> str:
+    """Render one file of at least ``target_lines`` lines from base templates.
+
+    The templates in ``kinds`` are expanded in turn. The first expansion
+    uses ``class_name`` and keeps the template's names, so the file still
+    exports what a plain file of that kind would. Each later expansion
+    gets a fresh class name, and the fixed names its template defines
+    (such as Repository or chunk_list) get a per-expansion suffix so that
+    nothing is redeclared. Imports are merged into a single header.
+    ``docstring`` may refer to ``{expansions}``.
+    """
+    imports: Dict[Tuple[str, str], List[str]] = {}
+    shared: Dict[str, str] = {}
+    chunks: List[str] = []
+    total = 0
+    expansion = 0
+
+    while total < target_lines or expansion == 0:
+        template_key = kinds[expansion % len(kinds)]
+        name = class_name if expansion == 0 else f"{generate_class_name(module, expansion)}{expansion}"
+        source = TEMPLATES[template_key].format(
+            module=module,
+            class_name=name,
+            class_name_lower=name.lower(),
+        )
+        lines = source.splitlines()
+        tree = ast.parse(source)
+
+        kept: List[str] = []
+        for position, node in enumerate(tree.body):
+            start = min([node.lineno] + [d.lineno for d in getattr(node, "decorator_list", [])])
+            text = "\n".join(lines[start - 1:node.end_lineno])
+            if isinstance(node, ast.ImportFrom):
+                names = imports.setdefault(("from", node.module or ""), [])
+                names.extend(a.name for a in node.names if a.name not in names)
+            elif isinstance(node, ast.Import):
+                for alias in node.names:
+                    imports.setdefault(("import", alias.name), [])
+            elif position == 0 and isinstance(node, ast.Expr):
+                continue  # the template's module docstring
+            elif (
+                isinstance(node, ast.Assign)
+                and isinstance(node.targets[0], ast.Name)
+                and node.targets[0].id in SHARED_NAMES
+            ):
+                shared.setdefault(node.targets[0].id, text)
+            else:
+                kept.append(text)
+
+        renames = [
+            symbol for symbol in _top_level_names(tree)
+            if expansion and name not in symbol and symbol not in SHARED_NAMES
+        ]
+        body = "\n\n\n".join(kept)
+        if renames:
+            pattern = re.compile(r"(?<![.\w])(" + "|".join(map(re.escape, renames)) + r")\b")
+            body = pattern.sub(
+                lambda match: match.group(1) + (str(expansion) if match.group(1)[0].isupper() else f"_{expansion}"),
+                body,
+            )
+        chunks.append(f"# --- expansion {expansion}: {template_key} template ---\n\n{body}")
+        total += body.count("\n") + 4
+        expansion += 1
+
+    header = [f'"""{docstring.format(expansions=expansion)}"""']
+    for (kind, source_module), names in imports.items():
+        header.append(f"from {source_module} import {', '.join(names)}" if kind == "from" else f"import {source_module}")
+    return "\n".join(header) + "\n\n" + "\n".join(shared.values()) + "\n\n\n" + "\n\n\n".join(chunks) + "\n"
+
+
+def render_giant(module: str, index: int, target_lines: int) -> str:
+    """Render one giant module of at least ``target_lines`` lines.
+
+    Cycling through every base template gives thousands of top-level
+    symbols; see expand_templates.
+    """
+    return expand_templates(
+        module,
+        generate_class_name(module, index),
+        list(TEMPLATES),
+        target_lines,
+        f"Giant module {index} of {module}: {{expansions}} template expansions.",
+    )
+
+
+# ---------------------------------------------------------------------------
+# Profile-driven generation
+# ---------------------------------------------------------------------------
+
+# Length of the template cycle a profile's mix is expanded to
+MIX_CYCLE = 20
+
+# Per-line densities the template mix is fitted to
+PROFILE_DENSITIES = ["classes", "functions", "imports", "generics"]
+
+
+@lru_cache(maxsize=None)
+def template_profiles() -> Dict[str, Dict[str, Any]]:
+    """Profile metrics of each base template, rendered once."""
+    profiles: Dict[str, Dict[str, Any]] = {}
+    for kind, template in TEMPLATES.items():
+        source = template.format(module="core", class_name="CoreEntity", class_name_lower="coreentity")
+        profiles[kind] = profile_source(source) or {}
+    return profiles
+
+
+def _compositions(total: int, parts: int) -> Iterator[Tuple[int, ...]]:
+    """Every way to split ``total`` into ``parts`` non-negative counts."""
+    if parts == 1:
+        yield (total,)
+        return
+    for first in range(total + 1):
+        for rest in _compositions(total - first, parts - 1):
+            yield (first,) + rest
+
+
+def fit_template_mix(totals: Dict[str, Any]) -> Dict[str, int]:
+    """Template counts (summing to MIX_CYCLE) matching a profile's densities.
+
+    Searches every mix exhaustively and minimizes the squared error of the
+    per-line densities, each scaled by the target plus the templates'
+    average so that a metric the profile lacks (say, no generics) does not
+    outweigh all the others.
+    """
+    profiles = template_profiles()
+    kinds = list(TEMPLATES)
+    lines = max(1, totals.get("lines", 0))
+    targets = {metric: totals.get(metric, 0) / lines for metric in PROFILE_DENSITIES}
+    scales = {
+        metric: target + sum(profiles[kind][metric] / profiles[kind]["lines"] for kind in kinds) / len(kinds)
+        for metric, target in targets.items()
+    }
+    best: Tuple[float, Tuple[int, ...]] = (float("inf"), ())
+    for counts in _compositions(MIX_CYCLE, len(kinds)):
+        mix_lines = sum(count * profiles[kind]["lines"] for count, kind in zip(counts, kinds))
+        error = 0.0
+        for metric, target in targets.items():
+            density = sum(count * profiles[kind][metric] for count, kind in zip(counts, kinds)) / mix_lines
+            error += ((density - target) / scales[metric]) ** 2
+        if error < best[0]:
+            best = (error, counts)
+    return dict(zip(kinds, best[1]))
+
+
+def interleave(counts: Dict[str, int]) -> List[str]:
+    """Spread a mix evenly over a cycle (smooth weighted round-robin)."""
+    total = sum(counts.values())
+    credit = {kind: 0 for kind in counts}
+    cycle: List[str] = []
+    for _ in range(total):
+        for kind in credit:
+            credit[kind] += counts[kind]
+        chosen = max(credit, key=lambda kind: credit[kind])
+        credit[chosen] -= total
+        cycle.append(chosen)
+    return cycle
+
+
+def fit_report(totals: Dict[str, Any], mix: Dict[str, int]) -> List[str]:
+    """``metric: profile -> generated`` for the fitted densities and the annotation ratio.
+
+    The base templates are denser than most real code (short, fully
+    annotated bodies), so a mix of them cannot hit every target at once.
+    """
+    profiles = template_profiles()
+    lines = max(1, totals.get("lines", 0))
+    mix_lines = sum(count * profiles[kind]["lines"] for kind, count in mix.items())
+    report = []
+    for metric in PROFILE_DENSITIES:
+        generated = sum(count * profiles[kind][metric] for kind, count in mix.items()) / mix_lines
+        report.append(f"{metric}/line: {totals.get(metric, 0) / lines:.3f} -> {generated:.3f}")
+    annotatable = sum(count * profiles[kind]["annotatable"] for kind, count in mix.items())
+    annotated = sum(count * profiles[kind]["annotated"] for kind, count in mix.items())
+    report.append(
+        f"annotated: {totals.get('annotated', 0) / max(1, totals.get('annotatable', 0)):.0%} -> "
+        f"{annotated / max(1, annotatable):.0%} (not fitted)"
+    )
+    return report
+
+
+def load_profile(path: Path) -> ProfileSpec:
+    """Fit generation parameters to a profile written by profile_codebase.py.
+
+    Prints how far the fitted mix lands from the profile to stderr.
+    """
+    profile = json.loads(path.read_text())
+    mix = fit_template_mix(profile["totals"])
+    print(f"Profile fit (profile -> generated): {', '.join(fit_report(profile['totals'], mix))}", file=sys.stderr)
+    return ProfileSpec(
+        kinds=tuple(interleave(mix)),
+        lines=tuple(int(value) for value in profile["metrics"]["lines"]["quantiles"]),
+        source=profile.get("root", str(path)),
+    )
+
+
+def sample_file_lines(profile: ProfileSpec, seed: int, module_path: str, index: int) -> int:
+    """Draw one file length from the profile's size distribution (seeded)."""
+    rng = random.Random(f"{seed}:{module_path}:{index}")
+    position = rng.random() * (len(profile.lines) - 1)
+    low = int(position)
+    high = min(low + 1, len(profile.lines) - 1)
+    return round(profile.lines[low] + (profile.lines[high] - profile.lines[low]) * (position - low))
+
+
+# ---------------------------------------------------------------------------
+# Writing: full rebuilds, incremental updates and the content-addressed store
+# ---------------------------------------------------------------------------
+
+MANIFEST_NAME = ".manifest.json"
+DEFAULT_STORE_DIR = Path(__file__).parent / ".corpus-store"
+
+# The fake virtualenv of --site-packages, and the checker config pointing
+# at it, derived from the config next to this script
+VENV_NAME = ".venv"
+CHECKER_CONFIG = "pyrightconfig.json"
+ROOT_CONFIG = Path(__file__).parent / CHECKER_CONFIG
+
+# Manifest entry for one file: {"sha256": str, "size": int, "mtime_ns": int}
+# plus the metrics of file_metrics, its "kind" and its "dependencies" (the
+# codebase-relative paths it imports, per the dependency graph)
+FileRecord = Dict[str, Any]
+
+# Line-based counts; generated code never starts a line with these keywords
+# inside a string
+CLASS_RE = re.compile(r"^[ \t]*class\s", re.M)
+FUNCTION_RE = re.compile(r"^[ \t]*(?:async[ \t]+)?def\s", re.M)
+IMPORT_RE = re.compile(r"^[ \t]*(?:import|from[ \t]+\S+[ \t]+import)\s", re.M)
+
+# Per-file metrics summed into a manifest's totals
+METRICS = ("size", "lines", "classes", "functions", "imports")
+
+
+@dataclass(frozen=True)
+class WriteOptions:
+    """How rendered files are materialized on disk.
+
+    ``incremental`` keeps the existing tree and only rewrites files whose
+    content hash changed, so untouched files keep their mtimes. ``store``
+    points at a content-addressed store that previously generated corpora
+    are hardlinked from.
+    """
+
+    incremental: bool = False
+    store: Optional[Path] = None
+
+
+@dataclass
+class CodebaseStats:
+    """Outcome of generating one codebase."""
+
+    files: int = 0
+    written: int = 0
+    removed: int = 0
+    linked: int = 0
+
+
+class FileResult(NamedTuple):
+    """What happened to one file of a codebase."""
+
+    relpath: str
+    record: FileRecord
+    written: bool
+    linked: bool
+
+
+@dataclass(frozen=True)
+class ModuleTask:
+    """One unit of process-pool work: a single package of a codebase."""
+
+    base_path: Path
+    module_path: str
+    file_count: int
+    options: WriteOptions = WriteOptions()
+    known: Dict[str, FileRecord] = field(default_factory=dict)
+    stored: Optional[Dict[str, FileRecord]] = None
+    render: RenderOptions = RenderOptions()
+    deps: Dict[int, List[Edge]] = field(default_factory=dict)
+    protocols: Optional[Edge] = None
+    giants: int = 0
+
+
+def content_hash(data: bytes) -> str:
+    """Return the hex SHA-256 of ``data``."""
+    return hashlib.sha256(data).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def generator_fingerprint() -> str:
+    """Hash of the generator sources, so template or logic changes invalidate stored corpora."""
+    here = Path(__file__).parent
+    sources = [
+        Path(__file__),
+        here / "template_packs.py",
+        here / "template_variation.py",
+        here / "syntax_dialects.py",
+        here / "site_packages.py",
+    ]
+    return content_hash(b"".join(source.read_bytes() for source in sources))
+
+
+def corpus_key(size_name: str, config: SizeConfig, render: RenderOptions = RenderOptions()) -> str:
+    """Key a generated corpus by every parameter that affects its content."""
+    params = {
+        "size": size_name,
+        "config": config,
+        "modules": plan_modules(config, render.seed),
+        "render": asdict(render),
+        "generator": generator_fingerprint(),
+    }
+    return content_hash(json.dumps(params, sort_keys=True).encode())
+
+
+def _blob_path(store: Path, digest: str) -> Path:
+    return store / "objects" / digest[:2] / digest
+
+
+def file_kind(relpath: str) -> str:
+    """Template kind of a generated file or stub, from its name (``init`` for packages)."""
+    stem = relpath.rsplit("/", 1)[-1].rsplit(".", 1)[0]
+    return "init" if stem == "__init__" else stem.rsplit("_", 1)[0]
+
+
+def edge_path(edge: Edge, suffix: str = ".py") -> str:
+    """Codebase-relative path of the file (or stub, by ``suffix``) an import edge points at."""
+    return f"{edge.target_module}/{edge.target_kind}_{edge.target_index:02d}{suffix}"
+
+
+def file_metrics(relpath: str, content: str, dependencies: Iterable[str] = ()) -> FileRecord:
+    """Size and shape metrics of one rendered file, for the corpus manifest."""
+    return {
+        "lines": content.count("\n"),
+        "classes": len(CLASS_RE.findall(content)),
+        "functions": len(FUNCTION_RE.findall(content)),
+        "imports": len(IMPORT_RE.findall(content)),
+        "kind": file_kind(relpath),
+        "dependencies": list(dependencies),
+    }
+
+
+def _record(path: Path, digest: str, metrics: FileRecord) -> FileRecord:
+    st = path.stat()
+    return {**metrics, "sha256": digest, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def _matches_disk(path: Path, digest: str, known: Optional[FileRecord]) -> bool:
+    """Whether ``path`` already holds content with hash ``digest``.
+
+    A manifest entry whose size and mtime still match the file is trusted
+    without reading it; anything else is hashed from disk.
+    """
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return False
+    if known is not None and known["size"] == st.st_size and known["mtime_ns"] == st.st_mtime_ns:
+        return known["sha256"] == digest
+    return content_hash(path.read_bytes()) == digest
+
+
+def _unlink_existing(path: Path) -> None:
+    # Never write through an existing file: it may be a hardlink shared with
+    # the store, and modifying it in place would corrupt the stored blob.
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def emit_file(
+    base_path: Path,
+    relpath: str,
+    content: str,
+    options: WriteOptions,
+    known: Optional[FileRecord] = None,
+    dependencies: Iterable[str] = (),
+) -> FileResult:
+    """Write one rendered file, skipping it when incremental and unchanged.
+
+    The returned record carries the file's manifest metrics, measured from
+    the rendered content (no re-scan of the tree).
+    """
+    path = base_path / relpath
+    data = content.encode("utf-8")
+    digest = content_hash(data)
+    written = False
+
+    if not (options.incremental and _matches_disk(path, digest, known)):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _unlink_existing(path)
+        path.write_bytes(data)
+        written = True
+
+    if options.store is not None:
+        blob = _blob_path(options.store, digest)
+        if not blob.exists():
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                os.link(path, blob)
+            except FileExistsError:
+                pass  # another worker stored identical content first
+            except OSError:
+                shutil.copy2(path, blob)  # store on another filesystem
+
+    return FileResult(relpath, _record(path, digest, file_metrics(relpath, content, dependencies)), written, False)
+
+
+def link_file(
+    base_path: Path,
+    relpath: str,
+    stored: FileRecord,
+    options: WriteOptions,
+    known: Optional[FileRecord] = None,
+) -> FileResult:
+    """Hardlink a file into place from the content-addressed store.
+
+    The manifest metrics come from the store record, saved when the file
+    was first rendered.
+    """
+    assert options.store is not None
+    path = base_path / relpath
+    digest = stored["sha256"]
+
+    if options.incremental and _matches_disk(path, digest, known):
+        return FileResult(relpath, _record(path, digest, stored), False, False)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    _unlink_existing(path)
+    os.link(_blob_path(options.store, digest), path)
+    return FileResult(relpath, _record(path, digest, stored), True, True)
+
+
+def _stored_blobs_intact(store: Path, stored: Dict[str, FileRecord]) -> bool:
+    """Cheap integrity check: every blob exists with its recorded size."""
+    for entry in stored.values():
+        try:
+            if _blob_path(store, entry["sha256"]).stat().st_size != entry["size"]:
+                return False
+        except FileNotFoundError:
+            return False
+    return True
+
+
+def _run_module_task(task: ModuleTask) -> List[FileResult]:
+    """Process-pool entry point: materialize one package of a codebase."""
+    options = task.options
+    if (
+        task.stored is not None
+        and options.store is not None
+        and _stored_blobs_intact(options.store, task.stored)
+    ):
+        return [
+            link_file(task.base_path, relpath, entry, options, task.known.get(relpath))
+            for relpath, entry in task.stored.items()
+        ]
+
+    kinds = task.render.kinds
+    suffix = STUB_SUFFIX if task.render.stubs == "instead" else ".py"
+    dependencies = {
+        f"{task.module_path}/{template_kind(index, kinds)}_{index:02d}{suffix}": [
+            edge_path(edge, suffix) for edge in edges
+        ]
+        for index, edges in task.deps.items()
+    }
+    if task.protocols is not None:
+        for index in range(task.file_count):
+            if template_kind(index, kinds) == "hierarchy":
+                relpath = f"{task.module_path}/hierarchy_{index:02d}{suffix}"
+                dependencies.setdefault(relpath, []).append(edge_path(task.protocols, suffix))
+    return [
+        emit_file(task.base_path, relpath, content, options, task.known.get(relpath), dependencies.get(relpath, ()))
+        for relpath, content in iter_module(
+            task.module_path, task.file_count, task.render, task.deps, task.protocols, task.giants
+        )
+    ]
+
+
+def generate_module(base_path: Path, module_path: str, file_count: int) -> List[Path]:
+    """Generate a module with specified number of files.
+
+    Returns the written paths in creation order.
+    """
+    results = _run_module_task(ModuleTask(base_path, module_path, file_count))
+    return [base_path / result.relpath for result in results]
+
+
+def prepare_codebase(output_dir: Path, size_name: str, incremental: bool = False) -> Path:
+    """Create the directory for a size, removing previous output unless incremental."""
+    base_path = output_dir / size_name
 
     # Clean existing
-    if base_path.exists():
-        import shutil
+    if base_path.exists() and not incremental:
         shutil.rmtree(base_path)
 
     base_path.mkdir(parents=True, exist_ok=True)
+    return base_path
 
-    num_modules = config["modules"]
-    files_per_module = config["files_per_module"]
 
-    print(f"\nGenerating {size_name} codebase ({num_modules} modules, {files_per_module} files each):")
+def write_root_init(base_path: Path, size_name: str) -> Path:
+    """Write the package __init__.py at the root of a codebase."""
+    root_init = base_path / "__init__.py"
+    root_init.write_text(render_root_init(size_name))
+    return root_init
+
+
+def load_manifest(base_path: Path) -> Dict[str, FileRecord]:
+    """Return the file records of a previous incremental run, if any."""
+    try:
+        data = json.loads((base_path / MANIFEST_NAME).read_text())
+    except (FileNotFoundError, ValueError):
+        return {}
+    return data.get("files", {})
+
+
+def _write_json(path: Path, data: Dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(data, indent=1, sort_keys=True) + "\n")
+    os.replace(tmp, path)
+
+
+def manifest_totals(files: Dict[str, FileRecord]) -> Dict[str, int]:
+    """Sum the per-file metrics of a manifest."""
+    totals = {"files": len(files)}
+    for metric in METRICS:
+        totals[metric] = sum(record.get(metric, 0) for record in files.values())
+    totals["dependencies"] = sum(len(record.get("dependencies", ())) for record in files.values())
+    return totals
+
+
+def write_manifest(
+    base_path: Path,
+    key: str,
+    files: Dict[str, FileRecord],
+    size_name: str = "",
+    config: Optional[SizeConfig] = None,
+    profile: Optional[ProfileSpec] = None,
+    dialect: str = "mixed",
+    site: Optional[Dict[str, Any]] = None,
+    library: Optional[Dict[str, Any]] = None,
+) -> None:
+    """Write the corpus manifest: per-file hashes and metrics, plus totals.
+
+    Incremental runs read it back for the hashes and mtimes; benchmark
+    tooling reads the metrics to normalize timings (lines/sec, files/sec)
+    without re-scanning the tree. A profile the corpus was fitted to, a
+    syntax dialect other than ``mixed``, the fake site-packages (see
+    write_site_packages) and the library packaging (see
+    write_library_files) are recorded with it.
+    """
+    manifest: Dict[str, Any] = {
+        "corpus_key": key,
+        "size": size_name,
+        "config": config or {},
+        "totals": manifest_totals(files),
+        "files": files,
+    }
+    if profile is not None:
+        manifest["profile"] = asdict(profile)
+    if dialect != "mixed":
+        manifest["dialect"] = dialect
+    if site is not None:
+        manifest["site_packages"] = site
+    if library is not None:
+        manifest["library"] = library
+    _write_json(base_path / MANIFEST_NAME, manifest)
+
+
+def write_site_packages(base_path: Path, spec: SiteSpec, seed: int) -> Dict[str, Any]:
+    """Write the fake virtualenv of a codebase and a checker config using it.
+
+    The config is the one next to this script, rooted at the codebase with
+    the virtualenv excluded from checking, so ``pyright -p <codebase>``
+    resolves the corpus imports against it. Returns the manifest entry.
+    """
+    key = content_hash(json.dumps([asdict(spec), seed, generator_fingerprint()]).encode())
+    files = write_venv(base_path / VENV_NAME, spec, seed, key)
+    config = json.loads(ROOT_CONFIG.read_text())
+    config["include"] = ["."]
+    config["exclude"] = [pattern for pattern in config.get("exclude", []) if pattern != f"**/{VENV_NAME}"] + [VENV_NAME]
+    config["venvPath"] = "."
+    config["venv"] = VENV_NAME
+    (base_path / CHECKER_CONFIG).write_text(json.dumps(config, indent=2) + "\n")
+    return {**asdict(spec), "mix": dict(spec.mix), "venv": VENV_NAME, "files": files}
+
+
+def write_library_files(base_path: Path, size_name: str, files: Dict[str, FileRecord]) -> Dict[str, Any]:
+    """Write the ``py.typed`` marker and pyproject.toml of a library codebase.
+
+    Returns the manifest entry; the API module is emitted like any
+    generated file.
+    """
+    packages = sorted({
+        relpath.rsplit("/", 1)[0].replace("/", ".")
+        for relpath in files
+        if relpath.endswith(("/__init__.py", f"/__init__{STUB_SUFFIX}"))
+    })
+    stubs = any(relpath.endswith(STUB_SUFFIX) for relpath in files)
+    (base_path / PY_TYPED).write_text("")
+    (base_path / PYPROJECT).write_text(render_pyproject(size_name, packages, stubs))
+    return {"package": size_name, "project": f"pyright-bench-{size_name}", "packages": len(packages) + 1}
+
+
+def load_store_record(store: Path, key: str) -> Optional[Dict[str, FileRecord]]:
+    """Return the file list of a stored corpus, or None if it was never stored."""
+    try:
+        data = json.loads((store / "corpora" / f"{key}.json").read_text())
+    except (FileNotFoundError, ValueError):
+        return None
+    return data["files"]
+
+
+def write_store_record(store: Path, key: str, size_name: str, files: Dict[str, FileRecord]) -> None:
+    """Register a generated corpus in the store under its parameter key."""
+    entries = {
+        relpath: {key: value for key, value in record.items() if key != "mtime_ns"}
+        for relpath, record in files.items()
+    }
+    _write_json(store / "corpora" / f"{key}.json", {"size": size_name, "files": entries})
+
+
+def remove_stale(base_path: Path, keep: Set[str]) -> List[str]:
+    """Delete files under ``base_path`` that are not in ``keep``.
+
+    Hidden directories (checker caches) and ``__pycache__`` are left alone.
+    Directories emptied by the removal are pruned.
+    """
+    removed: List[str] = []
+    for dirpath, dirnames, filenames in os.walk(base_path):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith(".") and d != "__pycache__")
+        for filename in sorted(filenames):
+            path = Path(dirpath) / filename
+            relpath = path.relative_to(base_path).as_posix()
+            if relpath != MANIFEST_NAME and relpath not in keep:
+                path.unlink()
+                removed.append(relpath)
+
+    for dirpath, dirnames, filenames in os.walk(base_path, topdown=False):
+        if Path(dirpath) != base_path and not dirnames and not filenames:
+            os.rmdir(dirpath)
+    return removed
+
+
+def _split_by_package(records: Dict[str, FileRecord]) -> Dict[str, Dict[str, FileRecord]]:
+    """Group file records by the package directory they live in."""
+    by_package: Dict[str, Dict[str, FileRecord]] = {}
+    for relpath, record in records.items():
+        package = relpath.rsplit("/", 1)[0] if "/" in relpath else ""
+        by_package.setdefault(package, {})[relpath] = record
+    return by_package
+
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+
+def ordered_map(
+    executor: Executor,
+    fn: Callable[[_T], _R],
+    items: Iterable[_T],
+    window: int,
+) -> Iterator[_R]:
+    """Like ``executor.map`` but with at most ``window`` tasks in flight.
+
+    ``Executor.map`` submits every task up front and keeps all finished
+    results until they are consumed. Bounding the window keeps memory flat
+    however many modules a codebase has, and still yields in input order.
+    """
+    pending: Deque["Future[_R]"] = deque()
+    for item in items:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def generate_codebases(
+    sizes: Dict[str, SizeConfig],
+    output_dir: Path = SAMPLE_CODE_DIR,
+    jobs: int = 1,
+    quiet: bool = False,
+    options: WriteOptions = WriteOptions(),
+    render: RenderOptions = RenderOptions(),
+) -> Dict[str, CodebaseStats]:
+    """Generate several codebases, spreading module work over a process pool.
+
+    Every (size, module) pair is an independent task. Results are consumed
+    in submission order, so the console output and the files on disk are
+    identical to a serial run regardless of ``jobs``.
+    """
+    tasks: List[ModuleTask] = []
+    owners: List[str] = []
+    remaining: Dict[str, int] = {}
+    bases: Dict[str, Path] = {}
+    keys: Dict[str, str] = {}
+    stored_corpora: Dict[str, Optional[Dict[str, FileRecord]]] = {}
+    known_by_size: Dict[str, Dict[str, FileRecord]] = {}
+    groups: Dict[str, List[str]] = {}
+    records: Dict[str, Dict[str, FileRecord]] = {}
+
+    for size_name, config in sizes.items():
+        base_path = prepare_codebase(output_dir, size_name, options.incremental)
+        bases[size_name] = base_path
+        keys[size_name] = corpus_key(size_name, config, render)
+        records[size_name] = {}
+        known = load_manifest(base_path) if options.incremental else {}
+        stored = None
+        if options.store is not None:
+            stored = load_store_record(options.store, keys[size_name])
+        stored_corpora[size_name] = stored
+
+        plan = plan_modules(config, render.seed)
+        groups[size_name] = group_packages([module_path for module_path, _ in plan])
+        remaining[size_name] = len(plan)
+        graph: DependencyGraph = {}
+        if render.graph is not None:
+            graph = build_dependency_graph(plan, render.graph, render.kinds)
+        protocols = protocol_sources(plan, render.kinds)
+        giants = giant_hosts(plan, render.giants, render.seed)
+        known_by_module = _split_by_package(known)
+        stored_by_module = None if stored is None else _split_by_package(stored)
+        for module_path, file_count in plan:
+            tasks.append(ModuleTask(
+                base_path,
+                module_path,
+                file_count,
+                options,
+                known_by_module.get(module_path, {}),
+                None if stored_by_module is None else stored_by_module.get(module_path, {}),
+                render,
+                graph.get(module_path, {}),
+                protocols.get(module_path),
+                giants.get(module_path, 0),
+            ))
+            owners.append(size_name)
+        known_by_size[size_name] = known
+
+    stats: Dict[str, CodebaseStats] = {size_name: CodebaseStats() for size_name in sizes}
+    announced: Set[str] = set()
+    tracked = options.incremental or options.store is not None
+
+    def announce(size_name: str) -> None:
+        if size_name in announced or quiet:
+            return
+        announced.add(size_name)
+        config = sizes[size_name]
+        layout = config.get("layout", "balanced")
+        if layout != "balanced":
+            print(
+                f"\nGenerating {size_name} codebase ({remaining[size_name]} modules, "
+                f"{config['modules'] * config['files_per_module']} files, {layout} layout):"
+            )
+            return
+        depth = config.get("depth", 1)
+        nesting = f", {depth} package levels" if depth > 1 else ""
+        print(
+            f"\nGenerating {size_name} codebase "
+            f"({config['modules']} modules, {config['files_per_module']} files each{nesting}):"
+        )
+
+    def report(size_name: str, result: FileResult) -> None:
+        size_stats = stats[size_name]
+        size_stats.files += 1
+        size_stats.written += result.written
+        size_stats.linked += result.linked
+        records[size_name][result.relpath] = result.record
+        if result.written and not quiet:
+            print(f"  Created: {size_name}/{result.relpath}")
+
+    def finish(size_name: str) -> None:
+        announce(size_name)
+        base_path = bases[size_name]
+        size_stats = stats[size_name]
+        known = known_by_size[size_name]
+        inits = [(f"{group}/__init__.py", render_group_init(group)) for group in groups[size_name]]
+        inits.append(("__init__.py", render_root_init(size_name, render.library)))
+        for init_relpath, init in inits:
+            for relpath, content in with_stubs(init_relpath, init, render.stubs):
+                report(size_name, emit_file(base_path, relpath, content, options, known.get(relpath)))
+
+        files = records[size_name]
+        extras: Set[str] = set()
+        if render.site is not None:
+            extras.add(CHECKER_CONFIG)
+        library = None
+        if render.library:
+            library = write_library_files(base_path, size_name, files)
+            api = render_library_api(
+                size_name, {relpath: (base_path / relpath).read_text() for relpath in api_sources(files)}
+            )
+            for relpath, content in with_stubs(LIBRARY_API, api, render.stubs):
+                report(size_name, emit_file(base_path, relpath, content, options, known.get(relpath)))
+            extras.update((PYPROJECT, PY_TYPED))
+        if options.incremental:
+            keep = set(files) | extras
+            for relpath in remove_stale(base_path, keep):
+                size_stats.removed += 1
+                if not quiet:
+                    print(f"  Removed: {size_name}/{relpath}")
+        site = None
+        if render.site is not None:
+            site = write_site_packages(base_path, render.site, render.seed)
+            if not quiet:
+                print(
+                    f"  Site-packages: {site['files']} files in {size_name}/{VENV_NAME} "
+                    f"(check with: pyright -p {base_path})"
+                )
+        elif (base_path / VENV_NAME).is_dir():
+            shutil.rmtree(base_path / VENV_NAME)
+        write_manifest(
+            base_path,
+            keys[size_name],
+            files,
+            size_name,
+            sizes[size_name],
+            render.profile,
+            render.dialect,
+            site,
+            library,
+        )
+        if options.store is not None and stored_corpora[size_name] is None:
+            write_store_record(options.store, keys[size_name], size_name, files)
+
+        if quiet:
+            return
+        if tracked:
+            print(
+                f"  Total: {size_stats.files} files ({size_stats.written} written, "
+                f"{size_stats.linked} linked from store, {size_stats.removed} removed)"
+            )
+        else:
+            print(f"  Total: {size_stats.files} files")
+
+    if jobs > 1 and len(tasks) > 1:
+        executor: Optional[ProcessPoolExecutor] = ProcessPoolExecutor(max_workers=jobs)
+        results: Iterable[List[FileResult]] = ordered_map(executor, _run_module_task, tasks, jobs * 4)
+    else:
+        executor = None
+        results = map(_run_module_task, tasks)
+
+    try:
+        for size_name in sizes:
+            if remaining[size_name] == 0:
+                finish(size_name)
+        for size_name, module_results in zip(owners, results):
+            announce(size_name)
+            for result in module_results:
+                report(size_name, result)
+            remaining[size_name] -= 1
+            if remaining[size_name] == 0:
+                finish(size_name)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return stats
+
+
+def generate_codebase(size_name: str, config: SizeConfig) -> None:
+    """Generate a codebase of specified size."""
+    generate_codebases({size_name: config})
 
-    modules_to_use = MODULE_NAMES[:num_modules]
 
-    for module_name in modules_to_use:
-        generate_module(base_path, module_name, files_per_module)
+# ---------------------------------------------------------------------------
+# Monorepo: projects with their own configs, importing each other
+# ---------------------------------------------------------------------------
 
-    # Create root __init__.py
-    root_init = base_path / "__init__.py"
-    root_init.write_text(f'''"""{size_name.capitalize()} test codebase for PyRight benchmarks."""
-__version__ = "0.1.0"
-''')
-    print(f"  Created: {root_init.relative_to(base_path.parent)}")
+MONOREPO_DIR = "monorepo"
+PROJECTS_DIR = "projects"
+SOURCE_DIR = "src"
+MONOREPO_MANIFEST = ".monorepo.json"
 
-    total_files = num_modules * files_per_module + num_modules + 1  # +1 for root __init__
-    print(f"  Total: {total_files} files")
+PROJECT_NAMES = [
+    "accounts", "billing", "catalog", "checkout", "identity", "inventory", "ledger", "messaging",
+    "notifications", "orders", "payments", "pricing", "reporting", "shipping", "telemetry", "warehouse",
+]
 
 
-def main() -> None:
-    """Generate all sample codebases."""
-    print("PyRight Multithreaded Benchmark - Sample Code Generator")
-    print("=" * 60)
+@dataclass(frozen=True)
+class MonorepoSpec:
+    """Shape of a --monorepo repository.
+
+    ``depends`` is the maximum number of earlier projects each project
+    imports from; ``imports`` is the number of their modules each base
+    template file imports.
+    """
+
+    projects: int
+    depends: int = 2
+    imports: int = 1
+
+
+def project_names(count: int) -> List[str]:
+    """Names of the projects of a monorepo, which are also their package names."""
+    names = []
+    for index in range(count):
+        rounds, position = divmod(index, len(PROJECT_NAMES))
+        names.append(PROJECT_NAMES[position] + (f"_{rounds}" if rounds else ""))
+    return names
+
+
+def project_dependencies(names: List[str], depends: int, seed: int) -> Dict[str, List[str]]:
+    """Draw the projects each project imports from (seeded).
 
-    for size_name, config in SIZES.items():
-        generate_codebase(size_name, config)
+    Projects only depend on earlier ones, so the project graph is a DAG
+    and the first project is a leaf everything can build on.
+    """
+    rng = random.Random(f"monorepo-{seed}")
+    return {
+        name: sorted(rng.sample(names[:index], min(index, depends)), key=names.index)
+        for index, name in enumerate(names)
+    }
+
+
+@lru_cache(maxsize=None)
+def link_targets(link: ProjectLink) -> Tuple[Edge, ...]:
+    """Base-template files of a linked project, as edges from outside it."""
+    kinds = list(link.kinds)
+    return tuple(
+        Edge(f"{link.package}/{module_path}", index, template_kind(index, kinds))
+        for module_path, file_count in link.plan
+        for index in range(file_count)
+        if template_kind(index, kinds) in TEMPLATES
+    )
+
+
+def project_edges(render: RenderOptions, module_path: str, index: int) -> List[Edge]:
+    """Files of linked projects that one corpus file imports (seeded)."""
+    rng = random.Random(f"links-{render.seed}:{module_path}:{index}")
+    edges: Set[Edge] = set()
+    for _ in range(render.link_imports):
+        targets = link_targets(rng.choice(render.links))
+        if targets:
+            edges.add(rng.choice(targets))
+    return sorted(edges)
+
+
+def inject_project_imports(content: str, importer_kind: str, importer_class: str, edges: List[Edge]) -> str:
+    """Add absolute imports of other projects' files to a rendered file, and code using them."""
+    imports: List[str] = []
+    usages: List[str] = []
+    for edge in edges:
+        module = f"{edge.target_module.replace('/', '.')}.{edge.target_kind}_{edge.target_index:02d}"
+        alias = module.replace(".", "_")
+        imports.append(f"import {module} as {alias}")
+        usages.append(_dependency_usage(edge, alias, importer_kind, importer_class))
+    return inject_imports(content, imports, usages)
+
+
+def write_monorepo_configs(root: Path, dependencies: Dict[str, List[str]]) -> None:
+    """Write the checker configs of a monorepo, derived from the config next to this script.
+
+    Every project's config checks its own ``src`` and reaches the
+    projects it depends on through ``extraPaths``. The root config checks
+    all projects at once, with one execution environment per project
+    carrying the same search paths.
+    """
+    base = json.loads(ROOT_CONFIG.read_text())
+    for name, depends in dependencies.items():
+        config = {**base, "include": [SOURCE_DIR], "extraPaths": [f"../{dep}/{SOURCE_DIR}" for dep in depends]}
+        (root / PROJECTS_DIR / name / CHECKER_CONFIG).write_text(json.dumps(config, indent=2) + "\n")
+    config = {
+        **base,
+        "include": [PROJECTS_DIR],
+        "executionEnvironments": [
+            {
+                "root": f"{PROJECTS_DIR}/{name}/{SOURCE_DIR}",
+                "extraPaths": [f"{PROJECTS_DIR}/{dep}/{SOURCE_DIR}" for dep in depends],
+            }
+            for name, depends in dependencies.items()
+        ],
+    }
+    (root / CHECKER_CONFIG).write_text(json.dumps(config, indent=2) + "\n")
+
+
+def generate_monorepo(
+    spec: MonorepoSpec,
+    config: SizeConfig,
+    output_dir: Path = SAMPLE_CODE_DIR,
+    jobs: int = 1,
+    quiet: bool = False,
+    options: WriteOptions = WriteOptions(),
+    render: RenderOptions = RenderOptions(),
+) -> Dict[str, CodebaseStats]:
+    """Generate a monorepo of ``spec.projects`` codebases shaped like ``config``.
+
+    Project ``<name>`` is the package ``projects/<name>/src/<name>`` under
+    ``<output_dir>/monorepo``, generated like any codebase, whose base
+    template files also import files of the projects it depends on.
+    Checker configs are written per project and at the root (see
+    write_monorepo_configs), and the project graph with per-project
+    totals goes to ``.monorepo.json``.
+    """
+    root = output_dir / MONOREPO_DIR
+    projects = root / PROJECTS_DIR
+    names = project_names(spec.projects)
+    dependencies = project_dependencies(names, spec.depends, render.seed)
+    if projects.is_dir():
+        for stale in sorted(projects.iterdir()):
+            if stale.name not in dependencies and stale.is_dir():
+                shutil.rmtree(stale)
+
+    plan = tuple(plan_modules(config, render.seed))
+    stats: Dict[str, CodebaseStats] = {}
+    entries: Dict[str, Any] = {}
+    for name in names:
+        links = tuple(ProjectLink(dep, plan, tuple(render.kinds)) for dep in dependencies[name])
+        project_render = replace(render, links=links, link_imports=spec.imports if links else 1)
+        source = projects / name / SOURCE_DIR
+        stats.update(generate_codebases({name: config}, source, jobs, quiet, options, project_render))
+        totals = json.loads((source / name / MANIFEST_NAME).read_text())["totals"]
+        entries[name] = {
+            "path": f"{PROJECTS_DIR}/{name}",
+            "package": f"{PROJECTS_DIR}/{name}/{SOURCE_DIR}/{name}",
+            "depends_on": dependencies[name],
+            "totals": totals,
+        }
+
+    write_monorepo_configs(root, dependencies)
+    metrics = entries[names[0]]["totals"]
+    totals = {metric: sum(entry["totals"][metric] for entry in entries.values()) for metric in metrics}
+    _write_json(root / MONOREPO_MANIFEST, {
+        "config": config,
+        "seed": render.seed,
+        "monorepo": asdict(spec),
+        "totals": totals,
+        "projects": entries,
+    })
+    return stats
+
+
+# ---------------------------------------------------------------------------
+# Calibration to a target line count or check time
+# ---------------------------------------------------------------------------
+
+CALIBRATED_SIZE = "calibrated"
+DEFAULT_CHECKER = "pyright {path}"
+
+
+@dataclass(frozen=True)
+class CalibrationTarget:
+    """What --target-lines / --target-seconds calibrate a codebase to.
+
+    Exactly one of ``lines`` and ``seconds`` is set. ``checker`` is the
+    command timed for ``seconds``; ``{path}`` is replaced by the codebase
+    directory (appended if absent).
+    """
+
+    lines: int = 0
+    seconds: float = 0.0
+    checker: str = DEFAULT_CHECKER
+    tolerance: float = 0.05
+    max_rounds: int = 8
+
+
+# pyright exits 1 when it reports errors and 2 or more when it could not check
+CHECKER_FATAL_STATUS = 2
+
+
+def time_checker(command: str, path: Path) -> float:
+    """Wall-clock seconds one run of the checker command takes on ``path``.
+
+    Reporting type errors is a complete run. A checker that is missing or
+    exits with a fatal status ends the program, since it never checked the
+    codebase and its timing would mean nothing.
+    """
+    argv = shlex.split(command.replace("{path}", shlex.quote(str(path))))
+    if "{path}" not in command:
+        argv.append(str(path))
+    started = time.perf_counter()
+    try:
+        completed = subprocess.run(argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    except FileNotFoundError:
+        raise SystemExit(f"checker not found: {argv[0]!r}") from None
+    elapsed = time.perf_counter() - started
+    if completed.returncode >= CHECKER_FATAL_STATUS:
+        raise SystemExit(f"checker exited with status {completed.returncode}: {shlex.join(argv)}")
+    return elapsed
+
+
+def _next_file_count(samples: List[Tuple[int, float]], goal: float) -> int:
+    """Next file count to try, from the ``(files, measurement)`` samples so far.
+
+    Uses the line through the last two distinct samples, which absorbs a
+    constant offset such as checker start-up time; with a single sample
+    it scales proportionally.
+    """
+    files, measured = samples[-1]
+    distinct = [sample for sample in samples[:-1] if sample[0] != files]
+    if distinct and measured != distinct[-1][1]:
+        previous_files, previous = distinct[-1]
+        slope = (measured - previous) / (files - previous_files)
+        if slope > 0:
+            return max(1, round(files + (goal - measured) / slope))
+    return max(1, round(files * goal / max(measured, 1e-9)))
+
+
+def calibrate(
+    base: SizeConfig,
+    target: CalibrationTarget,
+    output_dir: Path,
+    jobs: int,
+    render: RenderOptions,
+    report: Callable[[str], None] = print,
+) -> Dict[str, Any]:
+    """Search the file count that meets ``target`` and leave that codebase on disk.
+
+    Starting from the shape of ``base``, every round regenerates the
+    ``calibrated`` codebase with a new module count (files per module and
+    depth stay fixed) and measures its total lines, or times the checker
+    on it. The template mix is the one selected in ``render``. The chosen
+    parameters and every round are recorded in the codebase manifest.
+    """
+    goal = float(target.lines or target.seconds)
+    unit = "lines" if target.lines else "s"
+    per_module = base["files_per_module"]
+    files = base["modules"] * per_module
+    rounds: List[Dict[str, Any]] = []
+    samples: List[Tuple[int, float]] = []
+    best: Optional[Dict[str, Any]] = None
+
+    for _ in range(target.max_rounds):
+        config = {**base, "modules": max(1, -(-files // per_module))}
+        files = config["modules"] * per_module
+        generate_codebases({CALIBRATED_SIZE: config}, output_dir, jobs, quiet=True, render=render)
+        path = output_dir / CALIBRATED_SIZE
+        totals = json.loads((path / MANIFEST_NAME).read_text())["totals"]
+        measured = float(totals["lines"]) if target.lines else time_checker(target.checker, path)
+        entry = {"modules": config["modules"], "files": totals["files"], "lines": totals["lines"], "measured": measured}
+        rounds.append(entry)
+        report(f"  round {len(rounds)}: {config['modules']} modules, {totals['files']} files -> {measured:.6g} {unit}")
+
+        if best is None or abs(measured - goal) < abs(best["measured"] - goal):
+            best = {**entry, "config": config}
+        if abs(measured - goal) <= target.tolerance * goal:
+            break
+        samples.append((files, measured))
+        proposal = _next_file_count(samples, goal)
+        if -(-proposal // per_module) == config["modules"]:
+            break  # converged to the module granularity
+        files = proposal
+
+    assert best is not None
+    if best["modules"] != rounds[-1]["modules"]:
+        generate_codebases({CALIBRATED_SIZE: best["config"]}, output_dir, jobs, quiet=True, render=render)
+
+    calibration = {
+        "target": {"lines": target.lines} if target.lines else {"seconds": target.seconds, "checker": target.checker},
+        "tolerance": target.tolerance,
+        "chosen": best["config"],
+        "lines": best["lines"],
+        "measured": best["measured"],
+        "kinds": render.kinds,
+        "packs": [list(pack) for pack in render.packs],
+        "rounds": rounds,
+    }
+    manifest_path = output_dir / CALIBRATED_SIZE / MANIFEST_NAME
+    manifest = json.loads(manifest_path.read_text())
+    manifest["calibration"] = calibration
+    _write_json(manifest_path, manifest)
+    return calibration
+
+
+def _parse_pack(parser: argparse.ArgumentParser, spec: str) -> PackSpec:
+    head, *settings = spec.split(",")
+    name, _, intensity = head.partition(":")
+    if name not in PACKS:
+        parser.error(f"unknown pack {name!r} (choose from {', '.join(PACKS)})")
+    try:
+        level = int(intensity or 1)
+    except ValueError:
+        level = 0
+    if level < 1:
+        parser.error(f"pack intensity must be a positive integer: {spec!r}")
+
+    allowed = PACK_OPTIONS.get(name, ())
+    options: Dict[str, int] = {}
+    for setting in settings:
+        key, _, value = setting.partition("=")
+        if key not in allowed:
+            choices = ", ".join(allowed) or "none"
+            parser.error(f"unknown option {key!r} for pack {name!r} (choose from {choices})")
+        try:
+            options[key] = int(value)
+        except ValueError:
+            options[key] = 0
+        if options[key] < 1:
+            parser.error(f"pack option must be a positive integer: {setting!r}")
+    return PackSpec(name, level, tuple(sorted(options.items())))
+
+
+def _parse_site_mix(parser: argparse.ArgumentParser, spec: str) -> Tuple[Tuple[str, int], ...]:
+    weights: Dict[str, int] = {}
+    for setting in spec.split(","):
+        kind, _, value = setting.partition("=")
+        if kind not in DISTRIBUTION_KINDS:
+            parser.error(f"unknown distribution kind {kind!r} (choose from {', '.join(DISTRIBUTION_KINDS)})")
+        try:
+            weights[kind] = int(value)
+        except ValueError:
+            weights[kind] = -1
+        if weights[kind] < 0:
+            parser.error(f"distribution weight must be a non-negative integer: {setting!r}")
+    if not any(weights.values()):
+        parser.error(f"at least one distribution weight must be positive: {spec!r}")
+    return tuple((kind, weights[kind]) for kind in DISTRIBUTION_KINDS if weights.get(kind))
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "sizes",
+        nargs="*",
+        metavar="SIZE",
+        help=f"codebases to generate: {', '.join(SIZES)} (default: {', '.join(DEFAULT_SIZES)})",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="worker processes for module generation (default: CPU count; 1 = serial)",
+    )
+    parser.add_argument(
+        "-q",
+        "--quiet",
+        action="store_true",
+        help="suppress per-file output and print a summary at the end",
+    )
+    parser.add_argument(
+        "-o",
+        "--output-dir",
+        type=Path,
+        default=SAMPLE_CODE_DIR,
+        help="directory the codebases are written into (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--modules",
+        type=int,
+        help="override the module count of the selected sizes",
+    )
+    parser.add_argument(
+        "--files-per-module",
+        type=int,
+        help="override the files per module of the selected sizes",
+    )
+    parser.add_argument(
+        "--depth",
+        type=int,
+        help="override the package nesting depth of the selected sizes (1 = flat)",
+    )
+    graph = parser.add_argument_group("dependency graph")
+    graph.add_argument(
+        "--dependencies",
+        action="store_true",
+        help="inject typed cross-module imports and usages drawn from a layered DAG",
+    )
+    graph.add_argument(
+        "--dep-layers",
+        type=int,
+        default=GraphOptions.layers,
+        help="DAG depth: number of import layers (default: %(default)s)",
+    )
+    graph.add_argument(
+        "--fan-out",
+        type=int,
+        default=GraphOptions.fan_out,
+        help="maximum imports per file (default: %(default)s)",
+    )
+    graph.add_argument(
+        "--fan-in",
+        type=int,
+        default=GraphOptions.fan_in,
+        help="maximum importers per file (default: %(default)s)",
+    )
+    graph.add_argument(
+        "--cross-package",
+        type=float,
+        default=GraphOptions.cross_package,
+        help="fraction of imports that target another package (default: %(default)s)",
+    )
+    graph.add_argument(
+        "--cycles",
+        type=int,
+        default=GraphOptions.cycles,
+        help="number of TYPE_CHECKING-guarded import cycles to add (default: %(default)s)",
+    )
+    packs = parser.add_argument_group("checker-hotspot template packs")
+    packs.add_argument(
+        "--pack",
+        action="append",
+        default=[],
+        metavar="NAME[:INTENSITY][,KEY=VALUE...]",
+        help=f"mix a template pack into every module: {', '.join(PACKS)}; "
+        "intensity defaults to 1 and scales the expensive construct; "
+        "narrowing takes length=LINES and branching=LEAVES, "
+        "hierarchy takes depth=DIAMONDS and count=CLASSES (repeatable)",
+    )
+    packs.add_argument(
+        "--packs-only",
+        action="store_true",
+        help="use only the selected packs, not the base templates",
+    )
+    site = parser.add_argument_group(
+        "fake site-packages",
+        f"build a virtualenv of generated distributions in each codebase's {VENV_NAME}, "
+        f"plus a {CHECKER_CONFIG} using it (check with 'pyright -p <codebase>')",
+    )
+    site.add_argument(
+        "--site-packages",
+        type=int,
+        default=0,
+        metavar="N",
+        help="number of third-party distributions to generate (default: none)",
+    )
+    site.add_argument(
+        "--site-depth",
+        type=int,
+        default=SiteSpec.depth,
+        help="subpackage levels below each distribution's top-level package (default: %(default)s)",
+    )
+    site.add_argument(
+        "--site-mix",
+        default=",".join(f"{kind}={weight}" for kind, weight in SiteSpec.mix),
+        metavar="KIND=WEIGHT,...",
+        help=f"relative weights of the distribution kinds {', '.join(DISTRIBUTION_KINDS)}: "
+        "py.typed packages, stub-only -stubs packages and untyped packages (default: %(default)s)",
+    )
+    site.add_argument(
+        "--site-imports",
+        type=int,
+        default=SiteSpec.imports,
+        metavar="K",
+        help="site-packages modules imported by each base template file (default: %(default)s)",
+    )
+    monorepo = parser.add_argument_group(
+        "monorepo",
+        f"lay out projects shaped like the selected size (default: small) under {MONOREPO_DIR}/, "
+        "each with its own config, plus a root config with one execution environment per project",
+    )
+    monorepo.add_argument(
+        "--monorepo",
+        type=int,
+        default=0,
+        metavar="N",
+        help="number of projects to generate (default: none)",
+    )
+    monorepo.add_argument(
+        "--project-deps",
+        type=int,
+        default=MonorepoSpec.depends,
+        metavar="K",
+        help="maximum number of other projects each project imports from, via extraPaths (default: %(default)s)",
+    )
+    monorepo.add_argument(
+        "--project-imports",
+        type=int,
+        default=MonorepoSpec.imports,
+        metavar="K",
+        help="modules of those projects imported by each base template file (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="seed for every randomized choice (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--layout",
+        choices=LAYOUTS,
+        help="directory shape of the selected sizes (default: balanced)",
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        metavar="PROFILE",
+        help="fit the template mix and file sizes to a profile written by profile_codebase.py; the mix only "
+        "approximates class, function, import and generics densities (templates are denser than most code) and "
+        "does not match annotation density, class depth or comment ratio",
+    )
+    parser.add_argument(
+        "--vary",
+        action="store_true",
+        help="randomize fields, methods, signatures and bodies of each base template file from --seed",
+    )
+    parser.add_argument(
+        "--dialect",
+        choices=DIALECTS,
+        default=RenderOptions.dialect,
+        help="annotation syntax of every file: as rendered (mixed), legacy typing aliases, "
+        "PEP 585/604 builtins, or PEP 695 type parameters and aliases (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--exports",
+        choices=EXPORT_STYLES,
+        default=RenderOptions.exports,
+        help="how package __init__.py files re-export their files: star imports, explicit "
+        "'import A as A', a populated __all__, none, or under TYPE_CHECKING (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--library",
+        action="store_true",
+        help="make each codebase an installable py.typed library: pyproject.toml, py.typed "
+        "and a public api module (for pyright --verifytypes and --createstub)",
+    )
+    parser.add_argument(
+        "--stubs",
+        choices=STUB_MODES,
+        default=RenderOptions.stubs,
+        help="emit a .pyi stub (bodies stripped) next to every file, so imports resolve to "
+        "stubs first, or instead of it (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--giants",
+        type=int,
+        default=0,
+        metavar="N",
+        help="add N giant modules, each built from many template expansions, "
+        "to seeded packages of the selected sizes",
+    )
+    parser.add_argument(
+        "--giant-lines",
+        type=int,
+        default=RenderOptions.giant_lines,
+        metavar="LINES",
+        help="minimum length of each giant module (default: %(default)s)",
+    )
+    calibration = parser.add_argument_group(
+        "calibration",
+        f"grow or shrink one selected size (default: large) into a {CALIBRATED_SIZE!r} codebase",
+    )
+    target = calibration.add_mutually_exclusive_group()
+    target.add_argument(
+        "--target-lines",
+        type=int,
+        metavar="LINES",
+        help="calibrate the total line count",
+    )
+    target.add_argument(
+        "--target-seconds",
+        type=float,
+        metavar="SECONDS",
+        help="calibrate the wall-clock time of one --checker run",
+    )
+    calibration.add_argument(
+        "--checker",
+        default=DEFAULT_CHECKER,
+        metavar="COMMAND",
+        help="checker command timed by --target-seconds; {path} is the codebase (default: %(default)r)",
+    )
+    calibration.add_argument(
+        "--tolerance",
+        type=float,
+        default=CalibrationTarget.tolerance,
+        help="accepted relative distance from the target (default: %(default)s)",
+    )
+    calibration.add_argument(
+        "--max-rounds",
+        type=int,
+        default=CalibrationTarget.max_rounds,
+        help="maximum number of generate-and-measure rounds (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="only rewrite files whose content hash changed and delete stale ones, "
+        "preserving mtimes of unchanged files (and the checker's warm cache)",
+    )
+    parser.add_argument(
+        "--store",
+        type=Path,
+        nargs="?",
+        const=DEFAULT_STORE_DIR,
+        default=None,
+        help="hardlink corpora from a content-addressed store keyed by generator "
+        "parameters, adding new corpora to it (default store: %(const)s)",
+    )
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.sizes if name not in SIZES]
+    if unknown:
+        parser.error(f"unknown size(s): {', '.join(unknown)} (choose from {', '.join(SIZES)})")
+    args.pack = [_parse_pack(parser, spec) for spec in args.pack]
+    args.site_mix = _parse_site_mix(parser, args.site_mix)
+    if args.site_packages < 0 or args.site_depth < 0 or args.site_imports < 0:
+        parser.error("--site-packages, --site-depth and --site-imports must not be negative")
+    calibrating = args.target_lines is not None or args.target_seconds is not None
+    if args.monorepo < 0 or args.project_deps < 0 or args.project_imports < 0:
+        parser.error("--monorepo, --project-deps and --project-imports must not be negative")
+    if args.monorepo and (calibrating or args.site_packages or len(args.sizes) > 1):
+        parser.error("--monorepo takes a single size and no calibration or --site-packages")
+    if calibrating and len(args.sizes) > 1:
+        parser.error("calibration starts from a single size")
+    if calibrating and (args.target_lines or args.target_seconds or 0) <= 0:
+        parser.error("calibration targets must be positive")
+    if args.store is not None and not args.store.is_absolute():
+        args.store = Path.cwd() / args.store
+    return args
+
+
+def render_options(args: argparse.Namespace) -> RenderOptions:
+    """Build the content options selected on the command line."""
+    graph = None
+    if args.dependencies:
+        graph = GraphOptions(
+            layers=args.dep_layers,
+            fan_out=args.fan_out,
+            fan_in=args.fan_in,
+            cross_package=args.cross_package,
+            cycles=args.cycles,
+            seed=args.seed,
+        )
+    return RenderOptions(
+        graph=graph,
+        seed=args.seed,
+        packs=tuple(args.pack),
+        packs_only=args.packs_only,
+        giants=args.giants,
+        giant_lines=args.giant_lines,
+        profile=None if args.profile is None else load_profile(args.profile),
+        vary=args.vary,
+        dialect=args.dialect,
+        exports=args.exports,
+        site=None if not args.site_packages else SiteSpec(
+            packages=args.site_packages,
+            depth=args.site_depth,
+            mix=args.site_mix,
+            imports=args.site_imports,
+        ),
+        library=args.library,
+        stubs=args.stubs,
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Generate all sample codebases."""
+    args = parse_args(argv)
+    calibrating = args.target_lines is not None or args.target_seconds is not None
+    names = args.sizes or (["large"] if calibrating else ["small"] if args.monorepo else DEFAULT_SIZES)
+    selected = {name: dict(SIZES[name]) for name in names}
+    for key in ("modules", "files_per_module", "depth", "layout"):
+        value = getattr(args, key)
+        if value is not None:
+            for config in selected.values():
+                config[key] = value
+    kinds = render_options(args).kinds
+    for name, config in selected.items():
+        missing = sorted(set(kinds) - set(kinds[:config["files_per_module"]]))
+        if missing:
+            print(
+                f"warning: {name} has {config['files_per_module']} files per module, fewer than the "
+                f"{len(kinds)} file kinds; never rendered: {', '.join(missing)}",
+                file=sys.stderr,
+            )
+
+    if not args.quiet:
+        print("PyRight Multithreaded Benchmark - Sample Code Generator")
+        print("=" * 60)
+
+    if calibrating:
+        target = CalibrationTarget(
+            lines=args.target_lines or 0,
+            seconds=args.target_seconds or 0.0,
+            checker=args.checker,
+            tolerance=args.tolerance,
+            max_rounds=max(1, args.max_rounds),
+        )
+        base = next(iter(selected.values()))
+        if not args.quiet:
+            print(f"Calibrating {CALIBRATED_SIZE} codebase from {names[0]}:")
+        report: Callable[[str], None] = (lambda line: None) if args.quiet else print
+        result = calibrate(base, target, args.output_dir, max(1, args.jobs), render_options(args), report)
+        chosen = result["chosen"]
+        print(
+            f"Chose {chosen['modules']} modules x {chosen['files_per_module']} files "
+            f"({result['lines']} lines, measured {result['measured']:.6g}); "
+            f"recorded in {args.output_dir / CALIBRATED_SIZE / MANIFEST_NAME}"
+        )
+        return
+
+    started = time.perf_counter()
+    options = WriteOptions(incremental=args.incremental, store=args.store)
+    if args.monorepo:
+        spec = MonorepoSpec(args.monorepo, args.project_deps, args.project_imports)
+        stats = generate_monorepo(
+            spec, selected[names[0]], args.output_dir, max(1, args.jobs), args.quiet, options, render_options(args)
+        )
+    else:
+        stats = generate_codebases(
+            selected,
+            output_dir=args.output_dir,
+            jobs=max(1, args.jobs),
+            quiet=args.quiet,
+            options=options,
+            render=render_options(args),
+        )
+    elapsed = time.perf_counter() - started
+
+    if args.quiet:
+        for size_name, size_stats in stats.items():
+            print(
+                f"{size_name}: {size_stats.files} files "
+                f"({size_stats.written} written, {size_stats.linked} linked, "
+                f"{size_stats.removed} removed)"
+            )
+        total = sum(size_stats.files for size_stats in stats.values())
+        print(
+            f"Generated {total} files in {len(stats)} codebase(s) "
+            f"in {elapsed:.2f}s (jobs={max(1, args.jobs)})"
+        )
+        return
 
     print("\n" + "=" * 60)
     print("Generation complete!")
+    if args.monorepo:
+        root = args.output_dir / MONOREPO_DIR
+        print("\nNext steps:")
+        print(f"  pyright -p {root}                    # Whole repository")
+        print(f"  python monorepo_benchmark.py {root}  # Whole repository vs. projects in parallel")
+        return
     print("\nNext steps:")
     print("  1. cd pyright")
     print("  2. pyright                  # Single-threaded baseline")
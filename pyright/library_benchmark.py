@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Benchmark pyright's library commands on --library codebases.
+
+For every codebase, times ``pyright --verifytypes <package>`` (the type
+completeness report run on published libraries) and ``pyright
+--createstub <package>`` (stub generation), each repeated and reduced to
+the median. The codebase's parent directory is put on ``PYTHONPATH`` so
+the package resolves as if installed. The completeness score and symbol
+counts of the report are recorded alongside the timings, with the file
+and line totals of the corpus manifest.
+
+Usage:
+    python generate_sample_code.py small medium large --library -o /tmp/lib
+    python library_benchmark.py /tmp/lib/small /tmp/lib/medium /tmp/lib/large --repeats 3
+    python library_benchmark.py /tmp/lib/large --ignoreexternal -o library.json
+"""
+
+import argparse
+import json
+import os
+import shlex
+import statistics
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from generate_sample_code import MANIFEST_NAME, PY_TYPED
+
+DEFAULT_PYRIGHT = "pyright"
+
+
+def package_env(codebase: Path) -> Dict[str, str]:
+    """Environment in which ``codebase`` is importable by its directory name."""
+    env = dict(os.environ)
+    paths = [str(codebase.resolve().parent)] + [path for path in env.get("PYTHONPATH", "").split(os.pathsep) if path]
+    env["PYTHONPATH"] = os.pathsep.join(paths)
+    return env
+
+
+def run_verifytypes(pyright: List[str], codebase: Path, ignore_external: bool = False) -> Tuple[float, Dict[str, Any]]:
+    """Time one ``--verifytypes`` run; returns seconds and the type completeness report."""
+    argv = pyright + ["--verifytypes", codebase.name, "--outputjson"]
+    if ignore_external:
+        argv.append("--ignoreexternal")
+    started = time.perf_counter()
+    result = subprocess.run(argv, env=package_env(codebase), capture_output=True, text=True)
+    elapsed = time.perf_counter() - started
+    try:
+        report = json.loads(result.stdout)["typeCompleteness"]
+    except (ValueError, KeyError):
+        raise SystemExit(f"{' '.join(argv)} failed:\n{result.stderr or result.stdout}")
+    if not report.get("pyTypedPath"):
+        raise SystemExit(f"pyright did not resolve {codebase.name!r} from {codebase.resolve().parent}")
+    return elapsed, report
+
+
+def run_createstub(pyright: List[str], codebase: Path) -> Tuple[float, int]:
+    """Time one ``--createstub`` run in a scratch directory; returns seconds and stub files written."""
+    with tempfile.TemporaryDirectory() as scratch:
+        argv = pyright + ["--createstub", codebase.name]
+        started = time.perf_counter()
+        result = subprocess.run(argv, cwd=scratch, env=package_env(codebase), capture_output=True, text=True)
+        elapsed = time.perf_counter() - started
+        stubs = len(list((Path(scratch) / "typings" / codebase.name).rglob("*.pyi")))
+        if result.returncode != 0 or not stubs:
+            raise SystemExit(f"{' '.join(argv)} failed:\n{result.stderr or result.stdout}")
+    return elapsed, stubs
+
+
+def benchmark_codebase(
+    codebase: Path,
+    pyright: List[str],
+    repeats: int = 1,
+    ignore_external: bool = False,
+) -> Dict[str, Any]:
+    """Median timings and report figures of both commands on one codebase."""
+    try:
+        totals = json.loads((codebase / MANIFEST_NAME).read_text())["totals"]
+    except (FileNotFoundError, ValueError, KeyError):
+        totals = {}
+
+    verify_runs: List[float] = []
+    stub_runs: List[float] = []
+    report: Dict[str, Any] = {}
+    stubs = 0
+    for _ in range(repeats):
+        elapsed, report = run_verifytypes(pyright, codebase, ignore_external)
+        verify_runs.append(elapsed)
+        elapsed, stubs = run_createstub(pyright, codebase)
+        stub_runs.append(elapsed)
+
+    exported = report["exportedSymbolCounts"]
+    return {
+        "codebase": str(codebase),
+        "package": codebase.name,
+        "files": totals.get("files"),
+        "lines": totals.get("lines"),
+        "verifytypes": {
+            "seconds": statistics.median(verify_runs),
+            "runs": verify_runs,
+            "completeness_score": report["completenessScore"],
+            "exported_symbols": sum(exported.values()),
+            "exported_symbol_counts": exported,
+            "other_symbol_counts": report["otherSymbolCounts"],
+        },
+        "createstub": {
+            "seconds": statistics.median(stub_runs),
+            "runs": stub_runs,
+            "stub_files": stubs,
+        },
+    }
+
+
+def print_table(results: List[Dict[str, Any]]) -> None:
+    """Print one row per codebase."""
+    header = (
+        f"{'package':<12} {'files':>7} {'lines':>9} {'verify s':>9} {'score':>7} "
+        f"{'symbols':>8} {'stub s':>8} {'stubs':>6}"
+    )
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        verify, stub = result["verifytypes"], result["createstub"]
+        print(
+            f"{result['package']:<12} {result['files'] or '-':>7} {result['lines'] or '-':>9} "
+            f"{verify['seconds']:>9.2f} {verify['completeness_score']:>7.1%} {verify['exported_symbols']:>8} "
+            f"{stub['seconds']:>8.2f} {stub['stub_files']:>6}"
+        )
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "codebases",
+        nargs="+",
+        type=Path,
+        metavar="CODEBASE",
+        help="codebases generated with --library (each directory is the package)",
+    )
+    parser.add_argument(
+        "--pyright",
+        default=DEFAULT_PYRIGHT,
+        metavar="COMMAND",
+        help="pyright command line to run (default: %(default)r)",
+    )
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=1,
+        help="runs of each command per codebase; the median is reported (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--ignoreexternal",
+        action="store_true",
+        help="pass --ignoreexternal to --verifytypes",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=Path,
+        help="also write the results as JSON to this file",
+    )
+    args = parser.parse_args(argv)
+    for codebase in args.codebases:
+        if not (codebase / PY_TYPED).exists():
+            parser.error(f"{codebase} is not a library codebase (generate it with --library)")
+    if args.repeats < 1:
+        parser.error("--repeats must be positive")
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Benchmark --verifytypes and --createstub on every codebase."""
+    args = parse_args(argv)
+    pyright = shlex.split(args.pyright)
+    results = [
+        benchmark_codebase(codebase, pyright, args.repeats, args.ignoreexternal)
+        for codebase in args.codebases
+    ]
+    print_table(results)
+    if args.output is not None:
+        data = {"pyright": args.pyright, "repeats": args.repeats, "results": results}
+        args.output.write_text(json.dumps(data, indent=1) + "\n")
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Benchmark checking a --monorepo repository whole against per project in parallel.
+
+The whole-repository run checks every project in one checker process,
+through the root config and its per-project execution environments.
+The per-project run starts one checker per project on its own config,
+``--parallel`` at a time, the way a CI matrix or a build system would;
+each project also parses (but does not check) the projects it imports.
+Both are repeated and reduced to the median wall-clock time. The
+per-project run additionally reports the summed project times (the
+serial cost) and the slowest project (its critical path).
+
+Usage:
+    python generate_sample_code.py medium --monorepo 8 -q -o /tmp/mono
+    python monorepo_benchmark.py /tmp/mono/monorepo --parallel 4 --repeats 3
+    python monorepo_benchmark.py /tmp/mono/monorepo --checker "pyright --threads -p {path}" -o mono.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from generate_sample_code import MONOREPO_MANIFEST, time_checker
+
+DEFAULT_CHECKER = "pyright -p {path}"
+
+
+def time_projects(checker: str, projects: List[Path], parallel: int) -> Dict[str, Any]:
+    """Check every project with at most ``parallel`` checkers running at once."""
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=parallel) as executor:
+        seconds = list(executor.map(lambda project: time_checker(checker, project), projects))
+    wall = time.perf_counter() - started
+    return {
+        "seconds": wall,
+        "serial_seconds": sum(seconds),
+        "slowest": max(seconds),
+        "projects": {project.name: elapsed for project, elapsed in zip(projects, seconds)},
+    }
+
+
+def benchmark_monorepo(root: Path, checker: str, parallel: int, repeats: int = 1) -> Dict[str, Any]:
+    """Median timings of both ways of checking the monorepo at ``root``."""
+    manifest = json.loads((root / MONOREPO_MANIFEST).read_text())
+    projects = [root / entry["path"] for entry in manifest["projects"].values()]
+
+    whole_runs: List[float] = []
+    project_runs: List[Dict[str, Any]] = []
+    for _ in range(repeats):
+        whole_runs.append(time_checker(checker, root))
+        project_runs.append(time_projects(checker, projects, parallel))
+
+    per_project = statistics.median(run["seconds"] for run in project_runs)
+    whole = statistics.median(whole_runs)
+    return {
+        "root": str(root),
+        "projects": len(projects),
+        "files": manifest["totals"]["files"],
+        "lines": manifest["totals"]["lines"],
+        "whole": {"seconds": whole, "runs": whole_runs},
+        "per_project": {
+            "parallel": parallel,
+            "seconds": per_project,
+            "serial_seconds": statistics.median(run["serial_seconds"] for run in project_runs),
+            "slowest": statistics.median(run["slowest"] for run in project_runs),
+            "runs": project_runs,
+        },
+        "speedup": whole / per_project if per_project else None,
+    }
+
+
+def print_table(result: Dict[str, Any]) -> None:
+    """Print both modes side by side."""
+    per_project = result["per_project"]
+    print(f"{result['projects']} projects, {result['files']} files, {result['lines']} lines")
+    header = f"{'mode':<28} {'wall s':>8} {'serial s':>9} {'slowest s':>10}"
+    print(header)
+    print("-" * len(header))
+    print(f"{'whole repository':<28} {result['whole']['seconds']:>8.2f} {'-':>9} {'-':>10}")
+    print(
+        f"{'per project (parallel ' + str(per_project['parallel']) + ')':<28} {per_project['seconds']:>8.2f} "
+        f"{per_project['serial_seconds']:>9.2f} {per_project['slowest']:>10.2f}"
+    )
+    if result["speedup"] is not None:
+        print(f"per-project speedup over whole repository: {result['speedup']:.2f}x")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "root",
+        type=Path,
+        metavar="MONOREPO",
+        help="monorepo directory written by generate_sample_code.py --monorepo",
+    )
+    parser.add_argument(
+        "--checker",
+        default=DEFAULT_CHECKER,
+        metavar="COMMAND",
+        help="checker command; {path} is the repository or project directory (default: %(default)r)",
+    )
+    parser.add_argument(
+        "--parallel",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="projects checked at once in the per-project run (default: CPU count)",
+    )
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=1,
+        help="runs of each mode; the median is reported (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=Path,
+        help="also write the results as JSON to this file",
+    )
+    args = parser.parse_args(argv)
+    if not (args.root / MONOREPO_MANIFEST).exists():
+        parser.error(f"{args.root} is not a monorepo (generate it with --monorepo)")
+    if args.parallel < 1 or args.repeats < 1:
+        parser.error("--parallel and --repeats must be positive")
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Benchmark the whole-repository and per-project checks of a monorepo."""
+    args = parse_args(argv)
+    result = benchmark_monorepo(args.root, args.checker, args.parallel, args.repeats)
+    print_table(result)
+    if args.output is not None:
+        data = {"checker": args.checker, "repeats": args.repeats, **result}
+        args.output.write_text(json.dumps(data, indent=1) + "\n")
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
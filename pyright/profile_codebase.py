@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Extract a statistical profile of a real Python codebase.
+
+Walks a tree in parallel, parses every ``.py`` file with ``ast`` and
+``tokenize``, and summarizes the distributions that drive type-checking
+cost:
+
+- lines: file size
+- functions, classes: definitions per file
+- imports: import fan-out (distinct modules imported per file)
+- annotation_density: annotated parameters and returns / annotatable ones
+- class_depth: in-tree inheritance depth of every class, resolved by name
+- generics: TypeVar definitions, Generic/Protocol[...] bases and PEP 695
+  type parameters per file
+- comment_ratio: comment lines / lines
+- files_per_package: .py files per directory
+
+Each distribution is stored as its mean and 21 quantiles (every 5%), so
+that generate_sample_code.py --profile can sample from it.
+
+Usage:
+    python profile_codebase.py ~/src/our-service -o our-service.profile.json
+    python generate_sample_code.py large --profile our-service.profile.json
+"""
+
+import argparse
+import ast
+import io
+import json
+import os
+import statistics
+import tokenize
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Directories never profiled
+SKIP_DIRS = {".git", ".hg", ".tox", ".nox", ".venv", "venv", "__pycache__", "node_modules", "build", "dist"}
+
+# Per-file metrics summarized into distributions
+FILE_METRICS = ["lines", "functions", "classes", "imports", "annotation_density", "generics", "comment_ratio"]
+
+QUANTILE_POINTS = 21
+
+# One file's metrics, plus "bases": [[class name, [base names]], ...]
+FileProfile = Dict[str, Any]
+
+
+def iter_python_files(root: Path) -> Iterator[Path]:
+    """Every .py file under ``root``, skipping VCS, cache and venv directories."""
+    for directory, subdirs, files in os.walk(root):
+        subdirs[:] = sorted(d for d in subdirs if d not in SKIP_DIRS and not d.endswith(".egg-info"))
+        for name in sorted(files):
+            if name.endswith(".py"):
+                yield Path(directory) / name
+
+
+def _name(node: ast.expr) -> str:
+    """Last dotted component of a base-class expression (``Generic[T]`` -> ``Generic``)."""
+    if isinstance(node, ast.Subscript):
+        node = node.value
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    if isinstance(node, ast.Name):
+        return node.id
+    return ""
+
+
+def _annotation_counts(node: ast.FunctionDef) -> Tuple[int, int]:
+    """``(annotated, annotatable)`` parameters and return type of a function."""
+    args = node.args
+    params = args.posonlyargs + args.args + args.kwonlyargs
+    params += [arg for arg in (args.vararg, args.kwarg) if arg is not None]
+    params = [param for param in params if param.arg not in ("self", "cls")]
+    annotated = sum(param.annotation is not None for param in params) + (node.returns is not None)
+    return annotated, len(params) + 1
+
+
+def profile_file(path: Path) -> Optional[FileProfile]:
+    """Metrics of one file, or None if it cannot be read or parsed."""
+    try:
+        source = path.read_bytes().decode("utf-8")
+    except (OSError, UnicodeDecodeError):
+        return None
+    return profile_source(source, str(path))
+
+
+def profile_source(source: str, path: str = "<string>") -> Optional[FileProfile]:
+    """Metrics of one file's source, or None if it does not parse."""
+    try:
+        tree = ast.parse(source)
+        comments = {
+            token.start[0]
+            for token in tokenize.generate_tokens(io.StringIO(source).readline)
+            if token.type == tokenize.COMMENT
+        }
+    except (SyntaxError, ValueError, tokenize.TokenError):
+        return None
+
+    lines = source.count("\n") + (not source.endswith("\n") and bool(source))
+    functions = classes = generics = annotated = annotatable = 0
+    modules = set()
+    bases: List[Tuple[str, List[str]]] = []
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            functions += 1
+            generics += len(getattr(node, "type_params", ()))
+            counts = _annotation_counts(node)
+            annotated += counts[0]
+            annotatable += counts[1]
+        elif isinstance(node, ast.ClassDef):
+            classes += 1
+            generics += len(getattr(node, "type_params", ()))
+            names = [_name(base) for base in node.bases]
+            generics += sum(
+                1 for base in node.bases
+                if isinstance(base, ast.Subscript) and _name(base) in ("Generic", "Protocol")
+            )
+            bases.append((node.name, [name for name in names if name]))
+        elif isinstance(node, ast.Import):
+            modules.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            modules.add("." * node.level + (node.module or ""))
+        elif isinstance(node, ast.Call) and _name(node.func) in ("TypeVar", "ParamSpec", "TypeVarTuple"):
+            generics += 1
+
+    return {
+        "path": path,
+        "lines": lines,
+        "functions": functions,
+        "classes": classes,
+        "imports": len(modules),
+        "annotated": annotated,
+        "annotatable": annotatable,
+        "annotation_density": annotated / annotatable if annotatable else 1.0,
+        "generics": generics,
+        "comment_lines": len(comments),
+        "comment_ratio": len(comments) / lines if lines else 0.0,
+        "bases": bases,
+    }
+
+
+def class_depths(files: List[FileProfile]) -> List[int]:
+    """Inheritance depth of every class, resolving base classes by name.
+
+    A class whose bases are all outside the tree has depth 1. Names defined
+    more than once resolve to their deepest definition.
+    """
+    parents: Dict[str, List[List[str]]] = {}
+    for file in files:
+        for name, bases in file["bases"]:
+            parents.setdefault(name, []).append(bases)
+
+    memo: Dict[str, int] = {}
+
+    def depth(name: str, active: frozenset) -> int:
+        if name in memo:
+            return memo[name]
+        if name not in parents or name in active:
+            return 0
+        result = 1 + max(
+            (depth(base, active | {name}) for bases in parents[name] for base in bases),
+            default=0,
+        )
+        memo[name] = result
+        return result
+
+    return [
+        1 + max((depth(base, frozenset({name})) for base in bases), default=0)
+        for file in files
+        for name, bases in file["bases"]
+    ]
+
+
+def distribution(values: List[float]) -> Dict[str, Any]:
+    """Mean, standard deviation, extremes and 21 quantiles of ``values``."""
+    if not values:
+        return {"count": 0, "mean": 0.0, "stdev": 0.0, "min": 0, "max": 0, "quantiles": [0] * QUANTILE_POINTS}
+    ordered = sorted(values)
+    quantiles = [
+        ordered[min(len(ordered) - 1, round(point * (len(ordered) - 1) / (QUANTILE_POINTS - 1)))]
+        for point in range(QUANTILE_POINTS)
+    ]
+    return {
+        "count": len(values),
+        "mean": statistics.fmean(values),
+        "stdev": statistics.pstdev(values),
+        "min": ordered[0],
+        "max": ordered[-1],
+        "quantiles": quantiles,
+    }
+
+
+def profile_tree(root: Path, jobs: int) -> Dict[str, Any]:
+    """Profile every Python file under ``root`` across ``jobs`` processes."""
+    paths = list(iter_python_files(root))
+    if jobs > 1 and len(paths) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(profile_file, paths, chunksize=64))
+    else:
+        results = [profile_file(path) for path in paths]
+    files = [result for result in results if result is not None]
+
+    packages = Counter(str(Path(file["path"]).parent) for file in files)
+    metrics = {metric: distribution([file[metric] for file in files]) for metric in FILE_METRICS}
+    metrics["class_depth"] = distribution(class_depths(files))
+    metrics["files_per_package"] = distribution(list(packages.values()))
+    totals = {
+        key: sum(file[key] for file in files)
+        for key in ("lines", "functions", "classes", "imports", "annotated", "annotatable", "generics", "comment_lines")
+    }
+    return {
+        "root": str(root),
+        "files": len(files),
+        "skipped": len(paths) - len(files),
+        "packages": len(packages),
+        "totals": totals,
+        "metrics": metrics,
+    }
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("root", type=Path, help="directory of the codebase to profile")
+    parser.add_argument("-o", "--output", type=Path, help="profile file (default: stdout)")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="worker processes (default: CPU count; 1 = serial)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Profile a codebase and write the profile as JSON."""
+    args = parse_args(argv)
+    profile = profile_tree(args.root, max(1, args.jobs))
+    text = json.dumps(profile, indent=1) + "\n"
+    if args.output is None:
+        print(text, end="")
+    else:
+        args.output.write_text(text)
+        print(
+            f"Profiled {profile['files']} files ({profile['skipped']} skipped) "
+            f"in {profile['packages']} packages -> {args.output}"
+        )
+
+
+if __name__ == "__main__":
+    main()
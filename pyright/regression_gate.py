@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""
+Fail when type checking got significantly slower, judged from the run history.
+
+Candidate and baseline runs are taken from the history stats_history.py
+records for one ``--codebase``: by label (``--candidate-label pr
+--baseline-label main``), or else the latest ``--candidate-runs`` runs
+against the ``--baseline-runs`` before them. With only a candidate label,
+the baseline is the latest runs with any other label. Each metric (the total time and every
+``--stats`` phase) is compared on its repeated samples:
+
+- the slowdown is the ratio of the candidate and baseline medians, minus 1
+- ``bootstrap`` (default): the slowdown is significant when the lower
+  bound of a bootstrap confidence interval of the median ratio is above 1
+- ``mannwhitney``: when a one-sided Mann-Whitney U test finds the
+  candidate samples larger at ``--alpha`` (exact for small samples
+  without ties, normal approximation otherwise)
+
+A metric regresses when its slowdown exceeds its threshold (``--threshold``,
+overridden per phase by ``--phase-threshold``) and is significant. Phases
+whose baseline median is below ``--min-seconds`` are too small to judge.
+The exit status is 1 when any metric regresses and 2 when there are too
+few candidate runs or no metric was long enough to gate on, so the gate
+can fail a CI job. Too few baseline runs
+(a new history, or a new environment with ``--strict-environment``) only
+warn: there is nothing to compare against yet. A Markdown report is
+appended to ``$GITHUB_STEP_SUMMARY`` when it is set.
+
+Usage:
+    python stats_history.py record sample-code/large --repeats 5 --label main
+    python stats_history.py record sample-code/large --repeats 5 --label pr
+    python regression_gate.py --codebase large --baseline-label main --candidate-label pr
+    python regression_gate.py --codebase large --candidate-runs 5 --baseline-runs 20 --method mannwhitney
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import statistics
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from benchmark_runner import BOOTSTRAP_RESAMPLES
+from stats_history import DEFAULT_DB, FINGERPRINT_FIELDS, connect, query_runs
+
+METHODS = ["bootstrap", "mannwhitney"]
+TOTAL = "total"
+
+# Above this many samples in total, the exact U distribution is not enumerated
+EXACT_LIMIT = 40
+
+
+def run_metrics(run: Dict[str, Any]) -> Dict[str, float]:
+    """Total seconds (reported, else wall-clock) and phase seconds of a stored run."""
+    metrics = dict(run["phases"])
+    total = run["total_seconds"] if run["total_seconds"] is not None else run["wall_seconds"]
+    if total is not None:
+        metrics[TOTAL] = total
+    return metrics
+
+
+def samples_by_metric(runs: List[Dict[str, Any]]) -> Dict[str, List[float]]:
+    """Every metric's samples over ``runs``."""
+    samples: Dict[str, List[float]] = {}
+    for run in runs:
+        for metric, seconds in run_metrics(run).items():
+            samples.setdefault(metric, []).append(seconds)
+    return samples
+
+
+def ratio_ci(
+    candidate: Sequence[float],
+    baseline: Sequence[float],
+    confidence: float = 0.95,
+    seed: int = 0,
+    resamples: int = BOOTSTRAP_RESAMPLES,
+) -> Tuple[float, float]:
+    """Percentile bootstrap confidence interval of median(candidate) / median(baseline) (seeded)."""
+    rng = random.Random(seed)
+    ratios = sorted(
+        statistics.median(rng.choices(candidate, k=len(candidate)))
+        / max(statistics.median(rng.choices(baseline, k=len(baseline))), 1e-12)
+        for _ in range(resamples)
+    )
+    tail = (1 - confidence) / 2
+    return ratios[int(math.floor(tail * (resamples - 1)))], ratios[int(math.ceil((1 - tail) * (resamples - 1)))]
+
+
+@lru_cache(maxsize=None)
+def _u_counts(m: int, n: int) -> Tuple[int, ...]:
+    """Number of orderings of ``m`` and ``n`` untied samples giving each U statistic."""
+    if m == 0 or n == 0:
+        return (1,)
+    counts = [0] * (m * n + 1)
+    for u, count in enumerate(_u_counts(m - 1, n)):
+        counts[u + n] += count
+    for u, count in enumerate(_u_counts(m, n - 1)):
+        counts[u] += count
+    return tuple(counts)
+
+
+def mann_whitney_greater(candidate: Sequence[float], baseline: Sequence[float]) -> Tuple[float, float]:
+    """One-sided Mann-Whitney U test that candidate samples tend to be larger; returns (U, p)."""
+    m, n = len(candidate), len(baseline)
+    u = sum((c > b) + 0.5 * (c == b) for c in candidate for b in baseline)
+    values = list(candidate) + list(baseline)
+    ties = [values.count(value) for value in set(values)]
+    if m + n <= EXACT_LIMIT and all(count == 1 for count in ties):
+        counts = _u_counts(m, n)
+        return u, sum(counts[int(u):]) / sum(counts)
+    mean = m * n / 2
+    tie_term = sum(count ** 3 - count for count in ties) / ((m + n) * (m + n - 1))
+    sigma = math.sqrt(m * n / 12 * ((m + n + 1) - tie_term))
+    if sigma == 0:
+        return u, 1.0
+    z = (u - mean - 0.5) / sigma  # continuity correction
+    return u, 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def compare_metric(
+    candidate: Sequence[float],
+    baseline: Sequence[float],
+    threshold: float,
+    method: str = "bootstrap",
+    confidence: float = 0.95,
+    alpha: float = 0.05,
+) -> Dict[str, Any]:
+    """Slowdown of one metric and whether it is a significant regression."""
+    slowdown = statistics.median(candidate) / max(statistics.median(baseline), 1e-12) - 1
+    low, high = ratio_ci(candidate, baseline, confidence)
+    u, p = mann_whitney_greater(candidate, baseline)
+    significant = low > 1 if method == "bootstrap" else p < alpha
+    return {
+        "baseline_median": statistics.median(baseline),
+        "candidate_median": statistics.median(candidate),
+        "baseline_n": len(baseline),
+        "candidate_n": len(candidate),
+        "slowdown": slowdown,
+        "ratio_ci": [low, high],
+        "u": u,
+        "p_value": p,
+        "threshold": threshold,
+        "significant": significant,
+        "regression": significant and slowdown > threshold,
+    }
+
+
+def select_runs(
+    connection: Any,
+    codebase: str,
+    candidate_label: Optional[str],
+    baseline_label: Optional[str],
+    candidate_runs: int,
+    baseline_runs: int,
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Candidate and baseline runs of ``codebase``, by label or by recency."""
+    if candidate_label is not None:
+        candidate = query_runs(connection, codebase, candidate_label, last=candidate_runs)
+    else:
+        candidate = query_runs(connection, codebase, last=candidate_runs)
+    if baseline_label is not None:
+        baseline = query_runs(connection, codebase, baseline_label, last=baseline_runs)
+    elif candidate_label is not None:
+        others = [run for run in query_runs(connection, codebase) if run["label"] != candidate_label]
+        baseline = others[-baseline_runs:]
+    else:
+        taken = {run["id"] for run in candidate}
+        earlier = query_runs(connection, codebase, last=candidate_runs + baseline_runs)
+        baseline = [run for run in earlier if run["id"] not in taken][-baseline_runs:]
+    return candidate, baseline
+
+
+def environment_mismatch(candidate: List[Dict[str, Any]], baseline: List[Dict[str, Any]]) -> List[str]:
+    """Fingerprinted environment fields that differ between candidate and baseline runs."""
+    return [
+        name for name in FINGERPRINT_FIELDS
+        if {run[name] for run in candidate} != {run[name] for run in baseline}
+    ]
+
+
+def same_environment(runs: List[Dict[str, Any]], reference: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """The ``runs`` measured in the environment of ``reference``."""
+    return [run for run in runs if all(run[name] == reference[name] for name in FINGERPRINT_FIELDS)]
+
+
+def gate(
+    candidate: List[Dict[str, Any]],
+    baseline: List[Dict[str, Any]],
+    threshold: float = 0.10,
+    phase_thresholds: Optional[Dict[str, float]] = None,
+    method: str = "bootstrap",
+    confidence: float = 0.95,
+    alpha: float = 0.05,
+    min_seconds: float = 0.05,
+    metrics: Optional[List[str]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Compare every metric both sides measured; returns the results by metric."""
+    phase_thresholds = phase_thresholds or {}
+    candidate_samples = samples_by_metric(candidate)
+    baseline_samples = samples_by_metric(baseline)
+    names = metrics or sorted(set(candidate_samples) & set(baseline_samples), key=lambda name: (name != TOTAL, name))
+    results: Dict[str, Dict[str, Any]] = {}
+    for name in names:
+        if name not in candidate_samples or name not in baseline_samples:
+            continue
+        if statistics.median(baseline_samples[name]) < min_seconds:
+            continue
+        results[name] = compare_metric(
+            candidate_samples[name],
+            baseline_samples[name],
+            phase_thresholds.get(name, threshold),
+            method,
+            confidence,
+            alpha,
+        )
+    return results
+
+
+def print_report(results: Dict[str, Dict[str, Any]], method: str) -> None:
+    """Print one row per metric."""
+    header = (
+        f"{'metric':<18} {'baseline s':>10} {'candidate s':>11} {'slowdown':>9} {'threshold':>9} "
+        f"{'ratio CI':>15} {'p':>7}  verdict"
+    )
+    print(header)
+    print("-" * len(header))
+    for name, result in results.items():
+        verdict = "REGRESSION" if result["regression"] else "slower (not significant)" if (
+            result["slowdown"] > result["threshold"]
+        ) else "ok"
+        low, high = result["ratio_ci"]
+        print(
+            f"{name:<18} {result['baseline_median']:>10.3f} {result['candidate_median']:>11.3f} "
+            f"{result['slowdown']:>+9.1%} {result['threshold']:>9.0%} {f'{low:.2f}-{high:.2f}':>15} "
+            f"{result['p_value']:>7.3f}  {verdict}"
+        )
+    print(f"(significance: {'bootstrap CI of the median ratio' if method == 'bootstrap' else 'Mann-Whitney U'})")
+
+
+def markdown_report(results: Dict[str, Dict[str, Any]], codebase: str) -> str:
+    """The report as a Markdown table, for a CI job summary."""
+    regressed = [name for name, result in results.items() if result["regression"]]
+    title = f"Type-check performance ({codebase}): "
+    title += f"regression in {', '.join(regressed)}" if regressed else "no significant regression"
+    lines = [
+        f"### {title}",
+        "",
+        "| Metric | Baseline s | Candidate s | Slowdown | Threshold | p |",
+        "|---|---|---|---|---|---|",
+    ]
+    for name, result in results.items():
+        mark = " :x:" if result["regression"] else ""
+        lines.append(
+            f"| {name}{mark} | {result['baseline_median']:.3f} | {result['candidate_median']:.3f} | "
+            f"{result['slowdown']:+.1%} | {result['threshold']:.0%} | {result['p_value']:.3f} |"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def _parse_thresholds(parser: argparse.ArgumentParser, specs: List[str]) -> Dict[str, float]:
+    thresholds: Dict[str, float] = {}
+    for spec in ",".join(specs).split(","):
+        if not spec:
+            continue
+        name, _, value = spec.partition("=")
+        try:
+            thresholds[name] = float(value)
+        except ValueError:
+            parser.error(f"bad --phase-threshold entry {spec!r} (expected PHASE=FRACTION, e.g. check=0.15)")
+    return thresholds
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB, help="history database (default: %(default)s)")
+    parser.add_argument("--codebase", required=True, help="codebase the runs were recorded on (directory name)")
+    parser.add_argument("--candidate-label", help="label of the candidate runs (default: the latest runs)")
+    parser.add_argument(
+        "--baseline-label",
+        help="label of the baseline runs (default: the runs before the candidates, other than --candidate-label)",
+    )
+    parser.add_argument(
+        "--candidate-runs",
+        type=int,
+        default=5,
+        help="latest candidate runs used (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--baseline-runs",
+        type=int,
+        default=20,
+        help="latest baseline runs used (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--method",
+        choices=METHODS,
+        default="bootstrap",
+        help="significance test (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="slowdown tolerated before a significant change fails, as a fraction (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--phase-threshold",
+        action="append",
+        default=[],
+        metavar="PHASE=FRACTION,...",
+        help="per-metric thresholds overriding --threshold, e.g. check=0.15,bind=0.3,total=0.05 (repeatable)",
+    )
+    parser.add_argument(
+        "--metrics",
+        help=f"comma-separated metrics to gate on, e.g. {TOTAL},check (default: all both sides measured)",
+    )
+    parser.add_argument("--confidence", type=float, default=0.95, help="bootstrap CI level (default: %(default)s)")
+    parser.add_argument("--alpha", type=float, default=0.05, help="Mann-Whitney test level (default: %(default)s)")
+    parser.add_argument(
+        "--min-seconds",
+        type=float,
+        default=0.05,
+        help="skip metrics whose baseline median is below this (default: %(default)s)",
+    )
+    parser.add_argument("--min-samples", type=int, default=3, help="samples needed on each side (default: %(default)s)")
+    parser.add_argument(
+        "--strict-environment",
+        action="store_true",
+        help="only compare against baseline runs with the candidate's CPU count, OS, Python and checker version",
+    )
+    parser.add_argument("--json", type=Path, help="also write the results as JSON to this file")
+    args = parser.parse_args(argv)
+    args.phase_threshold = _parse_thresholds(parser, args.phase_threshold)
+    args.metrics = [name for name in (args.metrics or "").split(",") if name] or None
+    if args.candidate_runs < 1 or args.baseline_runs < 1 or args.min_samples < 2:
+        parser.error("--candidate-runs and --baseline-runs must be positive and --min-samples at least 2")
+    if not args.db.exists():
+        parser.error(f"{args.db}: no history yet (record runs with stats_history.py)")
+    if args.metrics:
+        connection = connect(args.db)
+        known = {TOTAL} | {phase for (phase,) in connection.execute("SELECT DISTINCT phase FROM phases")}
+        connection.close()
+        unknown = sorted(set(args.metrics) - known)
+        if unknown:
+            parser.error(f"unknown --metrics {', '.join(unknown)} (known: {', '.join(sorted(known))})")
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Gate the candidate runs against the baseline runs."""
+    args = parse_args(argv)
+    connection = connect(args.db)
+    candidate, baseline = select_runs(
+        connection, args.codebase, args.candidate_label, args.baseline_label, args.candidate_runs, args.baseline_runs
+    )
+    if len(candidate) < args.min_samples:
+        print(f"Not enough candidate runs: {len(candidate)} (--min-samples {args.min_samples})", file=sys.stderr)
+        raise SystemExit(2)
+    mismatch = environment_mismatch(candidate, baseline)
+    if mismatch and args.strict_environment:
+        baseline = same_environment(baseline, candidate[-1])
+    elif mismatch:
+        print(f"warning: candidate and baseline runs differ in: {', '.join(mismatch)}", file=sys.stderr)
+    if len(baseline) < args.min_samples:
+        scope = " from the candidate's environment" if mismatch and args.strict_environment else ""
+        print(
+            f"warning: only {len(baseline)} baseline runs{scope} (--min-samples {args.min_samples}); "
+            "nothing to gate against yet",
+            file=sys.stderr,
+        )
+        return
+
+    results = gate(
+        candidate,
+        baseline,
+        args.threshold,
+        args.phase_threshold,
+        args.method,
+        args.confidence,
+        args.alpha,
+        args.min_seconds,
+        args.metrics,
+    )
+    skipped = [name for name in args.metrics or [] if name not in results]
+    if skipped:
+        print(f"warning: not gated (unmeasured or below --min-seconds): {', '.join(skipped)}", file=sys.stderr)
+    if not results:
+        print(
+            f"No metric was gated: none has a baseline median of at least --min-seconds {args.min_seconds}",
+            file=sys.stderr,
+        )
+        raise SystemExit(2)
+    print_report(results, args.method)
+    summary = os.environ.get("GITHUB_STEP_SUMMARY")
+    if summary:
+        with open(summary, "a") as handle:
+            handle.write(markdown_report(results, args.codebase))
+    if args.json is not None:
+        data = {
+            "method": args.method,
+            "candidate_runs": [run["id"] for run in candidate],
+            "baseline_runs": [run["id"] for run in baseline],
+            "environment_mismatch": mismatch,
+            "results": results,
+        }
+        args.json.write_text(json.dumps(data, indent=1) + "\n")
+    regressed = [name for name, result in results.items() if result["regression"]]
+    if regressed:
+        print(f"Significant slowdown in: {', '.join(regressed)}")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""
+Fake site-packages for generate_sample_code.py.
+
+The base templates import only the standard library, so a checker never
+resolves imports against a large virtualenv. ``write_venv`` lays out a
+virtualenv (``pyvenv.cfg`` and ``lib/python3.11/site-packages``) of
+generated third-party distributions, and ``site_imports`` draws the
+imports each corpus file makes from it. Every distribution is one of:
+
+- typed: annotated modules and a ``py.typed`` marker
+- stubs: an unannotated runtime package plus a ``<name>-stubs`` package
+  of ``.pyi`` stubs, which the checker must prefer
+- untyped: unannotated modules and no ``py.typed``, so types are inferred
+  from the library source
+
+A distribution nests ``depth`` levels of subpackages below its top-level
+package. Every level holds ``client.py`` and ``models.py``, and its
+``__init__`` re-exports them. Distributions, their kinds and the imports
+are all drawn from the seed.
+"""
+
+import random
+import shutil
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterator, List, NamedTuple, Tuple
+
+DISTRIBUTION_KINDS = ["typed", "stubs", "untyped"]
+
+SITE_PACKAGES = "lib/python3.11/site-packages"
+PYVENV_CFG = "home = /usr/bin\ninclude-system-site-packages = false\nversion = 3.11.7\n"
+
+# Generator key of the venv contents, written last
+KEY_FILE = ".generated"
+
+PREFIXES = ["fast", "py", "async", "open", "micro", "data", "cloud", "deep", "hyper", "easy", "smart", "tiny"]
+SUFFIXES = [
+    "query", "cache", "http", "schema", "metrics", "queue", "auth", "store", "parse", "stream", "graph", "vault",
+]
+LEVEL_NAMES = ["api", "core", "internal", "backends", "compat", "ext", "utils", "v1", "v2", "io", "types", "impl"]
+
+
+@dataclass(frozen=True)
+class SiteSpec:
+    """Shape of the fake site-packages and of the corpus imports from it.
+
+    ``mix`` weights the distribution kinds (see DISTRIBUTION_KINDS).
+    ``imports`` is the number of site-packages modules each base template
+    file imports.
+    """
+
+    packages: int
+    depth: int = 2
+    mix: Tuple[Tuple[str, int], ...] = (("typed", 1), ("stubs", 1), ("untyped", 1))
+    imports: int = 2
+
+
+class Distribution(NamedTuple):
+    """A generated third-party distribution and its subpackage chain."""
+
+    name: str
+    kind: str
+    levels: Tuple[str, ...]
+
+    def modules(self) -> List[str]:
+        """Dotted name of every package level, top-level package first."""
+        return [".".join((self.name,) + self.levels[:depth]) for depth in range(len(self.levels) + 1)]
+
+
+@lru_cache(maxsize=None)
+def distributions(spec: SiteSpec, seed: int) -> Tuple[Distribution, ...]:
+    """The distributions of a fake site-packages (seeded)."""
+    rng = random.Random(f"site-{seed}")
+    kinds = [kind for kind, _ in spec.mix]
+    weights = [weight for _, weight in spec.mix]
+    return tuple(
+        Distribution(
+            f"{rng.choice(PREFIXES)}{rng.choice(SUFFIXES)}_{index:03d}",
+            rng.choices(kinds, weights)[0],
+            tuple(rng.sample(LEVEL_NAMES, min(spec.depth, len(LEVEL_NAMES)))),
+        )
+        for index in range(spec.packages)
+    )
+
+
+def _models_source(module: str, typed: bool) -> str:
+    key, value, text, number = (": str", ": int", " -> str", " -> int") if typed else ("", "", "", "")
+    init = " -> None" if typed else ""
+    return f'''"""Records of {module}."""
+
+
+class Record:
+    """A key/value record."""
+
+    def __init__(self, key{key}, value{value}){init}:
+        self.key = key
+        self.value = value
+
+    def describe(self){text}:
+        return f"{{self.key}}={{self.value}}"
+
+    def score(self){number}:
+        return len(self.describe())
+'''
+
+
+def _client_source(module: str, typed: bool) -> str:
+    url, timeout, key, keys = (": str", ": float", ": str", ": list[str]") if typed else ("", "", "", "")
+    record, records, client = (" -> Record", " -> list[Record]", " -> Client") if typed else ("", "", "")
+    init = " -> None" if typed else ""
+    return f'''"""Client of {module}."""
+from .models import Record
+
+
+class Client:
+    """Connection to a {module} endpoint."""
+
+    def __init__(self, url{url}, timeout{timeout} = 10.0){init}:
+        self.url = url
+        self.timeout = timeout
+
+    def fetch(self, key{key}){record}:
+        return Record(key, len(key))
+
+    def fetch_all(self, keys{keys}){records}:
+        return [self.fetch(key) for key in keys]
+
+
+def connect(url{url}, timeout{timeout} = 10.0){client}:
+    return Client(url, timeout)
+'''
+
+
+MODELS_STUB = '''class Record:
+    key: str
+    value: int
+    def __init__(self, key: str, value: int) -> None: ...
+    def describe(self) -> str: ...
+    def score(self) -> int: ...
+'''
+
+CLIENT_STUB = '''from .models import Record
+
+class Client:
+    url: str
+    timeout: float
+    def __init__(self, url: str, timeout: float = 10.0) -> None: ...
+    def fetch(self, key: str) -> Record: ...
+    def fetch_all(self, keys: list[str]) -> list[Record]: ...
+
+def connect(url: str, timeout: float = 10.0) -> Client: ...
+'''
+
+
+def _init_source(module: str, child: str, explicit: bool) -> str:
+    """A level's ``__init__``: re-exports, explicit (``X as X``) where types are checked."""
+    names = ["Client", "connect"], ["Record"]
+    if explicit:
+        imports = [
+            f"from .client import {', '.join(f'{name} as {name}' for name in names[0])}",
+            f"from .models import {', '.join(f'{name} as {name}' for name in names[1])}",
+        ]
+    else:
+        imports = [f"from .client import {', '.join(names[0])}", f"from .models import {', '.join(names[1])}"]
+    if child:
+        imports.append(f"from . import {child} as {child}" if explicit else f"from . import {child}")
+    return f'"""{module}."""\n' + "\n".join(imports) + "\n"
+
+
+def iter_distribution(dist: Distribution) -> Iterator[Tuple[str, str]]:
+    """Render one distribution as ``(path, content)`` pairs relative to site-packages."""
+    typed = dist.kind == "typed"
+    for depth, module in enumerate(dist.modules()):
+        directory = module.replace(".", "/")
+        child = dist.levels[depth] if depth < len(dist.levels) else ""
+        yield f"{directory}/__init__.py", _init_source(module, child, typed)
+        yield f"{directory}/models.py", _models_source(module, typed)
+        yield f"{directory}/client.py", _client_source(module, typed)
+        if dist.kind == "stubs":
+            stub_directory = f"{dist.name}-stubs" + directory[len(dist.name):]
+            yield f"{stub_directory}/__init__.pyi", _init_source(module, child, True)
+            yield f"{stub_directory}/models.pyi", MODELS_STUB
+            yield f"{stub_directory}/client.pyi", CLIENT_STUB
+    if typed:
+        yield f"{dist.name}/py.typed", ""
+    projects = [(dist.name, dist.name)]
+    if dist.kind == "stubs":
+        projects.append((f"types-{dist.name}", f"{dist.name}-stubs"))
+    for project, top_level in projects:
+        info = f"{project.replace('-', '_')}-1.0.0.dist-info"
+        yield f"{info}/METADATA", f"Metadata-Version: 2.1\nName: {project}\nVersion: 1.0.0\n"
+        yield f"{info}/top_level.txt", f"{top_level}\n"
+
+
+def write_venv(root: Path, spec: SiteSpec, seed: int, key: str) -> int:
+    """(Re)create the fake virtualenv at ``root``; returns its number of files.
+
+    ``key`` identifies the generator parameters and is kept in the venv.
+    A venv already built with the same key is left untouched, so its files
+    keep their mtimes (and the checker's warm cache stays valid).
+    """
+    files = [("pyvenv.cfg", PYVENV_CFG)] + [
+        (f"{SITE_PACKAGES}/{relpath}", content)
+        for dist in distributions(spec, seed)
+        for relpath, content in iter_distribution(dist)
+    ]
+    marker = root / KEY_FILE
+    if marker.exists() and marker.read_text() == key:
+        return len(files)
+    if root.exists():
+        shutil.rmtree(root)
+    for relpath, content in files:
+        path = root / relpath
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    marker.write_text(key)
+    return len(files)
+
+
+def site_imports(spec: SiteSpec, seed: int, module_path: str, index: int) -> Tuple[List[str], List[str]]:
+    """Import statements and code using them for one corpus file (seeded).
+
+    Each import targets a random package level of a random distribution,
+    so resolution walks subpackage chains and stub packages.
+    """
+    dists = distributions(spec, seed)
+    if not dists:
+        return [], []
+    rng = random.Random(f"site-{seed}:{module_path}:{index}")
+    imports: List[str] = []
+    usages: List[str] = []
+    for _ in range(spec.imports):
+        dist = rng.choice(dists)
+        module = rng.choice(dist.modules())
+        alias = module.replace(".", "_")
+        statement = f"import {module} as {alias}" if alias != module else f"import {module}"
+        if statement in imports:
+            continue
+        imports.append(statement)
+        usages.append(f'''def fetch_{alias}(keys: list[str]) -> list[str]:
+    """Describe records fetched through {module} ({dist.kind} distribution)."""
+    client = {alias}.connect("https://{dist.name}.invalid")
+    return [record.describe() for record in client.fetch_all(keys)]
+''')
+    return imports, usages
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Turn a generated corpus into a local git repository with a stack of dependent branches.
+
+The corpus is committed to the trunk branch under its own directory name,
+next to a checker config that includes it. An edit trace (see
+edit_trace.py) of ``branches x edits`` steps is then drawn against the
+corpus and cut into consecutive slices. Branch ``i`` of the stack is one
+commit on top of branch ``i - 1`` that applies slice ``i``, as in a
+stacked-diff workflow. Later edits see the state earlier branches left
+behind. Each branch tracks its parent as upstream, so ``git status``
+reports where it stands in the stack. Authors and commit dates are
+fixed, so the same corpus, seed and options give the same commit ids.
+
+The stack is written to ``--output`` as JSON. For every branch it lists
+the parent, the commit, the edits with their blast radius, and the files
+changed against the parent and against the trunk. These are the inputs
+of per-branch incremental checking strategies.
+
+Usage:
+    python generate_sample_code.py large --dependencies -q
+    python stacked_branches.py sample-code/large /tmp/stack --branches 5 --edits 4 -o stack.json
+    git -C /tmp/stack log --oneline --graph --all
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from edit_trace import DEFAULT_MIX, apply_action, generate_trace, parse_mix
+from generate_sample_code import CHECKER_CONFIG, MANIFEST_NAME, ROOT_CONFIG, VENV_NAME
+
+# Wider radii first win when summarizing a branch
+RADII = ["file", "direct", "transitive"]
+
+# Fixed identity and clock, so commit ids only depend on the content
+AUTHOR = "Stack Generator <stack@example.invalid>"
+EPOCH = 1_700_000_000
+
+
+def git(repo: Path, *args: str, when: int = EPOCH) -> str:
+    """Run a git command in ``repo`` with a fixed identity and date; returns its stdout."""
+    name, email = AUTHOR[:-1].split(" <")
+    env = dict(os.environ)
+    for role in ("AUTHOR", "COMMITTER"):
+        env[f"GIT_{role}_NAME"] = name
+        env[f"GIT_{role}_EMAIL"] = email
+        env[f"GIT_{role}_DATE"] = f"{when} +0000"
+    result = subprocess.run(["git", *args], cwd=repo, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise SystemExit(f"git {' '.join(args)} failed:\n{result.stderr}")
+    return result.stdout.strip()
+
+
+def is_stack_repo(repo: Path) -> bool:
+    """Whether ``repo`` is a repository an earlier run built (its root commit is by ``AUTHOR``)."""
+    if not (repo / ".git").is_dir():
+        return False
+    result = subprocess.run(
+        ["git", "log", "--max-parents=0", "--format=%an <%ae>"], cwd=repo, capture_output=True, text=True
+    )
+    return result.returncode == 0 and result.stdout.strip().splitlines() == [AUTHOR]
+
+
+def import_corpus(corpus: Path, repo: Path, trunk: str) -> Path:
+    """Create the repository with the corpus committed on ``trunk``; returns the corpus copy."""
+    if repo.exists():
+        shutil.rmtree(repo)
+    target = repo / corpus.resolve().name
+    shutil.copytree(corpus, target, ignore=shutil.ignore_patterns("__pycache__", MANIFEST_NAME, VENV_NAME))
+    config = json.loads(ROOT_CONFIG.read_text())
+    config["include"] = [target.name]
+    (repo / CHECKER_CONFIG).write_text(json.dumps(config, indent=2) + "\n")
+    (repo / ".gitignore").write_text("__pycache__/\n")
+    git(repo, "init", "-q", "-b", trunk)
+    git(repo, "add", "-A")
+    git(repo, "commit", "-q", "-m", f"Import {target.name} corpus")
+    return target
+
+
+def commit_message(index: int, steps: List[Dict[str, Any]]) -> str:
+    """Subject and body of the commit of branch ``index``."""
+    kinds = sorted({step["kind"] for step in steps})
+    lines = [f"Stack {index:02d}: {', '.join(kinds)} edits", ""]
+    lines.extend(f"- {step['kind']} {step['path']} ({step['radius']}, {step['affected']} files)" for step in steps)
+    return "\n".join(lines)
+
+
+def build_stack(
+    corpus: Path,
+    repo: Path,
+    branches: int,
+    edits: int,
+    seed: int = 0,
+    mix: Dict[str, int] = DEFAULT_MIX,
+    trunk: str = "main",
+    prefix: str = "stack/",
+) -> Dict[str, Any]:
+    """Build the repository and its stack; returns the stack description."""
+    trace = generate_trace(corpus, branches * edits, seed, mix)
+    target = import_corpus(corpus, repo, trunk)
+    base = git(repo, "rev-parse", "HEAD")
+
+    parent = trunk
+    stack: List[Dict[str, Any]] = []
+    for index in range(1, branches + 1):
+        steps = trace["steps"][(index - 1) * edits:index * edits]
+        name = f"{prefix}{index:02d}"
+        git(repo, "checkout", "-q", "-b", name)
+        for step in steps:
+            for action in step["actions"]:
+                apply_action(target, action)
+        git(repo, "add", "-A")
+        git(repo, "commit", "-q", "-m", commit_message(index, steps), when=EPOCH + 60 * index)
+        git(repo, "branch", "-q", f"--set-upstream-to={parent}")
+        stack.append({
+            "branch": name,
+            "parent": parent,
+            "commit": git(repo, "rev-parse", "HEAD"),
+            "edits": [{key: step[key] for key in ("step", "kind", "path", "radius", "affected")} for step in steps],
+            "radius": max((step["radius"] for step in steps), key=RADII.index),
+            "affected": max(step["affected"] for step in steps),
+            "changed": git(repo, "diff", "--name-only", parent, name).splitlines(),
+            "changed_since_trunk": len(git(repo, "diff", "--name-only", trunk, name).splitlines()),
+        })
+        parent = name
+
+    git(repo, "checkout", "-q", trunk)
+    return {
+        "repository": str(repo),
+        "corpus": str(corpus),
+        "corpus_key": trace["corpus_key"],
+        "package": target.name,
+        "trunk": trunk,
+        "base": base,
+        "seed": seed,
+        "mix": mix,
+        "branches": stack,
+    }
+
+
+def print_stack(stack: Dict[str, Any]) -> None:
+    """Print one row per branch, bottom of the stack first."""
+    header = f"{'branch':<14} {'commit':<10} {'edits':>5} {'changed':>8} {'since trunk':>12}  radius"
+    print(header)
+    print("-" * len(header))
+    for branch in stack["branches"]:
+        print(
+            f"{branch['branch']:<14} {branch['commit'][:10]:<10} {len(branch['edits']):>5} "
+            f"{len(branch['changed']):>8} {branch['changed_since_trunk']:>12}  "
+            f"{branch['radius']} ({branch['affected']} files)"
+        )
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("corpus", type=Path, help="codebase directory, e.g. sample-code/large")
+    parser.add_argument("repo", type=Path, help="repository to create (an earlier stack repository is replaced)")
+    parser.add_argument("-n", "--branches", type=int, default=5, help="branches in the stack (default: %(default)s)")
+    parser.add_argument("--edits", type=int, default=3, help="trace edits applied per branch (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0, help="trace seed (default: %(default)s)")
+    parser.add_argument(
+        "--mix",
+        default=",".join(f"{kind}={weight}" for kind, weight in DEFAULT_MIX.items()),
+        help="relative weights of the edit kinds (default: %(default)s)",
+    )
+    parser.add_argument("--trunk", default="main", help="name of the trunk branch (default: %(default)s)")
+    parser.add_argument("--prefix", default="stack/", help="prefix of the stack branch names (default: %(default)s)")
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="replace REPO even if it is a non-empty directory this script did not build",
+    )
+    parser.add_argument("-o", "--output", type=Path, help="also write the stack as JSON to this file")
+    args = parser.parse_args(argv)
+    args.mix = parse_mix(parser, args.mix)
+    if args.branches < 1 or args.edits < 1:
+        parser.error("--branches and --edits must be positive")
+    if not (args.corpus / MANIFEST_NAME).exists():
+        parser.error(f"{args.corpus}: no {MANIFEST_NAME}; generate the corpus first")
+    corpus, repo = args.corpus.resolve(), args.repo.resolve()
+    if repo == corpus or corpus in repo.parents:
+        parser.error("the repository must not be inside the corpus")
+    if repo in corpus.parents:
+        parser.error("the corpus must not be inside the repository, which is replaced")
+    if repo.is_dir() and any(repo.iterdir()) and not is_stack_repo(repo) and not args.force:
+        parser.error(f"{args.repo} is not empty and not a stack repository; pass --force to replace it")
+    if repo.exists() and not repo.is_dir():
+        parser.error(f"{args.repo} exists and is not a directory")
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Build a stacked-branch repository from a generated corpus."""
+    args = parse_args(argv)
+    stack = build_stack(args.corpus, args.repo, args.branches, args.edits, args.seed, args.mix, args.trunk, args.prefix)
+    print_stack(stack)
+    if args.output is not None:
+        args.output.write_text(json.dumps(stack, indent=1) + "\n")
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
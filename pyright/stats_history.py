@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+"""
+Parse ``pyright --stats`` / ``--verbose`` output and keep a history of runs in SQLite.
+
+``parse_output`` turns the console output of one run into structured
+figures: the phase timings of the ``Timing stats`` block (find, read,
+tokenize, parse, resolve imports, bind, check, detect cycles), the file
+counts (found, parsed and bound, checked), the diagnostics summary, the
+total time and the peak heap of ``--verbose``. ``--threads`` cannot be
+combined with ``--stats``, so phases are optional.
+
+Every stored run carries an environment fingerprint over what makes
+timings comparable and survives runner image updates: CPU count, OS
+family, Python version (major.minor) and checker version. The full
+platform string, a hash of the config file the checker loaded and a hash
+of the corpus manifest's file contents (the line count comes from the
+manifest too) are stored next to it. Runs live in an indexed ``runs`` table, one row
+per phase in ``phases``, so trends over hundreds of runs are plain SQL.
+
+Usage:
+    python stats_history.py record sample-code/large --repeats 3 --label baseline
+    python stats_history.py record sample-code/large --checker "pyright --stats --verbose {path}"
+    pyright --stats sample-code/large > run.txt; python stats_history.py import run.txt --codebase sample-code/large
+    python stats_history.py parse run.txt
+    python stats_history.py query --codebase large --phase check --last 20
+    python stats_history.py summary
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import platform
+import re
+import sqlite3
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from benchmark_runner import checker_argv
+from generate_sample_code import MANIFEST_NAME, MONOREPO_MANIFEST
+
+DEFAULT_DB = Path(__file__).parent / ".bench-history.sqlite"
+DEFAULT_CHECKER = "pyright --stats {path}"
+
+VERSION_RE = re.compile(r"^pyright (\d+\.\d+\.\d+)\s*$", re.M)
+CONFIG_RE = re.compile(r"^Loading configuration file at (.+?)\s*$", re.M)
+FOUND_RE = re.compile(r"^Found (\d+) source files?", re.M)
+PARSED_RE = re.compile(r"^Total files parsed and bound: (\d+)", re.M)
+CHECKED_RE = re.compile(r"^Total files checked: (\d+)", re.M)
+SUMMARY_RE = re.compile(r"^(\d+) errors?, (\d+) warnings?, (\d+) informations?", re.M)
+COMPLETED_RE = re.compile(r"^Completed in ([\d.]+)sec", re.M)
+HEAP_RE = re.compile(r"used_heap_size=(\d+)MB")
+PHASE_RE = re.compile(r"^([A-Z][A-Za-z ]+):\s+([\d.]+)sec\s*$", re.M)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    recorded_at REAL NOT NULL,
+    label TEXT NOT NULL DEFAULT '',
+    codebase TEXT NOT NULL,
+    command TEXT NOT NULL DEFAULT '',
+    returncode INTEGER,
+    wall_seconds REAL,
+    total_seconds REAL,
+    files_found INTEGER,
+    files_parsed INTEGER,
+    files_checked INTEGER,
+    lines INTEGER,
+    errors INTEGER,
+    warnings INTEGER,
+    peak_heap_mb INTEGER,
+    cpu_count INTEGER,
+    platform TEXT,
+    os TEXT,
+    python_version TEXT,
+    checker_version TEXT,
+    config_hash TEXT,
+    manifest_hash TEXT,
+    fingerprint TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS phases (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    phase TEXT NOT NULL,
+    seconds REAL NOT NULL,
+    PRIMARY KEY (run_id, phase)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS runs_codebase ON runs(codebase, recorded_at);
+CREATE INDEX IF NOT EXISTS runs_fingerprint ON runs(fingerprint, codebase);
+CREATE INDEX IF NOT EXISTS runs_label ON runs(label);
+CREATE INDEX IF NOT EXISTS phases_phase ON phases(phase, run_id);
+"""
+
+# Columns of ``runs`` filled from CheckerStats and the fingerprint
+RUN_COLUMNS = [
+    "recorded_at", "label", "codebase", "command", "returncode", "wall_seconds", "total_seconds",
+    "files_found", "files_parsed", "files_checked", "lines", "errors", "warnings", "peak_heap_mb",
+    "cpu_count", "platform", "os", "python_version", "checker_version", "config_hash", "manifest_hash",
+    "fingerprint",
+]
+
+# Columns added to ``runs`` after the first release, with their types
+ADDED_COLUMNS = {"os": "TEXT", "python_version": "TEXT"}
+
+# Environment fields the fingerprint hashes, and runs must share to be compared
+FINGERPRINT_FIELDS = ("cpu_count", "os", "python_version", "checker_version")
+
+
+@dataclass
+class CheckerStats:
+    """Figures parsed from the console output of one checker run."""
+
+    version: str = ""
+    config: str = ""
+    files_found: Optional[int] = None
+    files_parsed: Optional[int] = None
+    files_checked: Optional[int] = None
+    errors: Optional[int] = None
+    warnings: Optional[int] = None
+    informations: Optional[int] = None
+    total_seconds: Optional[float] = None
+    peak_heap_mb: Optional[int] = None
+    phases: Dict[str, float] = field(default_factory=dict)
+
+
+def phase_key(name: str) -> str:
+    """``Resolve Imports`` -> ``resolve_imports``."""
+    return "_".join(name.lower().split())
+
+
+def _int(pattern: "re.Pattern[str]", text: str) -> Optional[int]:
+    match = pattern.search(text)
+    return int(match.group(1)) if match else None
+
+
+def parse_output(text: str) -> CheckerStats:
+    """Parse the console output of ``pyright --stats`` and/or ``--verbose``."""
+    stats = CheckerStats(
+        files_found=_int(FOUND_RE, text),
+        files_parsed=_int(PARSED_RE, text),
+        files_checked=_int(CHECKED_RE, text),
+    )
+    version = VERSION_RE.search(text)
+    stats.version = version.group(1) if version else ""
+    config = CONFIG_RE.search(text)
+    stats.config = config.group(1) if config else ""
+    summary = SUMMARY_RE.search(text)
+    if summary:
+        stats.errors, stats.warnings, stats.informations = (int(value) for value in summary.groups())
+    completed = COMPLETED_RE.search(text)
+    if completed:
+        stats.total_seconds = float(completed.group(1))
+    heaps = [int(value) for value in HEAP_RE.findall(text)]
+    stats.peak_heap_mb = max(heaps) if heaps else None
+    start = text.find("Timing stats")
+    if start >= 0:
+        stats.phases = {phase_key(name): float(seconds) for name, seconds in PHASE_RE.findall(text[start:])}
+    return stats
+
+
+def _hash_file(path: Optional[Path]) -> str:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest() if path else ""
+    except OSError:
+        return ""
+
+
+def manifest_fingerprint(codebase: Path) -> Dict[str, Any]:
+    """Hash of a corpus's file contents and its line count, from its manifest.
+
+    The hash covers paths and content hashes only, so regenerating an
+    identical corpus (new mtimes) keeps it. A monorepo is hashed through
+    its projects' totals.
+    """
+    for name in (MANIFEST_NAME, MONOREPO_MANIFEST):
+        try:
+            manifest = json.loads((codebase / name).read_text())
+        except (OSError, ValueError):
+            continue
+        if "files" in manifest:
+            contents = sorted((relpath, record.get("sha256", "")) for relpath, record in manifest["files"].items())
+        else:
+            contents = sorted((project, entry["totals"]) for project, entry in manifest.get("projects", {}).items())
+        digest = hashlib.sha256(json.dumps(contents).encode()).hexdigest()
+        return {"manifest_hash": digest, "lines": manifest.get("totals", {}).get("lines")}
+    return {"manifest_hash": "", "lines": None}
+
+
+def environment_fingerprint(stats: CheckerStats, codebase: Path) -> Dict[str, Any]:
+    """Environment a run was measured in, and one hash over all of it."""
+    environment: Dict[str, Any] = {
+        "cpu_count": os.cpu_count(),
+        "platform": platform.platform(),
+        "os": platform.system(),
+        "python_version": ".".join(platform.python_version_tuple()[:2]),
+        "checker_version": stats.version,
+        "config_hash": _hash_file(Path(stats.config) if stats.config else None),
+        **manifest_fingerprint(codebase),
+    }
+    environment["fingerprint"] = hashlib.sha256(
+        json.dumps([environment[key] for key in FINGERPRINT_FIELDS]).encode()
+    ).hexdigest()[:16]
+    return environment
+
+
+def connect(db: Path) -> sqlite3.Connection:
+    """Open (and create if needed) a history database."""
+    connection = sqlite3.connect(db)
+    connection.row_factory = sqlite3.Row
+    connection.execute("PRAGMA foreign_keys = ON")
+    connection.executescript(SCHEMA)
+    existing = {row["name"] for row in connection.execute("PRAGMA table_info(runs)")}
+    for column, kind in ADDED_COLUMNS.items():
+        if column not in existing:
+            connection.execute(f"ALTER TABLE runs ADD COLUMN {column} {kind}")
+    return connection
+
+
+def store_run(
+    connection: sqlite3.Connection,
+    stats: CheckerStats,
+    codebase: Path,
+    label: str = "",
+    command: str = "",
+    returncode: Optional[int] = None,
+    wall_seconds: Optional[float] = None,
+) -> int:
+    """Insert one run with its phases; returns its id."""
+    row = {
+        "recorded_at": time.time(),
+        "label": label,
+        "codebase": codebase.resolve().name,
+        "command": command,
+        "returncode": returncode,
+        "wall_seconds": wall_seconds,
+        "total_seconds": stats.total_seconds,
+        "files_found": stats.files_found,
+        "files_parsed": stats.files_parsed,
+        "files_checked": stats.files_checked,
+        "errors": stats.errors,
+        "warnings": stats.warnings,
+        "peak_heap_mb": stats.peak_heap_mb,
+        **environment_fingerprint(stats, codebase),
+    }
+    with connection:
+        cursor = connection.execute(
+            f"INSERT INTO runs ({', '.join(RUN_COLUMNS)}) VALUES ({', '.join('?' * len(RUN_COLUMNS))})",
+            [row[column] for column in RUN_COLUMNS],
+        )
+        run_id = cursor.lastrowid
+        connection.executemany(
+            "INSERT INTO phases (run_id, phase, seconds) VALUES (?, ?, ?)",
+            [(run_id, phase, seconds) for phase, seconds in stats.phases.items()],
+        )
+    assert run_id is not None
+    return run_id
+
+
+def record(
+    connection: sqlite3.Connection,
+    codebase: Path,
+    checker: str = DEFAULT_CHECKER,
+    repeats: int = 1,
+    label: str = "",
+) -> Iterator[int]:
+    """Run the checker ``repeats`` times on ``codebase``, storing each run."""
+    argv = checker_argv(checker, codebase)
+    for _ in range(repeats):
+        started = time.perf_counter()
+        try:
+            result = subprocess.run(argv, capture_output=True, text=True)
+        except FileNotFoundError:
+            raise SystemExit(f"checker not found: {argv[0]!r}") from None
+        elapsed = time.perf_counter() - started
+        stats = parse_output(result.stdout + result.stderr)
+        if stats.total_seconds is None and not stats.phases:
+            raise SystemExit(f"no statistics in the output of {' '.join(argv)}:\n{result.stderr or result.stdout}")
+        yield store_run(connection, stats, codebase, label, " ".join(argv), result.returncode, elapsed)
+
+
+def query_runs(
+    connection: sqlite3.Connection,
+    codebase: Optional[str] = None,
+    label: Optional[str] = None,
+    fingerprint: Optional[str] = None,
+    last: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Stored runs, newest last, each with its phases as a dict."""
+    clauses: List[str] = []
+    params: List[Any] = []
+    for column, value in (("codebase", codebase), ("label", label), ("fingerprint", fingerprint)):
+        if value is not None:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    limit = ""
+    if last is not None:
+        limit = "LIMIT ?"
+        params.append(last)
+    rows = connection.execute(
+        f"SELECT * FROM (SELECT * FROM runs {where} ORDER BY recorded_at DESC, id DESC {limit}) "
+        "ORDER BY recorded_at, id",
+        params,
+    ).fetchall()
+    runs = [dict(row) for row in rows]
+    by_id = {run["id"]: run for run in runs}
+    for run in runs:
+        run["phases"] = {}
+    if by_id:
+        marks = ", ".join("?" * len(by_id))
+        for row in connection.execute(f"SELECT * FROM phases WHERE run_id IN ({marks})", list(by_id)):
+            by_id[row["run_id"]]["phases"][row["phase"]] = row["seconds"]
+    return runs
+
+
+def phase_summary(connection: sqlite3.Connection, codebase: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Per codebase, fingerprint and phase: run count and mean, min and max seconds."""
+    where = "WHERE runs.codebase = ?" if codebase else ""
+    rows = connection.execute(
+        "SELECT runs.codebase, runs.fingerprint, phases.phase, COUNT(*) AS runs, "
+        "AVG(phases.seconds) AS mean, MIN(phases.seconds) AS min, MAX(phases.seconds) AS max "
+        f"FROM phases JOIN runs ON runs.id = phases.run_id {where} "
+        "GROUP BY runs.codebase, runs.fingerprint, phases.phase "
+        "ORDER BY runs.codebase, runs.fingerprint, phases.phase",
+        [codebase] if codebase else [],
+    ).fetchall()
+    return [dict(row) for row in rows]
+
+
+def print_runs(runs: List[Dict[str, Any]], phase: Optional[str] = None) -> None:
+    """Print one row per run; with ``phase``, only that phase's time."""
+    phases = [phase] if phase else sorted({name for run in runs for name in run["phases"]})
+    header = f"{'id':>5} {'recorded':<19} {'codebase':<12} {'label':<10} {'total s':>8} " + " ".join(
+        f"{name[:10]:>10}" for name in phases
+    )
+    print(header)
+    print("-" * len(header))
+    for run in runs:
+        recorded = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(run["recorded_at"]))
+        total = f"{run['total_seconds']:.2f}" if run["total_seconds"] is not None else "-"
+        cells = " ".join(
+            f"{run['phases'][name]:>10.2f}" if name in run["phases"] else f"{'-':>10}" for name in phases
+        )
+        print(f"{run['id']:>5} {recorded:<19} {run['codebase']:<12} {run['label'][:10]:<10} {total:>8} {cells}")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB, help="history database (default: %(default)s)")
+    commands = parser.add_subparsers(dest="command_name", required=True)
+
+    run = commands.add_parser("record", help="run the checker and store its statistics")
+    run.add_argument("codebase", type=Path, help="codebase directory, e.g. sample-code/large")
+    run.add_argument(
+        "--checker",
+        default=DEFAULT_CHECKER,
+        metavar="COMMAND",
+        help="checker command printing --stats or --verbose output; {path} is the codebase (default: %(default)r)",
+    )
+    run.add_argument("--repeats", type=int, default=1, help="runs to record (default: %(default)s)")
+    run.add_argument("--label", default="", help="free-form tag stored with the runs, e.g. a branch or commit")
+
+    load = commands.add_parser("import", help="store statistics from saved checker output")
+    load.add_argument("outputs", nargs="+", metavar="FILE", help="saved output files ('-' for stdin)")
+    load.add_argument("--codebase", type=Path, required=True, help="codebase the output was produced on")
+    load.add_argument("--label", default="", help="free-form tag stored with the runs")
+
+    show = commands.add_parser("parse", help="print the statistics parsed from saved checker output as JSON")
+    show.add_argument("output", metavar="FILE", help="saved output file ('-' for stdin)")
+
+    query = commands.add_parser("query", help="list stored runs")
+    query.add_argument("--codebase", help="only runs of this codebase (directory name)")
+    query.add_argument("--label", help="only runs with this label")
+    query.add_argument("--fingerprint", help="only runs with this environment fingerprint")
+    query.add_argument("--phase", help="only show this phase, e.g. check")
+    query.add_argument("--last", type=int, help="only the N most recent runs")
+    query.add_argument("--json", action="store_true", help="print the runs as JSON")
+
+    summary = commands.add_parser("summary", help="aggregate phase timings per codebase and fingerprint")
+    summary.add_argument("--codebase", help="only this codebase (directory name)")
+
+    args = parser.parse_args(argv)
+    if args.command_name == "record" and args.repeats < 1:
+        parser.error("--repeats must be positive")
+    return args
+
+
+def _read(name: str) -> str:
+    return sys.stdin.read() if name == "-" else Path(name).read_text()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Record, import or query checker statistics."""
+    args = parse_args(argv)
+    if args.command_name == "parse":
+        print(json.dumps(asdict(parse_output(_read(args.output))), indent=1))
+        return
+
+    connection = connect(args.db)
+    if args.command_name == "record":
+        ids = list(record(connection, args.codebase, args.checker, args.repeats, args.label))
+        print_runs(query_runs(connection, last=len(ids)))
+    elif args.command_name == "import":
+        ids = [store_run(connection, parse_output(_read(output)), args.codebase, args.label) for output in args.outputs]
+        print(f"Stored {len(ids)} run(s) in {args.db}")
+    elif args.command_name == "query":
+        runs = query_runs(connection, args.codebase, args.label, args.fingerprint, args.last)
+        if args.json:
+            print(json.dumps(runs, indent=1))
+        else:
+            print_runs(runs, args.phase)
+    else:
+        rows = phase_summary(connection, args.codebase)
+        header = (
+            f"{'codebase':<12} {'fingerprint':<16} {'phase':<18} {'runs':>5} "
+            f"{'mean s':>8} {'min s':>8} {'max s':>8}"
+        )
+        print(header)
+        print("-" * len(header))
+        for row in rows:
+            print(
+                f"{row['codebase']:<12} {row['fingerprint']:<16} {row['phase']:<18} {row['runs']:>5} "
+                f"{row['mean']:>8.3f} {row['min']:>8.3f} {row['max']:>8.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
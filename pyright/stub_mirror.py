@@ -0,0 +1,161 @@
+"""
+``.pyi`` stubs of generated files for generate_sample_code.py.
+
+``to_stub`` strips a rendered file down to its interface, the way a
+package that ships stubs presents itself to a checker:
+
+- function and method bodies (docstrings included) become ``...`` on the
+  signature line
+- the implementation after a run of ``@overload`` signatures is dropped
+- class attribute defaults become ``...``
+- module-level annotated variables lose their value, except type aliases
+  and ``__all__``
+- module-level variables assigned from a call are annotated with the
+  call's return type where it is known (``logger: logging.Logger``) and
+  dropped otherwise; typing constructors such as ``TypeVar`` stay
+- top-level imports only the stripped bodies used are removed
+
+Decorators, class docstrings, ``if TYPE_CHECKING:`` blocks and other
+module-level assignments (aliases, constants) are kept as they are. Edits are made on the source text, so formatting and
+annotation syntax survive unchanged.
+"""
+
+import ast
+import re
+from typing import List, Optional, Set, Tuple
+
+# Which files a generated module becomes: the .py file only, the .py file
+# and its stub, or the stub only
+STUB_MODES = ["none", "alongside", "instead"]
+
+STUB_SUFFIX = ".pyi"
+
+# An edit: (first line, first column, last line, end column, replacement),
+# lines 1-based and columns 0-based as in ast
+_Edit = Tuple[int, int, int, int, str]
+
+# Calls whose result is part of a module's typed interface, kept in stubs
+TYPING_CONSTRUCTORS = {"TypeVar", "ParamSpec", "TypeVarTuple", "NewType", "NamedTuple", "TypedDict"}
+
+# Return types of calls that module variables are assigned from
+CALL_TYPES = {"logging.getLogger": "logging.Logger"}
+
+
+def _is_overload(node: ast.stmt) -> bool:
+    return isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and any(
+        (isinstance(decorator, ast.Name) and decorator.id == "overload")
+        or (isinstance(decorator, ast.Attribute) and decorator.attr == "overload")
+        for decorator in node.decorator_list
+    )
+
+
+def _keeps_value(node: ast.AnnAssign) -> bool:
+    """Whether a module-level annotated assignment keeps its value in a stub."""
+    annotation = node.annotation
+    name = annotation.id if isinstance(annotation, ast.Name) else getattr(annotation, "attr", "")
+    return name == "TypeAlias" or (isinstance(node.target, ast.Name) and node.target.id == "__all__")
+
+
+def _call_edit(node: ast.Assign, call: ast.Call) -> Optional[_Edit]:
+    """Edit of a module-level assignment from ``call``: an annotation, the line dropped, or None to keep it."""
+    func = ast.unparse(call.func)
+    if func.rsplit(".", 1)[-1] in TYPING_CONSTRUCTORS:
+        return None
+    target = node.targets[0]
+    if func in CALL_TYPES and len(node.targets) == 1 and isinstance(target, ast.Name):
+        return (target.end_lineno or target.lineno, target.end_col_offset or 0, call.end_lineno or call.lineno,
+                call.end_col_offset or 0, f": {CALL_TYPES[func]}")
+    return (node.lineno, 0, node.end_lineno or node.lineno, -1, "")
+
+
+def _stub_edits(body: List[ast.stmt], in_class: bool) -> List[_Edit]:
+    edits: List[_Edit] = []
+    for position, node in enumerate(body):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            previous = body[position - 1] if position else None
+            if (
+                previous is not None
+                and not _is_overload(node)
+                and _is_overload(previous)
+                and getattr(previous, "name", None) == node.name
+            ):
+                start = node.decorator_list[0].lineno if node.decorator_list else node.lineno
+                edits.append((start, 0, node.end_lineno or node.lineno, -1, ""))
+                continue
+            first, last = node.body[0], node.body[-1]
+            edits.append((first.lineno, first.col_offset, last.end_lineno or last.lineno, -1, "..."))
+        elif isinstance(node, ast.ClassDef):
+            edits.extend(_stub_edits(node.body, in_class=True))
+        elif isinstance(node, ast.If):
+            edits.extend(_stub_edits(node.body, in_class))
+            edits.extend(_stub_edits(node.orelse, in_class))
+        elif isinstance(node, ast.AnnAssign) and node.value is not None:
+            value = node.value
+            if in_class:
+                edits.append((value.lineno, value.col_offset, value.end_lineno or value.lineno,
+                              value.end_col_offset or 0, "..."))
+            elif not _keeps_value(node):
+                annotation = node.annotation
+                edits.append((annotation.end_lineno or annotation.lineno, annotation.end_col_offset or 0,
+                              value.end_lineno or value.lineno, value.end_col_offset or 0, ""))
+        elif isinstance(node, ast.Assign) and isinstance(node.value, ast.Call) and not in_class:
+            edit = _call_edit(node, node.value)
+            if edit is not None:
+                edits.append(edit)
+    return edits
+
+
+def _prune_imports(stub: str) -> str:
+    """Drop top-level imports whose names a stub no longer mentions.
+
+    ``__future__`` and star imports, and ``X as X`` re-exports, stay. A name
+    is used if code references it, or a string other than a docstring
+    (a forward reference, an ``__all__`` entry) mentions it.
+    """
+    tree = ast.parse(stub)
+    lines = stub.split("\n")
+    imports = [node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+    docstrings = {
+        id(node.value) for node in ast.walk(tree) if isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant)
+    }
+    used: Set[str] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load):
+            used.add(node.id)
+        elif isinstance(node, ast.Constant) and isinstance(node.value, str) and id(node) not in docstrings:
+            used.update(re.findall(r"[A-Za-z_]\w*", node.value))
+    for node in reversed(imports):
+        if isinstance(node, ast.ImportFrom) and node.module == "__future__":
+            continue
+        kept = [
+            alias for alias in node.names
+            if alias.name == "*"
+            or alias.asname == alias.name
+            or (alias.asname or alias.name).split(".")[0] in used
+        ]
+        if len(kept) == len(node.names):
+            continue
+        node.names = kept
+        replacement = [ast.unparse(node)] if kept else []
+        lines[node.lineno - 1:node.end_lineno] = replacement
+    return "\n".join(lines)
+
+
+def to_stub(content: str) -> str:
+    """Return the ``.pyi`` stub of a generated Python source."""
+    tree = ast.parse(content)
+    lines = content.split("\n")
+    # Columns are UTF-8 byte offsets, so edit encoded lines
+    encoded = [line.encode() for line in lines]
+    for first, first_col, last, end_col, replacement in sorted(_stub_edits(tree.body, False), reverse=True):
+        head = encoded[first - 1][:first_col]
+        tail = b"" if end_col < 0 else encoded[last - 1][end_col:]
+        if not replacement and end_col < 0:
+            # A dropped definition: remove its lines entirely
+            encoded[first - 1:last] = []
+        else:
+            encoded[first - 1:last] = [head + replacement.encode() + tail]
+    stub = "\n".join(line.decode() for line in encoded)
+    # def f() -> int: ... on one line, as stubs are written
+    stub = re.sub(r":\n[ \t]+\.\.\.$", ": ...", stub, flags=re.M)
+    return re.sub(r"\n{4,}", "\n\n\n", _prune_imports(stub))
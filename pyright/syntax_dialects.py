@@ -0,0 +1,492 @@
+"""
+Annotation syntax dialects for generate_sample_code.py.
+
+The base templates mix ``typing.List``/``Dict``/``Optional`` with
+``dict[str, Any]``. ``to_dialect`` rewrites a rendered file into one
+consistent style, so the same logical corpus can be checked in each:
+
+- typing: legacy ``typing`` aliases (``List[int]``, ``Optional[str]``,
+  ``Union[A, B]``)
+- builtins: PEP 585 builtin generics and PEP 604 unions (``list[int]``,
+  ``str | None``), with ``Callable`` and friends from ``collections.abc``
+- pep695: builtins plus PEP 695 type parameter syntax (``class Box[T]:``,
+  ``def first[T](...)``) and ``type`` aliases; check it with
+  ``--pythonversion 3.12``. Tools that parse the corpus themselves
+  (edit_trace.py, stacked_branches.py) need Python 3.12 to run on it
+
+``mixed`` leaves files as rendered. Only annotations, type alias values,
+class bases and subscripted generics are rewritten, so code and comments
+are untouched. A builtin shadowed by a class member (such as a ``list``
+method) keeps its ``typing`` alias inside that class.
+"""
+
+import ast
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+DIALECTS = ["mixed", "typing", "builtins", "pep695"]
+
+TYPING_GENERICS = {
+    "List": "list",
+    "Dict": "dict",
+    "Tuple": "tuple",
+    "Set": "set",
+    "FrozenSet": "frozenset",
+    "Type": "type",
+}
+BUILTIN_GENERICS = {builtin: alias for alias, builtin in TYPING_GENERICS.items()}
+
+# typing aliases that PEP 585 moves to collections.abc
+ABC_NAMES = {
+    "AsyncIterable", "AsyncIterator", "Awaitable", "Callable", "Coroutine", "Generator",
+    "Iterable", "Iterator", "Mapping", "MutableMapping", "MutableSequence", "Sequence",
+}
+
+# Type parameter declarations, by the call that defines them old-style
+TYPE_PARAM_PREFIXES = {"TypeVar": "", "ParamSpec": "**", "TypeVarTuple": "*"}
+
+# (start, end, replacement) character spans
+Edit = Tuple[int, int, str]
+
+
+class _Source:
+    """Source text with character offsets for ast positions."""
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.lines = text.splitlines(keepends=True)
+        self.starts = [0]
+        for line in self.lines:
+            self.starts.append(self.starts[-1] + len(line))
+
+    def offset(self, lineno: int, col: int) -> int:
+        # ast columns count UTF-8 bytes
+        line = self.lines[lineno - 1] if lineno <= len(self.lines) else ""
+        return self.starts[lineno - 1] + len(line.encode()[:col].decode())
+
+    def span(self, node: ast.AST) -> Tuple[int, int]:
+        return (
+            self.offset(node.lineno, node.col_offset),
+            self.offset(node.end_lineno, node.end_col_offset),
+        )
+
+    def segment(self, node: ast.AST) -> str:
+        start, end = self.span(node)
+        return self.text[start:end]
+
+
+def _apply(text: str, edits: List[Edit]) -> str:
+    for start, end, replacement in sorted(edits, reverse=True):
+        text = text[:start] + replacement + text[end:]
+    return text
+
+
+def _is_string(node: ast.expr) -> bool:
+    return isinstance(node, ast.Constant) and isinstance(node.value, str)
+
+
+def _subscript_args(node: ast.Subscript) -> List[ast.expr]:
+    return list(node.slice.elts) if isinstance(node.slice, ast.Tuple) else [node.slice]
+
+
+def _union_members(node: ast.expr) -> List[ast.expr]:
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.BitOr):
+        return _union_members(node.left) + _union_members(node.right)
+    return [node]
+
+
+def _names(nodes: Iterable[ast.AST]) -> List[str]:
+    """Names referenced by ``nodes`` in order, including inside string annotations."""
+    found: List[str] = []
+    for root in nodes:
+        for node in ast.walk(root):
+            if isinstance(node, ast.Name):
+                found.append(node.id)
+            elif _is_string(node):
+                found.extend(_string_names(node.value))
+    return found
+
+
+@lru_cache(maxsize=4096)
+def _string_names(value: str) -> Tuple[str, ...]:
+    """Names in a string annotation; none for docstrings and other text."""
+    try:
+        return tuple(_names([ast.parse(value, mode="eval")]))
+    except SyntaxError:
+        return ()
+
+
+def _class_members(node: ast.ClassDef) -> Set[str]:
+    members: Set[str] = set()
+    for stmt in node.body:
+        if isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            members.add(stmt.name)
+        elif isinstance(stmt, ast.AnnAssign) and isinstance(stmt.target, ast.Name):
+            members.add(stmt.target.id)
+        elif isinstance(stmt, ast.Assign):
+            members.update(target.id for target in stmt.targets if isinstance(target, ast.Name))
+    return members
+
+
+def _signature(node: Union[ast.FunctionDef, ast.AsyncFunctionDef]) -> List[ast.expr]:
+    args = node.args
+    params = args.posonlyargs + args.args + args.kwonlyargs
+    params += [arg for arg in (args.vararg, args.kwarg) if arg is not None]
+    annotations = [param.annotation for param in params if param.annotation is not None]
+    return annotations + ([node.returns] if node.returns is not None else [])
+
+
+def _alias_value(stmt: ast.stmt) -> Optional[Tuple[str, ast.expr]]:
+    """``(name, value)`` of a module-level type alias statement, else None."""
+    if isinstance(stmt, ast.AnnAssign) and isinstance(stmt.target, ast.Name) and stmt.value is not None:
+        if isinstance(stmt.annotation, ast.Name) and stmt.annotation.id == "TypeAlias":
+            return stmt.target.id, stmt.value
+    if isinstance(stmt, ast.Assign) and len(stmt.targets) == 1 and isinstance(stmt.targets[0], ast.Name):
+        value = stmt.value
+        if isinstance(value, ast.Subscript) and isinstance(value.value, ast.Name):
+            if value.value.id in ("Union", "Optional"):
+                return stmt.targets[0].id, value
+        if isinstance(value, ast.BinOp) and isinstance(value.op, ast.BitOr):
+            members = _union_members(value)
+            if all(isinstance(member, (ast.Name, ast.Attribute, ast.Subscript)) or
+                   (isinstance(member, ast.Constant) and member.value is None) for member in members):
+                return stmt.targets[0].id, value
+    return None
+
+
+class _AnnotationRewriter:
+    """Rewrite every type expression of a module to builtin or typing generics."""
+
+    def __init__(self, source: _Source, modern: bool) -> None:
+        self.source = source
+        self.modern = modern
+        self.edits: List[Edit] = []
+        # typing names the legacy rewrite introduced
+        self.introduced: Set[str] = set()
+
+    def convert(self, node: ast.expr, shadowed: Set[str]) -> str:
+        """Text of type expression ``node`` in the target dialect."""
+        text = self.source.segment(node)
+        if isinstance(node, ast.Subscript):
+            args = _subscript_args(node)
+            head = self.source.segment(node.value)
+            if head in ("Literal", "typing.Literal"):
+                return text
+            if self.modern and head in ("Optional", "Union") and not any(_is_string(arg) for arg in args):
+                members = [self.convert(arg, shadowed) for arg in args]
+                return self.union(members + (["None"] if head == "Optional" else []), node)
+            new_head = head
+            if self.modern and head in TYPING_GENERICS and TYPING_GENERICS[head] not in shadowed:
+                new_head = TYPING_GENERICS[head]
+            elif not self.modern and head in BUILTIN_GENERICS:
+                new_head = BUILTIN_GENERICS[head]
+                self.introduced.add(new_head)
+            converted = [self.convert(arg, shadowed) for arg in args]
+            if new_head == head and all(new == self.source.segment(arg) for new, arg in zip(converted, args)):
+                return text
+            return f"{new_head}[{', '.join(converted) if args else '()'}]"
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.BitOr):
+            originals = _union_members(node)
+            members = [self.convert(member, shadowed) for member in originals]
+            if not self.modern:
+                return self.legacy_union(members)
+            if members == [self.source.segment(member) for member in originals]:
+                return text
+            return self.union(members, node)
+        if isinstance(node, ast.List):
+            converted = [self.convert(element, shadowed) for element in node.elts]
+            if all(new == self.source.segment(old) for new, old in zip(converted, node.elts)):
+                return text
+            return f"[{', '.join(converted)}]"
+        return text
+
+    def union(self, members: List[str], node: ast.expr) -> str:
+        if node.lineno == node.end_lineno:
+            return " | ".join(members)
+        return "(\n    " + "\n    | ".join(members) + "\n)"
+
+    def legacy_union(self, members: List[str]) -> str:
+        rest = [member for member in members if member != "None"]
+        if len(rest) == 1 and len(members) == 2:
+            self.introduced.add("Optional")
+            return f"Optional[{rest[0]}]"
+        self.introduced.add("Union")
+        return f"Union[{', '.join(members)}]"
+
+    def root(self, node: Optional[ast.expr], shadowed: Set[str]) -> None:
+        """Rewrite type expression ``node`` in place."""
+        if node is None:
+            return
+        new = self.convert(node, shadowed)
+        if new != self.source.segment(node):
+            start, end = self.source.span(node)
+            self.edits.append((start, end, new))
+
+    def visit(self, node: ast.AST, shadowed: Set[str], module_level: bool = False) -> None:
+        if isinstance(node, ast.ClassDef):
+            for child in node.decorator_list + [keyword.value for keyword in node.keywords]:
+                self.visit(child, shadowed)
+            for base in node.bases:
+                self.root(base, shadowed)
+            members = shadowed | _class_members(node)
+            for stmt in node.body:
+                self.visit(stmt, members)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            for child in node.decorator_list + node.args.defaults + [
+                default for default in node.args.kw_defaults if default is not None
+            ]:
+                self.visit(child, shadowed)
+            for annotation in _signature(node):
+                self.root(annotation, shadowed)
+            for stmt in node.body:
+                self.visit(stmt, set())
+        elif isinstance(node, ast.AnnAssign):
+            self.root(node.annotation, shadowed)
+            if node.value is not None:
+                if module_level and _alias_value(node):
+                    self.root(node.value, shadowed)
+                else:
+                    self.visit(node.value, shadowed)
+        elif module_level and isinstance(node, ast.Assign) and _alias_value(node):
+            self.root(node.value, shadowed)
+        elif isinstance(node, ast.Call) and isinstance(node.func, ast.Subscript):
+            # Instantiation such as list[int](): only List[int]() is an error
+            for child in [node.func.slice, *node.args, *[keyword.value for keyword in node.keywords]]:
+                self.visit(child, shadowed)
+        elif (
+            isinstance(node, ast.Subscript)
+            and isinstance(node.value, ast.Name)
+            and node.value.id in {"Optional", "Union", *TYPING_GENERICS, *BUILTIN_GENERICS}
+        ):
+            self.root(node, shadowed)
+        else:
+            for child in ast.iter_child_nodes(node):
+                self.visit(child, shadowed)
+
+
+def _type_param(call: ast.Call, source: _Source) -> Optional[str]:
+    """PEP 695 declaration of an old-style TypeVar/ParamSpec/TypeVarTuple call."""
+    name = call.args[0].value
+    prefix = TYPE_PARAM_PREFIXES[call.func.id]
+    bound = ""
+    if len(call.args) > 1:
+        bound = "(" + ", ".join(source.segment(arg) for arg in call.args[1:]) + ")"
+    for keyword in call.keywords:
+        if keyword.arg == "bound":
+            bound = keyword.value.value if _is_string(keyword.value) else source.segment(keyword.value)
+        elif keyword.arg not in ("covariant", "contravariant", "infer_variance"):
+            return None
+    return f"{prefix}{name}: {bound}" if bound else f"{prefix}{name}"
+
+
+def _pep695(text: str) -> str:
+    """Replace old-style TypeVars and TypeAlias assignments with PEP 695 syntax."""
+    source = _Source(text)
+    tree = ast.parse(text)
+    declarations: Dict[str, str] = {}
+    definitions: Dict[str, ast.stmt] = {}
+    for stmt in tree.body:
+        if (
+            isinstance(stmt, ast.Assign)
+            and len(stmt.targets) == 1
+            and isinstance(stmt.targets[0], ast.Name)
+            and isinstance(stmt.value, ast.Call)
+            and isinstance(stmt.value.func, ast.Name)
+            and stmt.value.func.id in TYPE_PARAM_PREFIXES
+            and stmt.value.args
+            and _is_string(stmt.value.args[0])
+            and stmt.value.args[0].value == stmt.targets[0].id
+        ):
+            declaration = _type_param(stmt.value, source)
+            if declaration is not None:
+                declarations[stmt.targets[0].id] = declaration
+                definitions[stmt.targets[0].id] = stmt
+
+    aliases = {stmt: alias for stmt in tree.body for alias in [_alias_value(stmt)] if alias}
+    if not declarations and not aliases:
+        return text
+    # Aliases used as runtime values (isinstance, calls) must stay assignments
+    runtime: Set[str] = set()
+    for stmt in tree.body:
+        if stmt not in aliases:
+            for node in ast.walk(stmt):
+                if isinstance(node, ast.Call):
+                    runtime.update(arg.id for arg in [node.func, *node.args] if isinstance(arg, ast.Name))
+    edits: List[Edit] = []
+    unbound: Set[str] = set()
+    # References to typing names, and how many of them the edits remove
+    references = Counter(node.id for node in ast.walk(tree) if isinstance(node, ast.Name))
+    removed: Counter = Counter()
+
+    def free(nodes: Iterable[ast.AST], bound: Set[str]) -> List[str]:
+        params: List[str] = []
+        for name in _names(nodes):
+            if name in declarations and name not in bound and name not in params:
+                params.append(name)
+        return params
+
+    def brackets(params: List[str]) -> str:
+        return "[" + ", ".join(declarations[param] for param in params) + "]" if params else ""
+
+    def visit(node: ast.AST, bound: Set[str]) -> None:
+        if isinstance(node, ast.ClassDef):
+            generic = [
+                base for base in node.bases
+                if isinstance(base, ast.Subscript) and isinstance(base.value, ast.Name)
+                and base.value.id in ("Generic", "Protocol")
+            ]
+            params = (
+                [name for name in free([generic[0].slice], bound)]
+                if generic else free(node.bases, bound)
+            )
+            if params:
+                bases = [
+                    "Protocol" if base in generic and base.value.id == "Protocol" else source.segment(base)
+                    for base in node.bases
+                    if not (base in generic and base.value.id == "Generic")
+                ]
+                bases += [source.segment(keyword) for keyword in node.keywords]
+                removed["Generic"] += sum(base.value.id == "Generic" for base in generic)
+                start = source.offset(node.lineno, node.col_offset)
+                tail = max((source.span(item)[1] for item in node.bases + node.keywords), default=start)
+                end = text.index(":", tail) + 1
+                header = f"class {node.name}{brackets(params)}"
+                edits.append((start, end, header + (f"({', '.join(bases)}):" if bases else ":")))
+            for child in node.decorator_list:
+                visit(child, bound)
+            for stmt in node.body:
+                visit(stmt, bound | set(params))
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            params = free(_signature(node), bound)
+            if params:
+                start = source.offset(node.lineno, node.col_offset)
+                match = re.compile(rf"(async\s+)?def\s+{node.name}\b").search(text, start)
+                edits.append((match.end(), match.end(), brackets(params)))
+            for child in node.decorator_list + node.args.defaults:
+                visit(child, bound)
+            inner = bound | set(params)
+            for child in _signature(node) + node.body:
+                visit(child, inner)
+        elif isinstance(node, ast.Name) or _is_string(node):
+            unbound.update(name for name in _names([node]) if name in declarations and name not in bound)
+        else:
+            for child in ast.iter_child_nodes(node):
+                visit(child, bound)
+
+    for stmt in tree.body:
+        if stmt in definitions.values():
+            continue
+        alias = aliases.get(stmt)
+        if alias and alias[0] not in runtime:
+            name, value = alias
+            params = free([value], set())
+            target = stmt.annotation if isinstance(stmt, ast.AnnAssign) else stmt.targets[0]
+            equals = text.index("=", source.span(target)[1]) + 1
+            edits.append((source.span(stmt)[0], equals, f"type {name}{brackets(params)} ="))
+            removed["TypeAlias"] += isinstance(stmt, ast.AnnAssign)
+            visit(value, set(params))
+        else:
+            visit(stmt, set())
+
+    for name, stmt in definitions.items():
+        if name not in unbound:
+            start, end = source.span(stmt)
+            edits.append((start, end + (text[end:end + 1] == "\n"), ""))
+            removed[stmt.value.func.id] += 1
+    if not edits:
+        return text
+    # Collapse the blank lines left behind by removed TypeVar definitions
+    result = re.sub(r"\n{4,}", "\n\n\n", _apply(text, edits))
+    # The result may not parse before Python 3.12, so unused imports are
+    # found by counting the references the edits removed
+    return _prune_typing(result, {name for name, count in removed.items() if 0 < count == references[name]})
+
+
+def _prune_typing(text: str, dropped: Set[str]) -> str:
+    """Remove ``dropped`` names from the module's ``from typing import`` line."""
+    match = re.search(r"^from typing import (.+)\n", text, re.MULTILINE)
+    if match is None or not dropped:
+        return text
+    names = [name for name in match.group(1).split(", ") if name not in dropped]
+    line = f"from typing import {', '.join(names)}\n" if names else ""
+    return text[:match.start()] + line + text[match.end():]
+
+
+def _import_nodes(tree: ast.Module, module: str) -> List[ast.ImportFrom]:
+    return [stmt for stmt in tree.body if isinstance(stmt, ast.ImportFrom) and stmt.module == module]
+
+
+def _rewrite_imports(text: str, used_before: Set[str], modern: bool, introduced: Set[str]) -> str:
+    """Drop typing imports the rewrite made unused, add the ones it needs.
+
+    Imports that were already unused are kept. Modern dialects import
+    ``Callable`` and friends from ``collections.abc``; the legacy dialect
+    from ``typing``.
+    """
+    source = _Source(text)
+    tree = ast.parse(text)
+    used = set(_names([tree]))
+    typing_nodes = _import_nodes(tree, "typing")
+    abc_nodes = _import_nodes(tree, "collections.abc")
+
+    def kept(node: ast.ImportFrom) -> List[str]:
+        return [
+            alias.name if alias.asname is None else f"{alias.name} as {alias.asname}"
+            for alias in node.names
+            if alias.asname or alias.name in used or alias.name not in used_before
+        ]
+
+    typing_names = [name for node in typing_nodes[:1] for name in kept(node)]
+    abc_names = [name for node in abc_nodes[:1] for name in kept(node)]
+    if modern:
+        abc_names += [name for name in typing_names if name in ABC_NAMES and name not in abc_names]
+        typing_names = [name for name in typing_names if name not in ABC_NAMES]
+    else:
+        typing_names += [name for name in abc_names if name not in typing_names]
+        abc_names = []
+        typing_names += sorted(name for name in introduced if name not in typing_names)
+
+    lines = []
+    if typing_names:
+        lines.append(f"from typing import {', '.join(typing_names)}")
+    if abc_names:
+        lines.append(f"from collections.abc import {', '.join(abc_names)}")
+    replacement = "\n".join(lines)
+
+    existing = typing_nodes[:1] + abc_nodes[:1]
+    if existing and replacement == "\n".join(source.segment(node) for node in existing):
+        return text
+    edits: List[Edit] = []
+    if existing:
+        first = min(existing, key=lambda node: node.lineno)
+        for node in existing:
+            start, end = source.span(node)
+            if node is first:
+                edits.append((start, end, replacement))
+            else:
+                edits.append((start, end + (text[end:end + 1] == "\n"), ""))
+    elif replacement:
+        anchor = [
+            stmt for stmt in tree.body
+            if (isinstance(stmt, ast.ImportFrom) and stmt.module == "__future__")
+            or (isinstance(stmt, ast.Expr) and _is_string(stmt.value) and stmt is tree.body[0])
+        ]
+        position = source.span(anchor[-1])[1] + 1 if anchor else 0
+        edits.append((position, position, replacement + "\n"))
+    return _apply(text, edits)
+
+
+def to_dialect(content: str, dialect: str) -> str:
+    """Rewrite a generated file's annotations into ``dialect`` (see DIALECTS)."""
+    if dialect == "mixed":
+        return content
+    modern = dialect != "typing"
+    tree = ast.parse(content)
+    rewriter = _AnnotationRewriter(_Source(content), modern)
+    for stmt in tree.body:
+        rewriter.visit(stmt, set(), module_level=True)
+    text = _apply(content, rewriter.edits)
+    text = _rewrite_imports(text, set(_names([tree])), modern, rewriter.introduced)
+    return _pep695(text) if dialect == "pep695" else text
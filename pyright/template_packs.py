@@ -0,0 +1,858 @@
+"""
+Checker-hotspot template packs for generate_sample_code.py.
+
+The base TEMPLATES are cheap, boilerplate-level code. Each pack here
+renders one file kind aimed at an expensive path in the type checker:
+
+- generics: deeply nested generic classes over many TypeVars
+- overloads: heavily @overload-ed functions and union-expanding call sites
+- unions: large Literal types and discriminated unions
+- recursive: recursive and mutually recursive type aliases
+- wide_typeddict: TypedDicts with hundreds of keys
+- narrowing: long functions of nested if/match/try/loop blocks that
+  narrow a union with isinstance, TypeGuard, pattern matching and walrus
+- hierarchy: chains of diamond inheritance, and concrete classes checked
+  against the Repository/Cache/EventHandler protocols of another module
+
+Every renderer takes an ``intensity`` (1 = light) that scales the number
+of type parameters, overloads, union members, alias levels or keys, so
+the benchmark can show how checking time grows with each feature. Some
+packs accept extra integer options (see PACK_OPTIONS).
+"""
+
+import random
+from typing import Callable, Dict, List, Optional, Tuple
+
+# (module name, class name, intensity, **options) -> file content
+Renderer = Callable[..., str]
+
+# Concrete types cycled through where a pack needs distinct types, with a
+# literal value of each
+CONCRETE_TYPES = [
+    ("int", "0"),
+    ("str", '""'),
+    ("float", "0.0"),
+    ("bytes", 'b""'),
+    ("bool", "False"),
+    ("list[int]", "list[int]()"),
+    ("dict[str, int]", "dict[str, int]()"),
+    ("tuple[int, str]", '(0, "")'),
+    ("set[str]", "set[str]()"),
+    ("int | None", "None"),
+]
+
+
+def _lower(class_name: str) -> str:
+    return class_name.lower()
+
+
+def render_generics(module: str, class_name: str, intensity: int) -> str:
+    """Generic boxes over ``4 + 2 * intensity`` TypeVars, nested ``2 * intensity`` deep."""
+    arity = 4 + 2 * intensity
+    depth = 2 * intensity
+    params = [f"T{i}" for i in range(arity)]
+    rotated = params[1:] + params[:1]
+    signature = ", ".join(params)
+
+    lines: List[str] = [
+        f'"""Generic containers for {module} (generics pack, intensity {intensity})."""',
+        "from typing import Callable, Generic, TypeVar",
+        "",
+        "",
+    ]
+    lines.extend(f'{param} = TypeVar("{param}")' for param in params)
+    lines.append('R = TypeVar("R")')
+    lines.append("")
+
+    values = ", ".join(f"v{i}: {param}" for i, param in enumerate(params))
+    lines.extend([
+        "",
+        f"class {class_name}Box0(Generic[{signature}]):",
+        '    """Innermost box holding one value per type parameter."""',
+        "",
+        f"    def __init__(self, {values}) -> None:",
+        f"        self.values = ({', '.join(f'v{i}' for i in range(arity))},)",
+        "",
+        f"    def first(self) -> T0:",
+        '        """Value of the first type parameter."""',
+        "        return self.values[0]",
+        "",
+        f'    def rotate(self) -> "{class_name}Box0[{", ".join(rotated)}]":',
+        '        """Shift every value one type parameter to the left."""',
+        f"        return {class_name}Box0("
+        + ", ".join(f"self.values[{(i + 1) % arity}]" for i in range(arity))
+        + ")",
+        "",
+        f'    def map_first(self, fn: Callable[[T0], R]) -> "{class_name}Box0[{", ".join(["R"] + params[1:])}]":',
+        '        """Apply ``fn`` to the first value."""',
+        f"        return {class_name}Box0(fn(self.values[0]), "
+        + ", ".join(f"self.values[{i}]" for i in range(1, arity))
+        + ")",
+    ])
+
+    for level in range(1, depth + 1):
+        inner = f"{class_name}Box{level - 1}"
+        lines.extend([
+            "",
+            "",
+            f"class {class_name}Box{level}(Generic[{signature}]):",
+            f'    """Box wrapping a {inner}."""',
+            "",
+            f"    def __init__(self, inner: {inner}[{signature}]) -> None:",
+            "        self.inner = inner",
+            "",
+            f"    def first(self) -> T0:",
+            '        """Value of the first type parameter."""',
+            "        return self.inner.first()",
+            "",
+            f"    def unwrap(self) -> {inner}[{signature}]:",
+            '        """The wrapped box."""',
+            "        return self.inner",
+            "",
+            f'    def rotate(self) -> "{class_name}Box{level}[{", ".join(rotated)}]":',
+            '        """Rotate the wrapped box."""',
+            f"        return {class_name}Box{level}(self.inner.rotate())",
+            "",
+            "",
+            f"def index_{level}_{_lower(class_name)}(",
+            f"    box: {class_name}Box{level}[{signature}],",
+            f") -> dict[str, list[tuple[T0, {inner}[{signature}]]]]:",
+            f'    """Index a level-{level} box by its first value."""',
+            '    return {"items": [(box.first(), box.unwrap())]}',
+        ])
+
+    concrete = [CONCRETE_TYPES[i % len(CONCRETE_TYPES)] for i in range(arity)]
+    concrete_args = ", ".join(type_ for type_, _ in concrete)
+    twice = concrete[2:] + concrete[:2]
+    lines.extend([
+        "",
+        "",
+        f"def make_{_lower(class_name)}() -> {class_name}Box{depth}[{concrete_args}]:",
+        f'    """Build a fully nested box of concrete types."""',
+        f"    box0: {class_name}Box0[{concrete_args}] = {class_name}Box0({', '.join(value for _, value in concrete)})",
+    ])
+    for level in range(1, depth + 1):
+        lines.append(f"    box{level} = {class_name}Box{level}(box{level - 1})")
+    lines.extend([
+        f"    return box{depth}",
+        "",
+        "",
+        f"def spin_{_lower(class_name)}() -> {class_name}Box{depth}[{', '.join(type_ for type_, _ in twice)}]:",
+        '    """Rotate a nested box twice, forcing substitution through every level."""',
+        f"    return make_{_lower(class_name)}().rotate().rotate()",
+    ])
+
+    nested = "T0"
+    for level in range(depth):
+        nested = f"list[dict[str, {nested}]]" if level % 2 == 0 else f"dict[str, list[{nested}]]"
+    expression = "value"
+    for level in range(depth):
+        expression = f'[{{"k": {expression}}}]' if level % 2 == 0 else f'{{"k": [{expression}]}}'
+    lines.extend([
+        "",
+        "",
+        f"def nest_{_lower(class_name)}(value: T0) -> {nested}:",
+        '    """Wrap a value in alternating list/dict layers."""',
+        f"    return {expression}",
+        "",
+    ])
+    return "\n".join(lines)
+
+
+def render_overloads(module: str, class_name: str, intensity: int) -> str:
+    """``8 * intensity`` Literal-keyed overloads, called one by one and with unions."""
+    count = 8 * intensity
+    name = f"pick_{_lower(class_name)}"
+    keys = [f"k{i:03d}" for i in range(count)]
+    literal_union = ", ".join(f'"{key}"' for key in keys)
+
+    lines: List[str] = [
+        f'"""Overloaded functions for {module} (overloads pack, intensity {intensity})."""',
+        "from typing import Literal, overload",
+        "",
+    ]
+    for i, key in enumerate(keys):
+        return_type = CONCRETE_TYPES[i % len(CONCRETE_TYPES)][0]
+        lines.extend([
+            "",
+            "@overload",
+            f'def {name}(kind: Literal["{key}"]) -> {return_type}: ...',
+        ])
+    lines.extend([
+        "",
+        "",
+        f"def {name}(kind: str) -> object:",
+        '    """Return a default value for ``kind``."""',
+        "    return kind",
+        "",
+        "",
+        f"class {class_name}Codec:",
+        f'    """Codec with overloaded encode/decode for {_lower(class_name)} values."""',
+    ])
+    for i, key in enumerate(keys):
+        return_type = CONCRETE_TYPES[i % len(CONCRETE_TYPES)][0]
+        lines.extend([
+            "",
+            "    @overload",
+            f'    def decode(self, kind: Literal["{key}"], raw: bytes) -> {return_type}: ...',
+        ])
+    lines.extend([
+        "",
+        "    def decode(self, kind: str, raw: bytes) -> object:",
+        '        """Decode ``raw`` as the type selected by ``kind``."""',
+        "        return raw",
+    ])
+
+    for use in range(intensity):
+        lines.extend([
+            "",
+            "",
+            f"def use_{use}_{_lower(class_name)}(",
+            f"    kind: Literal[{literal_union}],",
+            f"    codec: {class_name}Codec,",
+            ") -> list[object]:",
+            '    """Call every overload directly, then with the whole Literal union."""',
+            "    results: list[object] = [",
+        ])
+        lines.extend(f'        {name}("{key}"),' for key in keys)
+        lines.extend([
+            "    ]",
+            f"    results.append({name}(kind))",
+            '    results.append(codec.decode(kind, b""))',
+            "    return results",
+        ])
+    lines.append("")
+    return "\n".join(lines)
+
+
+def render_unions(module: str, class_name: str, intensity: int) -> str:
+    """A ``50 * intensity``-member Literal and a ``10 * intensity``-way tagged union."""
+    codes = [f"c{i:04d}" for i in range(50 * intensity)]
+    variants = 10 * intensity
+    lower = _lower(class_name)
+
+    lines: List[str] = [
+        f'"""Large unions for {module} (unions pack, intensity {intensity})."""',
+        "from dataclasses import dataclass",
+        "from typing import Literal, Union",
+        "",
+        "",
+        f"{class_name}Code = Literal[",
+    ]
+    lines.extend(f'    "{code}",' for code in codes)
+    lines.append("]")
+
+    for i in range(variants):
+        field_type, default = CONCRETE_TYPES[i % len(CONCRETE_TYPES)]
+        lines.extend([
+            "",
+            "",
+            "@dataclass",
+            f"class {class_name}Variant{i}:",
+            f'    """Variant {i} of the {lower} tagged union."""',
+            "",
+            f'    kind: Literal["v{i}"]',
+            f"    payload: {field_type}",
+        ])
+
+    lines.extend([
+        "",
+        "",
+        f"{class_name}Any = Union[",
+    ])
+    lines.extend(f"    {class_name}Variant{i}," for i in range(variants))
+    lines.extend([
+        "]",
+        "",
+        "",
+        f"def describe_{lower}(value: {class_name}Any) -> str:",
+        '    """Narrow the tagged union on its discriminant."""',
+    ])
+    for i in range(variants):
+        keyword = "if" if i == 0 else "elif"
+        lines.extend([
+            f'    {keyword} value.kind == "v{i}":',
+            f'        return "v{i}:" + repr(value.payload)',
+        ])
+    lines.extend([
+        '    return "unreachable"',
+        "",
+        "",
+        f"def classify_{lower}(code: {class_name}Code) -> int:",
+        '    """Narrow the Literal in chunks of ten members."""',
+    ])
+    for start in range(0, len(codes), 10):
+        chunk = ", ".join(f'"{code}"' for code in codes[start:start + 10])
+        lines.extend([
+            f"    if code in ({chunk}):",
+            f"        return {start // 10}",
+        ])
+    lines.extend([
+        "    return -1",
+        "",
+        "",
+        f"def all_{lower}_codes() -> list[{class_name}Code]:",
+        '    """Every member of the Literal, checked one by one."""',
+        "    return [",
+    ])
+    lines.extend(f'        "{code}",' for code in codes)
+    lines.extend(["    ]", ""])
+    return "\n".join(lines)
+
+
+def render_recursive(module: str, class_name: str, intensity: int) -> str:
+    """A recursive JSON alias and a ring of ``2 * intensity`` mutually recursive aliases."""
+    ring = 2 * intensity
+    lower = _lower(class_name)
+
+    lines: List[str] = [
+        f'"""Recursive type aliases for {module} (recursive pack, intensity {intensity})."""',
+        "from typing import Dict, List, TypeAlias, Union",
+        "",
+        "",
+        f'{class_name}Json: TypeAlias = Union[None, bool, int, float, str, List["{class_name}Json"], Dict[str, "{class_name}Json"]]',
+    ]
+    for i in range(ring):
+        following = f"{class_name}Tree{(i + 1) % ring}"
+        lines.append(
+            f'{class_name}Tree{i}: TypeAlias = Union[int, List["{following}"], Dict[str, "{class_name}Tree{i}"]]'
+        )
+
+    for i in range(ring):
+        following = (i + 1) % ring
+        lines.extend([
+            "",
+            "",
+            f"def depth_{i}_{lower}(node: {class_name}Tree{i}) -> int:",
+            f'    """Depth of a level-{i} tree."""',
+            "    if isinstance(node, int):",
+            "        return 0",
+            "    if isinstance(node, list):",
+            f"        return 1 + max((depth_{following}_{lower}(child) for child in node), default=0)",
+            f"    return 1 + max((depth_{i}_{lower}(child) for child in node.values()), default=0)",
+        ])
+
+    document = "0"
+    for level in range(3 * intensity):
+        document = f'{{"level{level}": [{document}, "leaf", {level}.5, None, True]}}'
+    lines.extend([
+        "",
+        "",
+        f"def walk_{lower}(value: {class_name}Json) -> int:",
+        '    """Count the scalar leaves of a JSON value."""',
+        "    if isinstance(value, list):",
+        f"        return sum(walk_{lower}(item) for item in value)",
+        "    if isinstance(value, dict):",
+        f"        return sum(walk_{lower}(item) for item in value.values())",
+        "    return 1",
+        "",
+        "",
+        f"def document_{lower}() -> {class_name}Json:",
+        f'    """A constant nested {3 * intensity} levels deep, checked against the alias."""',
+        f"    return {document}",
+        "",
+    ])
+    return "\n".join(lines)
+
+
+def render_wide_typeddict(module: str, class_name: str, intensity: int) -> str:
+    """TypedDicts with ``100 * intensity`` keys, built, read and merged in full."""
+    keys = 100 * intensity
+    lower = _lower(class_name)
+    fields = [
+        (f"field_{i:04d}", CONCRETE_TYPES[i % len(CONCRETE_TYPES)])
+        for i in range(keys)
+    ]
+
+    lines: List[str] = [
+        f'"""Wide TypedDicts for {module} (wide_typeddict pack, intensity {intensity})."""',
+        "from typing import NotRequired, TypedDict",
+        "",
+        "",
+        f"class {class_name}Record(TypedDict):",
+        f'    """{keys}-key record."""',
+        "",
+    ]
+    lines.extend(f"    {name}: {type_}" for name, (type_, _) in fields)
+    lines.extend([
+        "",
+        "",
+        f"class {class_name}Patch(TypedDict, total=False):",
+        f'    """Partial update of a {class_name}Record."""',
+        "",
+    ])
+    lines.extend(f"    {name}: {type_}" for name, (type_, _) in fields)
+    lines.extend([
+        "",
+        "",
+        f"class {class_name}Envelope({class_name}Record):",
+        f'    """{class_name}Record with optional envelope metadata."""',
+        "",
+        "    trace_id: NotRequired[str]",
+        "    attempt: NotRequired[int]",
+        "",
+        "",
+        f"def make_{lower}() -> {class_name}Record:",
+        '    """Construct a record, checking every key and value type."""',
+        "    return {",
+    ])
+    lines.extend(f'        "{name}": {value},' for name, (_, value) in fields)
+    lines.extend([
+        "    }",
+        "",
+        "",
+        f"def summarize_{lower}(record: {class_name}Record) -> list[str]:",
+        '    """Read every key."""',
+        "    return [",
+    ])
+    lines.extend(f'        repr(record["{name}"]),' for name, _ in fields)
+    lines.extend([
+        "    ]",
+        "",
+        "",
+        f"def apply_{lower}(record: {class_name}Record, patch: {class_name}Patch) -> {class_name}Envelope:",
+        '    """Merge a patch into a record."""',
+        f"    merged: {class_name}Record = {{**record}}",
+        "    merged.update(patch)",
+        '    return {**merged, "attempt": 1}',
+        "",
+    ])
+    return "\n".join(lines)
+
+
+# Leaf payload types of the narrowing union, with an int-valued use of each
+LEAF_VALUES = [
+    ("int", "{var}.value"),
+    ("str", "len({var}.value)"),
+    ("float", "int({var}.value)"),
+    ("bytes", "len({var}.value)"),
+    ("list[int]", "sum({var}.value)"),
+]
+
+FLOW_CONSTRUCTS = ["isinstance", "typeguard", "match", "try", "loop", "walrus", "while"]
+
+
+class _FlowBuilder:
+    """Emits one long function body of nested, narrowing control flow.
+
+    ``current`` holds a ``{class}Node`` (a union of leaf dataclasses and
+    None) that each construct narrows. Constructs nest up to ``max_depth``
+    deep. Each one normally starts by reassigning ``current``, so that no
+    branch is statically unreachable.
+    """
+
+    def __init__(self, class_name: str, branching: int, max_depth: int, rng: random.Random) -> None:
+        self.class_name = class_name
+        self.lower = class_name.lower()
+        self.branching = branching
+        self.max_depth = max_depth
+        self.rng = rng
+        self.lines: List[str] = []
+        self.counter = 0
+
+    def _emit(self, indent: int, text: str) -> None:
+        self.lines.append("    " * indent + text)
+
+    def _next(self) -> int:
+        self.counter += 1
+        return self.counter
+
+    def _use(self, indent: int, var: str, leaf: int) -> None:
+        value = LEAF_VALUES[leaf % len(LEAF_VALUES)][1].format(var=var)
+        self._emit(indent, f"total += {value}")
+
+    def _leaves(self) -> Tuple[List[int], int]:
+        """A shuffled subset of all leaves but one, and the one left out."""
+        order = list(range(self.branching))
+        self.rng.shuffle(order)
+        return order[:-1], order[-1]
+
+    def _maybe_nest(self, indent: int, depth: int, budget: int) -> None:
+        if depth < self.max_depth and len(self.lines) < budget and self.rng.random() < 1.5 / self.branching:
+            self.block(indent, depth + 1, budget)
+
+    def block(self, indent: int, depth: int, budget: int, reassign: bool = True) -> None:
+        """Emit one construct at ``indent``; nested constructs go ``depth + 1`` deep."""
+        n = self._next()
+        maybe_none = reassign
+        if reassign:
+            self._emit(indent, f"current = pick_{self.lower}(items, seed + {n})")
+        constructs = FLOW_CONSTRUCTS if depth < self.max_depth else ["isinstance", "typeguard", "match"]
+        construct = self.rng.choice(constructs)
+        leaf_class = f"{self.class_name}Leaf"
+
+        if construct == "isinstance":
+            covered, rest = self._leaves()
+            for position, leaf in enumerate(covered):
+                keyword = "if" if position == 0 else "elif"
+                self._emit(indent, f"{keyword} isinstance(current, {leaf_class}{leaf}):")
+                self._use(indent + 1, "current", leaf)
+                self._maybe_nest(indent + 1, depth, budget)
+            if maybe_none:
+                self._emit(indent, "elif current is None:")
+                self._emit(indent + 1, "total -= 1")
+            self._emit(indent, "else:")
+            self._use(indent + 1, "current", rest)
+
+        elif construct == "typeguard":
+            covered, _ = self._leaves()
+            for position, leaf in enumerate(covered):
+                keyword = "if" if position == 0 else "elif"
+                self._emit(indent, f"{keyword} is_leaf_{leaf}_{self.lower}(current):")
+                self._use(indent + 1, "current", leaf)
+                self._maybe_nest(indent + 1, depth, budget)
+
+        elif construct == "match":
+            covered, _ = self._leaves()
+            self._emit(indent, "match current:")
+            for leaf in covered:
+                self._emit(indent + 1, f"case {leaf_class}{leaf}():")
+                self._use(indent + 2, "current", leaf)
+                self._maybe_nest(indent + 2, depth, budget)
+            if maybe_none:
+                self._emit(indent + 1, "case None:")
+                self._emit(indent + 2, "total -= 1")
+            self._emit(indent + 1, "case _:")
+            self._emit(indent + 2, "total += 1")
+
+        elif construct == "try":
+            self._emit(indent, "try:")
+            self.block(indent + 1, depth + 1, budget)
+            self._emit(indent, f"except (ValueError, ZeroDivisionError) as exc_{n}:")
+            self._emit(indent + 1, f"total += len(str(exc_{n}))")
+            self._emit(indent, "finally:")
+            self._emit(indent + 1, "total += 1")
+
+        elif construct == "loop":
+            self._emit(indent, f"for item_{n} in items:")
+            self._emit(indent + 1, f"if item_{n} is None:")
+            self._emit(indent + 2, "continue")
+            self._emit(indent + 1, f"current = item_{n}")
+            self.block(indent + 1, depth + 1, budget, reassign=False)
+            self._emit(indent + 1, "if total > seed:")
+            self._emit(indent + 2, "break")
+
+        elif construct == "walrus":
+            leaf = self.rng.randrange(self.branching)
+            self._emit(indent, f"if (found_{n} := pick_{self.lower}(items, total)) is not None:")
+            self._emit(indent + 1, f"if isinstance(found_{n}, {leaf_class}{leaf}):")
+            self._use(indent + 2, f"found_{n}", leaf)
+            self._emit(indent + 1, f"current = found_{n}")
+            self.block(indent + 1, depth + 1, budget, reassign=False)
+
+        else:  # while
+            self._emit(indent, f"countdown_{n} = seed % {2 + n % 5}")
+            self._emit(indent, f"while countdown_{n} > 0:")
+            self._emit(indent + 1, f"countdown_{n} -= 1")
+            self.block(indent + 1, depth + 1, budget)
+
+
+def render_narrowing(
+    module: str,
+    class_name: str,
+    intensity: int,
+    length: int = 0,
+    branching: int = 0,
+) -> str:
+    """Two functions of about ``length`` lines narrowing a ``branching``-leaf union.
+
+    ``length`` defaults to 60 lines per intensity and ``branching`` to
+    2 + intensity leaves; constructs nest up to 3 + intensity deep.
+    """
+    length = length or 60 * intensity
+    branching = max(2, branching or 2 + intensity)
+    lower = _lower(class_name)
+    rng = random.Random(f"{module}.{class_name}.{intensity}.{length}.{branching}")
+
+    lines: List[str] = [
+        f'"""Control-flow narrowing stress for {module} (narrowing pack, intensity {intensity})."""',
+        "from dataclasses import dataclass",
+        "from typing import TypeGuard, Union",
+    ]
+    for leaf in range(branching):
+        lines.extend([
+            "",
+            "",
+            "@dataclass",
+            f"class {class_name}Leaf{leaf}:",
+            f'    """Leaf {leaf} of the {lower} narrowing union."""',
+            "",
+            f"    value: {LEAF_VALUES[leaf % len(LEAF_VALUES)][0]}",
+        ])
+    lines.extend([
+        "",
+        "",
+        f"{class_name}Node = Union["
+        + ", ".join(f"{class_name}Leaf{leaf}" for leaf in range(branching))
+        + ", None]",
+        "",
+        "",
+        f"def pick_{lower}(items: list[{class_name}Node], position: int) -> {class_name}Node:",
+        '    """Item at ``position``, wrapping around; None when empty."""',
+        "    return items[position % len(items)] if items else None",
+    ])
+    for leaf in range(branching):
+        lines.extend([
+            "",
+            "",
+            f"def is_leaf_{leaf}_{lower}(value: {class_name}Node) -> TypeGuard[{class_name}Leaf{leaf}]:",
+            f'    """Whether ``value`` is a {class_name}Leaf{leaf}."""',
+            f"    return isinstance(value, {class_name}Leaf{leaf})",
+        ])
+
+    for function in range(2):
+        builder = _FlowBuilder(class_name, branching, 3 + intensity, rng)
+        while len(builder.lines) < length:
+            builder.block(1, 1, length)
+        lines.extend([
+            "",
+            "",
+            f"def flow_{function}_{lower}(items: list[{class_name}Node], seed: int) -> int:",
+            f'    """Narrowing path {function}: {len(builder.lines)} lines over {branching} leaves."""',
+            "    total: int = 0",
+            f"    current: {class_name}Node = None",
+        ])
+        lines.extend(builder.lines)
+        lines.append("    return total")
+    lines.append("")
+    return "\n".join(lines)
+
+
+# Stand-ins for the protocol template's Repository, Cache and EventHandler,
+# used when the module has no protocol file to conform to
+LOCAL_PROTOCOLS = '''from typing import Protocol
+
+T = TypeVar("T")
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class Repository(Protocol[T]):
+    """Generic repository protocol."""
+
+    def get(self, id: str) -> Optional[T]: ...
+    def list(self, limit: int = 100, offset: int = 0) -> List[T]: ...
+    def create(self, item: T) -> T: ...
+    def update(self, id: str, item: T) -> T: ...
+    def delete(self, id: str) -> bool: ...
+
+
+class Cache(Protocol[K, V]):
+    """Generic cache protocol."""
+
+    def get(self, key: K) -> Optional[V]: ...
+    def set(self, key: K, value: V, ttl: Optional[int] = None) -> None: ...
+    def delete(self, key: K) -> bool: ...
+    def clear(self) -> None: ...
+
+
+class EventHandler(Protocol[T]):
+    """Event handler protocol."""
+
+    def handle(self, event: T) -> None: ...
+    def can_handle(self, event: T) -> bool: ...'''
+
+
+def _conformer(kind: str, name: str, base: str, record: str, generic: bool) -> str:
+    """A concrete ``kind`` implementation deriving from hierarchy class ``base``."""
+    if kind == "repository":
+        item = "E" if generic else record
+        bases = f"{base}, Generic[E]" if generic else base
+        return f'''class {name}({bases}):
+    """In-memory repository on top of {base}."""
+
+    def __init__(self) -> None:
+        self._items: dict[str, {item}] = {{}}
+
+    def get(self, id: str) -> Optional[{item}]:
+        return self._items.get(id)
+
+    def list(self, limit: int = 100, offset: int = 0) -> List[{item}]:
+        return [*self._items.values()][offset:offset + limit]
+
+    def create(self, item: {item}) -> {item}:
+        self._items[item.id] = item
+        return item
+
+    def update(self, id: str, item: {item}) -> {item}:
+        self._items[id] = item
+        return item
+
+    def delete(self, id: str) -> bool:
+        return self._items.pop(id, None) is not None'''
+    if kind == "cache":
+        return f'''class {name}({base}):
+    """Dictionary cache on top of {base}."""
+
+    def __init__(self) -> None:
+        self._entries: dict[str, {record}] = {{}}
+
+    def get(self, key: str) -> Optional[{record}]:
+        return self._entries.get(key)
+
+    def set(self, key: str, value: {record}, ttl: Optional[int] = None) -> None:
+        self._entries[key] = value
+
+    def delete(self, key: str) -> bool:
+        return self._entries.pop(key, None) is not None
+
+    def clear(self) -> None:
+        self._entries.clear()'''
+    return f'''class {name}({base}):
+    """Event handler on top of {base}."""
+
+    def __init__(self) -> None:
+        self.handled: List[{record}] = []
+
+    def handle(self, event: {record}) -> None:
+        self.handled.append(event)
+
+    def can_handle(self, event: {record}) -> bool:
+        return event.level <= self.depth()'''
+
+
+def render_hierarchy(
+    module: str,
+    class_name: str,
+    intensity: int,
+    depth: int = 0,
+    count: int = 0,
+    protocols: Optional[str] = None,
+) -> str:
+    """``depth`` stacked diamonds and ``count`` protocol conformers built on them.
+
+    ``depth`` defaults to 2 + 2 * intensity and ``count`` to 3 * intensity.
+    ``protocols`` is the module to import Repository, Cache and
+    EventHandler from (another module's protocol file); without it the
+    file declares its own copies. The import is only needed by the checker,
+    so it sits under ``TYPE_CHECKING`` with annotations deferred: package
+    ``__init__`` star imports would otherwise make it an import cycle.
+    """
+    depth = depth or 2 + 2 * intensity
+    count = count or 3 * intensity
+    lower = _lower(class_name)
+    record = f"{class_name}Record"
+    # Every odd-numbered repository (index 3, 9, ...) is generic
+    generic_repositories = count > 3
+
+    names = ["List", "Optional"]
+    if generic_repositories:
+        names.insert(0, "Generic")
+    if protocols:
+        names.insert(0, "TYPE_CHECKING")
+    if generic_repositories or not protocols:
+        names.append("TypeVar")
+
+    lines: List[str] = [
+        f'"""Deep class hierarchy and protocol conformance for {module} (hierarchy pack, intensity {intensity})."""',
+    ]
+    if protocols:
+        lines.append("from __future__ import annotations")
+    lines.append(f"from typing import {', '.join(names)}")
+    if protocols:
+        lines.extend(["", "if TYPE_CHECKING:", f"    from {protocols} import Cache, EventHandler, Repository"])
+    else:
+        lines.append(LOCAL_PROTOCOLS)
+    if generic_repositories:
+        lines.extend(["", f'E = TypeVar("E", bound="{record}")'])
+    lines.extend([
+        "",
+        "",
+        f"class {record}:",
+        f'    """Entity stored by the {lower} conformers."""',
+        "",
+        "    def __init__(self, id: str, level: int = 0) -> None:",
+        "        self.id = id",
+        "        self.level = level",
+        "",
+        "",
+        f"class {class_name}Level0:",
+        f'    """Root of the {lower} hierarchy."""',
+        "",
+        "    def describe(self) -> str:",
+        '        return "level0"',
+        "",
+        "    def depth(self) -> int:",
+        "        return 0",
+    ])
+    for level in range(depth):
+        parent = f"{class_name}Level{level}"
+        lines.extend([
+            "",
+            "",
+            f"class {class_name}Left{level}({parent}):",
+            f'    """Left side of diamond {level}."""',
+            "",
+            "    def describe(self) -> str:",
+            f'        return "left{level}:" + super().describe()',
+            "",
+            f"    def left_{level}(self) -> int:",
+            "        return self.depth() + 1",
+            "",
+            "",
+            f"class {class_name}Right{level}({parent}):",
+            f'    """Right side of diamond {level}."""',
+            "",
+            "    def describe(self) -> str:",
+            f'        return "right{level}:" + super().describe()',
+            "",
+            f"    def right_{level}(self) -> int:",
+            "        return self.depth() + 2",
+            "",
+            "",
+            f"class {class_name}Level{level + 1}({class_name}Left{level}, {class_name}Right{level}):",
+            f'    """Diamond {level}: joins Left{level} and Right{level}."""',
+            "",
+            "    def depth(self) -> int:",
+            f"        return self.left_{level}() + self.right_{level}()",
+        ])
+
+    conformers: Dict[str, List[str]] = {"repository": [], "cache": [], "handler": []}
+    for index in range(count):
+        kind = list(conformers)[index % 3]
+        name = f"{class_name}{kind.capitalize()}{index}"
+        base = f"{class_name}Level{depth - (index // 3) % (depth + 1)}"
+        generic = kind == "repository" and index % 2 == 1
+        lines.extend(["", "", _conformer(kind, name, base, record, generic)])
+        conformers[kind].append(f"{name}[{record}]()" if generic else f"{name}()")
+
+    lines.extend([
+        "",
+        "",
+        f"repositories_{lower}: List[Repository[{record}]] = [{', '.join(conformers['repository'])}]",
+        f"caches_{lower}: List[Cache[str, {record}]] = [{', '.join(conformers['cache'])}]",
+        f"handlers_{lower}: List[EventHandler[{record}]] = [{', '.join(conformers['handler'])}]",
+        "",
+        "",
+        f"def dispatch_{lower}(record: {record}) -> int:",
+        '    """Route a record through every conformer; returns how many handled it."""',
+        "    handled = 0",
+        f"    for repository in repositories_{lower}:",
+        "        repository.create(record)",
+        f"    for cache in caches_{lower}:",
+        "        cache.set(record.id, record)",
+        f"    for handler in handlers_{lower}:",
+        "        if handler.can_handle(record):",
+        "            handler.handle(record)",
+        "            handled += 1",
+        "    return handled",
+        "",
+    ])
+    return "\n".join(lines)
+
+
+PACKS: Dict[str, Renderer] = {
+    "generics": render_generics,
+    "overloads": render_overloads,
+    "unions": render_unions,
+    "recursive": render_recursive,
+    "wide_typeddict": render_wide_typeddict,
+    "narrowing": render_narrowing,
+    "hierarchy": render_hierarchy,
+}
+
+# Extra integer options each pack accepts, besides intensity
+PACK_OPTIONS: Dict[str, Tuple[str, ...]] = {
+    "narrowing": ("length", "branching"),
+    "hierarchy": ("depth", "count"),
+}
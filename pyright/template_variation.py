@@ -0,0 +1,260 @@
+"""
+Seeded variation of rendered base templates for generate_sample_code.py.
+
+Without variation every module repeats the same five templates, so files
+of one kind differ only in their class name. ``vary`` makes each file
+distinct while staying reproducible from its seed:
+
+- dataclass: extra fields (with defaults) and methods on the entity and
+  its collection
+- protocol: extra members on the entity protocol
+- service: extra methods on the service
+- typeddict: extra ``NotRequired`` keys on the TypedDicts
+- utils: extra module-level helper functions
+
+Field names, types, parameter lists and method bodies are all drawn from
+the random generator. Additions only add optional fields and new
+members, so every existing use of a template keeps type-checking.
+"""
+
+import ast
+import random
+from typing import Callable, Dict, List, Tuple
+
+# Types drawn for fields, parameters and return values, with a default of each
+VALUE_TYPES = {
+    "int": "0",
+    "str": '""',
+    "float": "0.0",
+    "bool": "False",
+    "list[int]": "field(default_factory=list)",
+    "dict[str, int]": "field(default_factory=dict)",
+}
+
+FIELD_NAMES = [
+    "priority", "label", "weight", "enabled", "scores", "counters", "revision", "owner",
+    "ratio", "archived", "sequence", "aliases", "region", "quota", "budget", "flags",
+]
+VERBS = ["compute", "resolve", "merge", "score", "render", "collect", "rank", "measure", "derive", "index"]
+NOUNS = ["total", "summary", "weights", "labels", "offsets", "buckets", "limits", "tokens", "window", "digest"]
+PARAM_NAMES = ["count", "name", "factor", "strict", "values", "mapping", "limit", "prefix", "scale", "items"]
+
+
+def _pick_name(rng: random.Random, pool: List[str], taken: set) -> str:
+    name = rng.choice(pool)
+    suffix = 2
+    candidate = name
+    while candidate in taken:
+        candidate = f"{name}_{suffix}"
+        suffix += 1
+    taken.add(candidate)
+    return candidate
+
+
+def _expression(rng: random.Random, kind: str, scope: Dict[str, str], depth: int = 0) -> str:
+    """A random expression of type ``kind`` over the typed names in ``scope``."""
+    names = [name for name, name_kind in scope.items() if name_kind == kind]
+    if names and rng.random() < 0.5:
+        return rng.choice(names)
+    nested = depth < 2
+
+    def sub(sub_kind: str) -> str:
+        return _expression(rng, sub_kind, scope, depth + 1) if nested else _literal(rng, sub_kind)
+
+    choices: Dict[str, List[Callable[[], str]]] = {
+        "int": [
+            lambda: str(rng.randint(1, 99)),
+            lambda: f"len({sub('str')})",
+            lambda: f"({sub('int')} + {sub('int')})",
+            lambda: f"sum({sub('list[int]')})",
+            lambda: f"len({sub('dict[str, int]')})",
+        ],
+        "str": [
+            lambda: repr(rng.choice(FIELD_NAMES)),
+            lambda: f"str({sub('int')})",
+            lambda: f"{sub('str')}.upper()",
+            lambda: f"\"-\".join([{sub('str')}, str({sub('int')})])",
+        ],
+        "float": [
+            lambda: f"{rng.randint(1, 9)}.5",
+            lambda: f"float({sub('int')})",
+            lambda: f"({sub('float')} * 2.0)",
+        ],
+        "bool": [
+            lambda: f"({sub('int')} > {rng.randint(0, 9)})",
+            lambda: f"bool({sub('str')})",
+            lambda: f"{sub('str')}.startswith({repr(rng.choice('abcxyz'))})",
+        ],
+        "list[int]": [
+            lambda: f"[{sub('int')}, {sub('int')}]",
+            lambda: f"sorted({sub('list[int]')})",
+            lambda: f"list(range({sub('int')}))",
+        ],
+        "dict[str, int]": [
+            lambda: f"{{{sub('str')}: {sub('int')}}}",
+            lambda: f"dict({sub('dict[str, int]')})",
+        ],
+    }
+    return rng.choice(choices[kind])()
+
+
+def _literal(rng: random.Random, kind: str) -> str:
+    return {
+        "int": str(rng.randint(1, 99)),
+        "str": repr(rng.choice(FIELD_NAMES)),
+        "float": f"{rng.randint(1, 9)}.25",
+        "bool": rng.choice(["True", "False"]),
+        "list[int]": f"[{rng.randint(0, 9)}]",
+        "dict[str, int]": f"{{{repr(rng.choice(FIELD_NAMES))}: {rng.randint(0, 9)}}}",
+    }[kind]
+
+
+def _signature(rng: random.Random, taken: set, method: bool) -> Tuple[str, str, Dict[str, str], str]:
+    """Name, parameter list, parameter types and return type of a new function."""
+    name = _pick_name(rng, [f"{verb}_{noun}" for verb in VERBS for noun in NOUNS], taken)
+    scope: Dict[str, str] = {}
+    for _ in range(rng.randint(0, 4)):
+        scope[_pick_name(rng, PARAM_NAMES, set(scope))] = rng.choice(list(VALUE_TYPES))
+    params = ", ".join(f"{param}: {kind}" for param, kind in scope.items())
+    if method:
+        params = f"self, {params}" if params else "self"
+    return name, params, scope, rng.choice(list(VALUE_TYPES))
+
+
+# How to turn a value of one type into another, and how to combine two values
+CONVERSIONS = {
+    "int": {"str": "len({})", "float": "int({})", "bool": "int({})", "list[int]": "len({})", "dict[str, int]": "len({})"},
+    "str": {"int": "str({})", "float": "str({})", "bool": "str({})", "list[int]": "str({})", "dict[str, int]": "str({})"},
+    "float": {"int": "float({})", "str": "float(len({}))", "bool": "float({})", "list[int]": "float(len({}))",
+              "dict[str, int]": "float(len({}))"},
+    "bool": {"int": "bool({})", "str": "bool({})", "float": "bool({})", "list[int]": "bool({})",
+             "dict[str, int]": "bool({})"},
+    "list[int]": {"int": "[{}]", "str": "[len({})]", "float": "[int({})]", "bool": "[int({})]",
+                  "dict[str, int]": "list({}.values())"},
+    "dict[str, int]": {"int": '{{"value": {}}}', "str": "{{{}: 0}}", "float": '{{"value": int({})}}',
+                       "bool": '{{"value": int({})}}', "list[int]": '{{"count": len({})}}'},
+}
+COMBINE = {
+    "int": "({} + {})",
+    "str": "({} + {})",
+    "float": "({} + {})",
+    "bool": "({} and {})",
+    "list[int]": "({} + {})",
+    "dict[str, int]": "{{**{}, **{}}}",
+}
+
+
+def _convert(name: str, kind: str, target: str) -> str:
+    return name if kind == target else CONVERSIONS[target][kind].format(name)
+
+
+def _body(rng: random.Random, scope: Dict[str, str], returns: str, indent: str) -> List[str]:
+    """Statements computing a ``returns`` value from the parameters.
+
+    Every local is folded into the final return value, so none is unused.
+    """
+    scope = dict(scope)
+    lines: List[str] = []
+    locals_: List[Tuple[str, str]] = []
+    for index in range(rng.randint(0, 3)):
+        kind = rng.choice(list(VALUE_TYPES))
+        local = f"step_{index}"
+        lines.append(f"{indent}{local} = {_expression(rng, kind, scope)}")
+        scope[local] = kind
+        locals_.append((local, kind))
+    if rng.random() < 0.4:
+        lines.append(f"{indent}if {_expression(rng, 'bool', scope)}:")
+        lines.append(f"{indent}    return {_expression(rng, returns, scope)}")
+    result = _expression(rng, returns, scope)
+    for local, kind in locals_:
+        result = COMBINE[returns].format(result, _convert(local, kind, returns))
+    lines.append(f"{indent}return {result}")
+    return lines
+
+
+def _function(rng: random.Random, taken: set, indent: str, method: bool) -> List[str]:
+    name, params, scope, returns = _signature(rng, taken, method)
+    lines = [
+        "",
+        f"{indent}def {name}({params}) -> {returns}:",
+        f'{indent}    """Generated variant: {name.replace("_", " ")}."""',
+    ]
+    return lines + _body(rng, scope, returns, indent + "    ")
+
+
+def _protocol_member(rng: random.Random, taken: set) -> List[str]:
+    name, params, _, returns = _signature(rng, taken, method=True)
+    return [
+        "",
+        f"    def {name}({params}) -> {returns}:",
+        f'        """Generated variant: {name.replace("_", " ")}."""',
+        "        ...",
+    ]
+
+
+def _fields(rng: random.Random, taken: set, typed_dict: bool) -> List[str]:
+    lines: List[str] = []
+    for _ in range(rng.randint(1, 4)):
+        name = _pick_name(rng, FIELD_NAMES, taken)
+        kind = rng.choice(list(VALUE_TYPES))
+        if typed_dict:
+            lines.append(f"    {name}: NotRequired[{kind}]")
+        else:
+            lines.append(f"    {name}: {kind} = {VALUE_TYPES[kind]}")
+    return lines
+
+
+def vary(kind: str, content: str, rng: random.Random) -> str:
+    """Return a seeded variant of a rendered base template of ``kind``."""
+    lines = content.split("\n")
+    tree = ast.parse(content)
+    classes = {node.name: node for node in tree.body if isinstance(node, ast.ClassDef)}
+    taken = {
+        target.id if isinstance(target, ast.Name) else getattr(target, "name", "")
+        for node in ast.walk(tree)
+        for target in ([node] if isinstance(node, (ast.FunctionDef, ast.ClassDef)) else
+                       [node.target] if isinstance(node, ast.AnnAssign) else [])
+    }
+    # (line index to insert after, lines) pairs, applied bottom-up
+    insertions: List[Tuple[int, List[str]]] = []
+
+    def fields_of(node: ast.ClassDef, typed_dict: bool) -> None:
+        annotated = [stmt for stmt in node.body if isinstance(stmt, ast.AnnAssign)]
+        if annotated:
+            insertions.append((annotated[-1].end_lineno or annotated[-1].lineno, _fields(rng, taken, typed_dict)))
+
+    def methods_of(node: ast.ClassDef, low: int, high: int) -> None:
+        added: List[str] = []
+        for _ in range(rng.randint(low, high)):
+            added.extend(_function(rng, taken, "    ", method=True))
+        if added:
+            insertions.append((node.end_lineno or node.lineno, added))
+
+    if kind == "dataclass":
+        entity, collection = list(classes.values())[:2]
+        fields_of(entity, typed_dict=False)
+        methods_of(entity, 0, 3)
+        methods_of(collection, 0, 2)
+    elif kind == "protocol":
+        protocol = next(node for name, node in classes.items() if name.endswith("Protocol") and name != "Protocol")
+        added: List[str] = []
+        for _ in range(rng.randint(0, 3)):
+            added.extend(_protocol_member(rng, taken))
+        if added:
+            insertions.append((protocol.end_lineno or protocol.lineno, added))
+    elif kind == "service":
+        service = next(node for name, node in classes.items() if name.endswith("Service"))
+        methods_of(service, 1, 4)
+    elif kind == "typeddict":
+        for node in classes.values():
+            if rng.random() < 0.5:
+                fields_of(node, typed_dict=True)
+    else:
+        added = []
+        for _ in range(rng.randint(1, 4)):
+            added.extend([""] + _function(rng, taken, "", method=False))
+        insertions.append((len(lines) - 1 if lines[-1] == "" else len(lines), added))
+
+    for after, added in sorted(insertions, key=lambda item: item[0], reverse=True):
+        lines[after:after] = added
+    return "\n".join(lines)
@@ -0,0 +1,35 @@
+"""edit_trace.py on corpora with one-line function bodies."""
+
+import ast
+from pathlib import Path
+from typing import List
+
+import pytest
+
+import generate_sample_code
+from edit_trace import DEFAULT_MIX, generate_trace, replay
+
+
+def generate(tmp_path: Path, options: List[str]) -> Path:
+    generate_sample_code.main(["small", "-q", "-o", str(tmp_path / "out"), *options])
+    return tmp_path / "out" / "small"
+
+
+def assert_parses(root: Path) -> None:
+    for path in sorted(root.rglob("*.py*")):
+        if path.suffix in (".py", ".pyi"):
+            ast.parse(path.read_text(), str(path))
+
+
+@pytest.mark.parametrize(
+    "options",
+    [["--pack", "overloads:2"], ["--stubs", "alongside"], ["--stubs", "instead"]],
+    ids=["overloads", "stubs-alongside", "stubs-instead"],
+)
+def test_trace_replays_to_valid_sources(tmp_path: Path, options: List[str]) -> None:
+    root = generate(tmp_path, options)
+    trace = generate_trace(root, 60, seed=3, mix={**DEFAULT_MIX, "body": 80})
+
+    assert any(step["kind"] == "body" for step in trace["steps"]) or "instead" in options
+    replay(trace, root)
+    assert_parses(root)
@@ -0,0 +1,36 @@
+"""monorepo_benchmark.py with its default checker command."""
+
+import json
+import os
+import stat
+from pathlib import Path
+
+import pytest
+
+import generate_sample_code
+import monorepo_benchmark
+
+
+@pytest.fixture
+def reporting_pyright(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """A ``pyright`` on PATH that exits 1, as pyright does when it reports type errors."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    script = bin_dir / "pyright"
+    script.write_text("#!/bin/sh\necho '1 error'\nexit 1\n")
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+
+
+def test_default_checker_reporting_errors_is_measured(tmp_path: Path, reporting_pyright: None) -> None:
+    generate_sample_code.main(["small", "--monorepo", "3", "-q", "-o", str(tmp_path / "out")])
+    root = tmp_path / "out" / generate_sample_code.MONOREPO_DIR
+    output = tmp_path / "mono.json"
+
+    monorepo_benchmark.main([str(root), "--parallel", "2", "-o", str(output)])
+
+    result = json.loads(output.read_text())
+    assert result["checker"] == monorepo_benchmark.DEFAULT_CHECKER
+    assert result["projects"] == 3
+    assert len(result["per_project"]["runs"][0]["projects"]) == 3
+    assert result["whole"]["seconds"] > 0
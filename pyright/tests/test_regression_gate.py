@@ -0,0 +1,46 @@
+"""regression_gate: unknown metrics are rejected and a run that gates nothing fails."""
+
+from pathlib import Path
+
+import pytest
+
+import regression_gate
+from stats_history import CheckerStats, connect, store_run
+
+
+@pytest.fixture
+def history(tmp_path: Path) -> Path:
+    db = tmp_path / "history.sqlite"
+    codebase = tmp_path / "small"
+    codebase.mkdir()
+    connection = connect(db)
+    for label, seconds in (("main", 1.0), ("pr", 1.0)):
+        for _ in range(3):
+            stats = CheckerStats(total_seconds=seconds, phases={"check": seconds / 2})
+            store_run(connection, stats, codebase, label=label)
+    connection.close()
+    return db
+
+
+def gate(db: Path, *extra: str) -> None:
+    regression_gate.main(
+        ["--db", str(db), "--codebase", "small", "--candidate-label", "pr", "--baseline-label", "main", *extra]
+    )
+
+
+def test_same_timings_pass(history: Path) -> None:
+    gate(history)
+
+
+def test_unknown_metric_is_rejected(history: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    with pytest.raises(SystemExit) as excinfo:
+        gate(history, "--metrics", "total,chek")
+    assert excinfo.value.code == 2
+    assert "unknown --metrics chek" in capsys.readouterr().err
+
+
+def test_nothing_gated_fails(history: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    with pytest.raises(SystemExit) as excinfo:
+        gate(history, "--min-seconds", "10")
+    assert excinfo.value.code == 2
+    assert "No metric was gated" in capsys.readouterr().err
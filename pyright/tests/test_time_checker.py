@@ -0,0 +1,30 @@
+"""time_checker: type errors are a complete run, fatal statuses and missing checkers are not."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+from generate_sample_code import time_checker
+
+
+def exiting(status: int) -> str:
+    return f"{sys.executable} -c 'import sys; sys.exit({status})' {{path}}"
+
+
+def test_reporting_type_errors_is_timed(tmp_path: Path) -> None:
+    assert time_checker(exiting(1), tmp_path) >= 0
+
+
+def test_clean_run_is_timed(tmp_path: Path) -> None:
+    assert time_checker(exiting(0), tmp_path) >= 0
+
+
+def test_fatal_status_ends_the_program(tmp_path: Path) -> None:
+    with pytest.raises(SystemExit, match="status 2"):
+        time_checker(exiting(2), tmp_path)
+
+
+def test_missing_checker_ends_the_program(tmp_path: Path) -> None:
+    with pytest.raises(SystemExit, match="checker not found"):
+        time_checker("no-such-checker-binary {path}", tmp_path)
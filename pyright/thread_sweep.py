@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+Sweep pyright thread counts, fit a scaling model and recommend a thread count.
+
+Every codebase is timed with ``--threads N`` for each N from 1 to the CPU
+count (or the counts given with ``--counts``), with warmup and repeated
+runs as in benchmark_runner.py. The medians are fitted to an Amdahl model
+with a coordination cost per extra thread:
+
+    T(n) = serial + parallel / n + overhead * (n - 1)
+
+which gives the parallel fraction ``parallel / (serial + parallel)``, the
+Amdahl speedup limit, the thread count the model considers fastest, and
+the Gustafson scaled speedup at the largest count (the speedup if the
+corpus grew with the runner). Speedup and parallel efficiency
+(speedup / n) are also reported per measured count.
+
+The recommended thread count is the smallest measured count whose median
+is within ``--tolerance`` of the fastest one, since extra threads that
+buy less than that only cost CPU on a shared runner. It is printed, and
+written as ``threads=N`` and ``pyright_args=--threads N`` (empty for 1)
+to ``$GITHUB_OUTPUT`` when that is set, for the largest codebase swept,
+with ``threads_<codebase>`` for each one (keyed by the directory's base
+name, other characters than letters, digits and ``_`` replaced by ``_``).
+A sweep costs many full checks, so CI runs it on a schedule and saves the
+``-o`` file; ``--load`` emits the saved recommendation again without
+checking anything (one thread when the file is missing).
+
+Usage:
+    python generate_sample_code.py
+    python thread_sweep.py small medium large --repeats 3 -o sweep.json
+    python thread_sweep.py large --counts 1,2,4,8,16 --tolerance 0.1
+    python thread_sweep.py --load sweep.json
+    python thread_sweep.py small --max-threads 8 --checker \\
+        "python -c 'import sys, time; n = int(sys.argv[2]); time.sleep(0.1 + 0.8 / n + 0.02 * n)' {threads}"
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from benchmark_runner import (
+    CACHES,
+    DEFAULT_CACHE_DIRS,
+    DEFAULT_CHECKER,
+    Case,
+    codebase_totals,
+    environment,
+    resolve_codebase,
+    run_case,
+)
+from generate_sample_code import SAMPLE_CODE_DIR
+
+DEFAULT_THREADS_ARG = "--threads {n}"
+
+
+def solve(matrix: List[List[float]], vector: List[float]) -> Optional[List[float]]:
+    """Solve a small linear system by Gaussian elimination; None if it is singular."""
+    size = len(vector)
+    rows = [row[:] + [value] for row, value in zip(matrix, vector)]
+    for column in range(size):
+        pivot = max(range(column, size), key=lambda row: abs(rows[row][column]))
+        if abs(rows[pivot][column]) < 1e-12:
+            return None
+        rows[column], rows[pivot] = rows[pivot], rows[column]
+        for row in range(size):
+            if row != column:
+                factor = rows[row][column] / rows[column][column]
+                rows[row] = [a - factor * b for a, b in zip(rows[row], rows[column])]
+    return [rows[row][size] / rows[row][row] for row in range(size)]
+
+
+def least_squares(features: List[List[float]], targets: Sequence[float]) -> Optional[List[float]]:
+    """Coefficients minimizing the squared error of ``features @ coefficients`` against ``targets``."""
+    width = len(features[0])
+    normal = [[sum(row[i] * row[j] for row in features) for j in range(width)] for i in range(width)]
+    moments = [sum(row[i] * target for row, target in zip(features, targets)) for i in range(width)]
+    return solve(normal, moments)
+
+
+def fit_scaling(counts: Sequence[int], seconds: Sequence[float]) -> Dict[str, Any]:
+    """Fit ``T(n) = serial + parallel / n + overhead * (n - 1)`` to the measured medians.
+
+    The overhead term is only kept when at least three counts were
+    measured and it comes out positive; negative components are dropped
+    and the rest refitted, so every component stays physical.
+    """
+    terms = ["serial", "parallel", "overhead"] if len(set(counts)) >= 3 else ["serial", "parallel"]
+    basis = {"serial": lambda n: 1.0, "parallel": lambda n: 1.0 / n, "overhead": lambda n: n - 1.0}
+    coefficients: Dict[str, float] = {}
+    while terms:
+        solution = least_squares([[basis[term](n) for term in terms] for n in counts], seconds)
+        if solution is None:
+            terms = terms[:-1]
+            continue
+        coefficients = dict(zip(terms, solution))
+        negative = [term for term in terms if coefficients[term] < 0]
+        if not negative:
+            break
+        terms = [term for term in terms if term not in negative]
+        coefficients = {}
+    serial = coefficients.get("serial", 0.0)
+    parallel = coefficients.get("parallel", 0.0)
+    overhead = coefficients.get("overhead", 0.0)
+
+    def predict(n: float) -> float:
+        return serial + parallel / n + overhead * (n - 1)
+
+    mean = sum(seconds) / len(seconds)
+    residual = sum((value - predict(n)) ** 2 for n, value in zip(counts, seconds))
+    total = sum((value - mean) ** 2 for value in seconds)
+    work = serial + parallel
+    fraction = parallel / work if work > 0 else 0.0
+    largest = max(counts)
+    # Gustafson: the share of the largest-count run spent in parallel work, scaled up
+    scaled_share = (parallel / largest) / predict(largest) if predict(largest) > 0 else 0.0
+    return {
+        "serial_seconds": serial,
+        "parallel_seconds": parallel,
+        "overhead_per_thread": overhead,
+        "parallel_fraction": fraction,
+        # None: no limit within the model (no serial part, or no per-thread overhead)
+        "amdahl_limit": 1 / (1 - fraction) if fraction < 1 else None,
+        "model_optimum": max(1.0, math.sqrt(parallel / overhead)) if overhead > 0 else None,
+        "gustafson_speedup": (1 - scaled_share) + scaled_share * largest,
+        "r2": 1 - residual / total if total > 0 else 1.0,
+        "predicted": {str(n): predict(n) for n in counts},
+    }
+
+
+def recommend(points: List[Dict[str, Any]], tolerance: float = 0.05) -> int:
+    """Smallest measured thread count within ``tolerance`` of the fastest median."""
+    best = min(point["median"] for point in points)
+    return min(point["threads"] for point in points if point["median"] <= best * (1 + tolerance))
+
+
+def sweep_codebase(
+    name: str,
+    path: Path,
+    counts: Sequence[int],
+    checker: str = DEFAULT_CHECKER,
+    threads_arg: str = DEFAULT_THREADS_ARG,
+    cache: str = "warm",
+    warmup: int = 1,
+    repeats: int = 3,
+    cache_dirs: Sequence[str] = DEFAULT_CACHE_DIRS,
+    tolerance: float = 0.05,
+    quiet: bool = False,
+) -> Dict[str, Any]:
+    """Time every thread count on one codebase and fit the scaling model."""
+    points: List[Dict[str, Any]] = []
+    for n in counts:
+        result = run_case(
+            Case(name, path, "threads", cache),
+            checker,
+            threads_arg.replace("{n}", str(n)),
+            warmup,
+            repeats,
+            cache_dirs,
+            0.95,
+        )
+        points.append({
+            "threads": n,
+            "median": result["stats"]["median"],
+            "command": result["command"],
+            "samples": result["samples"],
+            "stats": result["stats"],
+        })
+        if not quiet:
+            print(f"  {name} --threads {n}: median {result['stats']['median']:.3f}s over {repeats} runs")
+    base = next(point["median"] for point in points if point["threads"] == min(counts))
+    for point in points:
+        point["speedup"] = base / point["median"]
+        point["efficiency"] = point["speedup"] / point["threads"] * min(counts)
+    totals = codebase_totals(path)
+    return {
+        "codebase": name,
+        "path": str(path),
+        "files": totals.get("files"),
+        "lines": totals.get("lines"),
+        "points": points,
+        "model": fit_scaling([point["threads"] for point in points], [point["median"] for point in points]),
+        "recommended_threads": recommend(points, tolerance),
+    }
+
+
+def pyright_args(threads: int) -> str:
+    """The pyright arguments for a recommended thread count."""
+    return "" if threads <= 1 else f"--threads {threads}"
+
+
+def output_key(codebase: str) -> str:
+    """Step output key of a codebase: ``threads_`` and its base name, as ``[A-Za-z0-9_]``."""
+    return "threads_" + re.sub(r"[^A-Za-z0-9_]", "_", Path(codebase).name)
+
+
+def github_outputs(sweeps: List[Dict[str, Any]]) -> List[Tuple[str, str]]:
+    """``(key, value)`` outputs for a CI job: the largest codebase's count, then each codebase's."""
+    largest = max(sweeps, key=lambda sweep: (sweep["lines"] or 0, sweeps.index(sweep)))
+    threads = largest["recommended_threads"]
+    outputs = [("threads", str(threads)), ("pyright_args", pyright_args(threads))]
+    outputs.extend((output_key(sweep["codebase"]), str(sweep["recommended_threads"])) for sweep in sweeps)
+    return outputs
+
+
+def print_sweep(sweep: Dict[str, Any]) -> None:
+    """Print the measured points and the fitted model of one codebase."""
+    model = sweep["model"]
+    lines = f", {sweep['lines']} lines" if sweep["lines"] else ""
+    print(f"\n{sweep['codebase']}{lines}")
+    header = f"{'threads':>7} {'median s':>9} {'model s':>8} {'speedup':>8} {'efficiency':>10}"
+    print(header)
+    print("-" * len(header))
+    for point in sweep["points"]:
+        marker = "  <- recommended" if point["threads"] == sweep["recommended_threads"] else ""
+        print(
+            f"{point['threads']:>7} {point['median']:>9.3f} {model['predicted'][str(point['threads'])]:>8.3f} "
+            f"{point['speedup']:>7.2f}x {point['efficiency']:>10.0%}{marker}"
+        )
+    limit, optimum = model["amdahl_limit"], model["model_optimum"]
+    print(
+        f"parallel fraction {model['parallel_fraction']:.0%}, "
+        f"Amdahl limit {'unbounded' if limit is None else f'{limit:.2f}x'}, "
+        f"model optimum {'unbounded' if optimum is None else f'{optimum:.1f} threads'}, "
+        f"Gustafson speedup {model['gustafson_speedup']:.2f}x (R^2 {model['r2']:.2f})"
+    )
+
+
+def _parse_counts(parser: argparse.ArgumentParser, spec: Optional[str], maximum: int) -> List[int]:
+    if spec is None:
+        return list(range(1, maximum + 1))
+    try:
+        counts = sorted({int(item) for item in spec.split(",") if item})
+    except ValueError:
+        counts = []
+    if not counts or counts[0] < 1:
+        parser.error(f"--counts takes positive integers separated by commas: {spec!r}")
+    return counts
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "codebases",
+        nargs="*",
+        default=["small", "medium", "large"],
+        metavar="CODEBASE",
+        help="codebase directories, or size names under --sample-dir (default: small medium large)",
+    )
+    parser.add_argument(
+        "--sample-dir",
+        type=Path,
+        default=SAMPLE_CODE_DIR,
+        help="where size names are looked up (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--max-threads",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="sweep 1..N threads (default: CPU count)",
+    )
+    parser.add_argument(
+        "--counts",
+        help="explicit comma-separated thread counts instead of 1..--max-threads, e.g. 1,2,4,8",
+    )
+    parser.add_argument(
+        "--checker",
+        default=DEFAULT_CHECKER,
+        metavar="COMMAND",
+        help="checker command; {path} is the codebase, {threads} the --threads-arg (default: %(default)r)",
+    )
+    parser.add_argument(
+        "--threads-arg",
+        default=DEFAULT_THREADS_ARG,
+        help="what {threads} becomes; {n} is the thread count (default: %(default)r)",
+    )
+    parser.add_argument(
+        "--cache",
+        choices=CACHES,
+        default="warm",
+        help="delete checker caches before every run (cold) or not (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        action="append",
+        default=None,
+        metavar="NAME",
+        help=f"cache directory deleted before cold runs (repeatable; default: {', '.join(DEFAULT_CACHE_DIRS)})",
+    )
+    parser.add_argument("--warmup", type=int, default=1, help="unrecorded runs per count (default: %(default)s)")
+    parser.add_argument("--repeats", type=int, default=3, help="recorded runs per count (default: %(default)s)")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.05,
+        help="recommend the fewest threads within this fraction of the fastest time (default: %(default)s)",
+    )
+    parser.add_argument("-q", "--quiet", action="store_true", help="only print the results")
+    parser.add_argument("-o", "--output", type=Path, help="also write the sweep as JSON to this file")
+    parser.add_argument(
+        "--load",
+        type=Path,
+        metavar="JSON",
+        help="emit the recommendation of an earlier -o file instead of sweeping",
+    )
+    args = parser.parse_args(argv)
+    if args.load is not None:
+        return args
+    if args.max_threads < 1:
+        parser.error("--max-threads must be positive")
+    args.counts = _parse_counts(parser, args.counts, args.max_threads)
+    args.cache_dir = args.cache_dir or DEFAULT_CACHE_DIRS
+    if args.warmup < 0 or args.repeats < 1 or args.tolerance < 0:
+        parser.error("--warmup and --tolerance must not be negative and --repeats must be positive")
+    args.paths = [(name, resolve_codebase(name, args.sample_dir)) for name in args.codebases]
+    missing = [str(path) for _, path in args.paths if not path.is_dir()]
+    if missing:
+        parser.error(f"no such codebase: {', '.join(missing)} (run generate_sample_code.py first)")
+    return args
+
+
+def emit_outputs(outputs: List[Tuple[str, str]]) -> None:
+    """Print the recommendation and append it to ``$GITHUB_OUTPUT`` when that is set."""
+    for key, value in outputs:
+        print(f"{key}={value}")
+    github_output = os.environ.get("GITHUB_OUTPUT")
+    if github_output:
+        with open(github_output, "a") as handle:
+            handle.writelines(f"{key}={value}\n" for key, value in outputs)
+
+
+def load_outputs(path: Path) -> List[Tuple[str, str]]:
+    """The recommendation saved in an ``-o`` file; one thread if there is none."""
+    try:
+        return list(json.loads(path.read_text())["recommendation"].items())
+    except (FileNotFoundError, ValueError, KeyError):
+        print(f"warning: no thread-count recommendation in {path}; using one thread", file=sys.stderr)
+        return [("threads", "1"), ("pyright_args", pyright_args(1))]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Sweep thread counts on every codebase and recommend one."""
+    args = parse_args(argv)
+    if args.load is not None:
+        emit_outputs(load_outputs(args.load))
+        return
+    sweeps = [
+        sweep_codebase(
+            name,
+            path,
+            args.counts,
+            args.checker,
+            args.threads_arg,
+            args.cache,
+            args.warmup,
+            args.repeats,
+            args.cache_dir,
+            args.tolerance,
+            args.quiet,
+        )
+        for name, path in args.paths
+    ]
+    for sweep in sweeps:
+        print_sweep(sweep)
+
+    outputs = github_outputs(sweeps)
+    print()
+    emit_outputs(outputs)
+    if args.output is not None:
+        data = {
+            "checker": args.checker,
+            "threads_arg": args.threads_arg,
+            "counts": args.counts,
+            "cache": args.cache,
+            "warmup": args.warmup,
+            "repeats": args.repeats,
+            "tolerance": args.tolerance,
+            "environment": environment(),
+            "recommendation": dict(outputs),
+            "codebases": sweeps,
+        }
+        args.output.write_text(json.dumps(data, indent=1) + "\n")
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()